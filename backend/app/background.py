@@ -0,0 +1,73 @@
+# backend/app/background.py
+"""
+Small bounded thread pool for work that must not run on a request thread
+(AI calls mostly). `submit()` never blocks: when all workers are busy and the
+queue is full it returns None and the caller decides how to degrade.
+"""
+from __future__ import annotations
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int = 4, max_queued: int = 64, name: str = "bg"):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future | None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return None
+        with self._lock:
+            self.in_flight += 1
+        try:
+            fut = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+            raise
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, fut: Future) -> None:
+        exc = None if fut.cancelled() else fut.exception()
+        failed = exc is not None
+        if failed:
+            log.error("background task failed", exc_info=exc)
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+tasks = BoundedExecutor(
+    max_workers=int(os.getenv("BG_WORKERS", "4")),
+    max_queued=int(os.getenv("BG_QUEUE", "64")),
+)
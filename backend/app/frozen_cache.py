@@ -0,0 +1,81 @@
+# backend/app/frozen_cache.py
+"""
+LRU caches for payloads that can no longer change.
+
+A round of a completed game is final: GET /api/room/<id>/round/<n> serializes it once, keeps
+the JSON body with its strong ETag and the ids of the players allowed to see it, and from
+then on answers from memory (or with a 304). The same goes for the per-game items of
+/api/games/my_past, which only lists completed games.
+
+Nothing ever invalidates these entries; they only leave through LRU eviction.
+"""
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from werkzeug.http import generate_etag
+
+# completed payloads are final: browsers may keep them for good (they are per user: private)
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class FrozenPayload:
+    body: bytes
+    etag: str
+    member_ids: frozenset
+
+    @classmethod
+    def of(cls, body: bytes, member_ids) -> "FrozenPayload":
+        return cls(body=body, etag=generate_etag(body), member_ids=frozenset(member_ids))
+
+
+class FrozenCache:
+    def __init__(self, max_items: int = 4096):
+        self.max_items = max_items
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._items),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+completed_rounds = FrozenCache(max_items=int(os.getenv("COMPLETED_ROUND_CACHE_SIZE", "4096")))   # (game_id, round_no) -> FrozenPayload
+past_games = FrozenCache(max_items=int(os.getenv("PAST_GAME_CACHE_SIZE", "4096")))               # game_id -> my_past item dict
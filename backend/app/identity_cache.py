@@ -0,0 +1,155 @@
+# backend/app/identity_cache.py
+"""
+Cached user-id -> username and (user, game) -> membership lookups.
+
+Room API calls check membership and look up the sender's name on every request. Both are
+answered from two layers:
+
+  request scope   flask.g: each id is looked up at most once per request / socket event
+  process scope   TTL + LRU dict shared by all requests of the worker (IDENTITY_CACHE_TTL)
+
+Only positive memberships are kept process-wide: a stale "not a member" would lock out a
+player who just joined through another worker. Joins write the new membership through
+(`member_joined`). A player leaving a game is handled with `invalidate_game`, which the
+Socket.IO queue repeats on the other workers with every room invalidation (socket_queue.py).
+"""
+from __future__ import annotations
+import os
+import time
+import threading
+from collections import OrderedDict
+
+from flask import g, has_app_context
+
+from ..database.models import User, PlayerGame
+
+
+class IdentityCache:
+    def __init__(self, ttl: float = 60.0, max_items: int = 65536, max_games: int = 4096):
+        self.ttl = ttl
+        self.max_items = max_items          # usernames
+        self.max_games = max_games          # games with cached memberships
+        self._usernames: OrderedDict[int, tuple[float, str]] = OrderedDict()
+        self._members: OrderedDict[int, dict[int, float]] = OrderedDict()    # game_id -> {uid: expiry}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- internals ----------
+    @staticmethod
+    def _request_scope() -> dict | None:
+        if not has_app_context():
+            return None
+        scope = getattr(g, "_identity", None)
+        if scope is None:
+            scope = g._identity = {}
+        return scope
+
+    def _get_username(self, uid: int) -> str | None:
+        item = self._usernames.get(uid)
+        if item is None:
+            return None
+        if item[0] < time.monotonic():
+            del self._usernames[uid]
+            return None
+        self._usernames.move_to_end(uid)
+        return item[1]
+
+    def _has_member(self, uid: int, game_id: int) -> bool:
+        members = self._members.get(game_id)
+        expires = members.get(uid) if members else None
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del members[uid]
+            return False
+        self._members.move_to_end(game_id)
+        return True
+
+    @staticmethod
+    def _bound(table: OrderedDict, max_items: int) -> None:
+        while len(table) > max_items:
+            table.popitem(last=False)   # least recently used
+
+    # ---------- public API ----------
+    def username(self, db, uid: int) -> str | None:
+        scope = self._request_scope()
+        if scope is not None and ("user", uid) in scope:
+            return scope[("user", uid)]
+        with self._lock:
+            name = self._get_username(uid)
+            if name is not None:
+                self.hits += 1
+        if name is None:
+            self.misses += 1
+            name = db.query(User.Username).filter(User.UserID == uid).scalar()
+            if name is not None:
+                with self._lock:
+                    self._usernames[uid] = (time.monotonic() + self.ttl, name)
+                    self._bound(self._usernames, self.max_items)
+        if scope is not None:
+            scope[("user", uid)] = name
+        return name
+
+    def is_member(self, db, uid: int, game_id: int) -> bool:
+        key = (uid, game_id)
+        scope = self._request_scope()
+        if scope is not None and ("member", key) in scope:
+            return scope[("member", key)]
+        with self._lock:
+            member = self._has_member(uid, game_id)
+            if member:
+                self.hits += 1
+        if not member:
+            self.misses += 1
+            member = db.query(PlayerGame.PlayerGameID).filter_by(UserID=uid, GameID=game_id).first() is not None
+            if member:
+                self.member_joined(uid, game_id)
+        if scope is not None:
+            scope[("member", key)] = member
+        return member
+
+    def member_joined(self, uid: int, game_id: int) -> None:
+        """Write-through after a join has committed."""
+        with self._lock:
+            self._members.setdefault(game_id, {})[uid] = time.monotonic() + self.ttl
+            self._members.move_to_end(game_id)
+            self._bound(self._members, self.max_games)
+
+    def invalidate_game(self, game_id: int) -> None:
+        with self._lock:
+            self._members.pop(game_id, None)
+        scope = self._request_scope()
+        if scope is not None:
+            for key in [k for k in scope if k[0] == "member" and k[1][1] == game_id]:
+                del scope[key]
+
+    def invalidate_user(self, uid: int) -> None:
+        with self._lock:
+            self._usernames.pop(uid, None)
+        scope = self._request_scope()
+        if scope is not None:
+            scope.pop(("user", uid), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._usernames.clear()
+            self._members.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "usernames": len(self._usernames),
+                "membership_games": len(self._members),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+            }
+
+
+identity_cache = IdentityCache(
+    ttl=float(os.getenv("IDENTITY_CACHE_TTL", "60")),
+    max_items=int(os.getenv("IDENTITY_CACHE_SIZE", "65536")),
+    max_games=int(os.getenv("IDENTITY_CACHE_GAMES", "4096")),
+)
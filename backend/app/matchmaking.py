@@ -0,0 +1,83 @@
+# backend/app/matchmaking.py
+"""
+Open-slot matchmaking for POST /api/games/join_random (and the seat claim of join_by_code).
+
+Open public lobbies are read straight off ix_Game_Lobby_FreeSlots
+(Status, IsPrivate, MaxPlayers - CurrentPlayersCount, GameID): the first entry of the
+index is the fullest room that still has a seat, so picking it is an index seek instead
+of ORDER BY random() over every waiting game, and rooms fill up (and start) sooner.
+
+Pick and claim are one statement:
+
+  UPDATE Game SET CurrentPlayersCount = CurrentPlayersCount + 1
+   WHERE GameID = (<fullest open lobby> LIMIT 1 [FOR UPDATE SKIP LOCKED])
+     AND CurrentPlayersCount < MaxPlayers
+  RETURNING GameID
+
+so concurrent joiners can never overfill a room, and there is no stale candidate list
+to race on. Lobbies the joiner already sits in are skipped (a list subquery on the
+PlayerGame (UserID, GameID) key), so nobody takes two seats in one room.
+
+SQLite serializes writers, so the subquery always sees the latest counts; on Postgres
+SKIP LOCKED spreads simultaneous joiners over different lobbies, and a joiner that
+still loses a row gets no row back and simply tries again.
+"""
+from __future__ import annotations
+
+from sqlalchemy import select, update
+
+from ..database.models import Game, PlayerGame
+
+MAX_ATTEMPTS = 4
+
+FREE_SLOTS = Game.MaxPlayers - Game.CurrentPlayersCount
+
+
+def _open_lobby(uid: int):
+    """Fullest waiting public game with a free seat that `uid` is not already in."""
+    mine = select(PlayerGame.GameID).where(PlayerGame.UserID == uid)
+    return (
+        select(Game.GameID)
+          .where(Game.Status == "waiting", Game.IsPrivate == False, FREE_SLOTS > 0,
+                 Game.GameID.notin_(mine))
+          .order_by(FREE_SLOTS, Game.GameID)
+          .limit(1)
+    )
+
+
+def claim_slot(db, game_id: int) -> bool:
+    """Take one seat of a waiting game if it still has one; True if we got it."""
+    n = (
+        db.query(Game)
+          .filter(Game.GameID == game_id,
+                  Game.Status == "waiting",
+                  Game.CurrentPlayersCount < Game.MaxPlayers)
+          .update({Game.CurrentPlayersCount: Game.CurrentPlayersCount + 1},
+                  synchronize_session=False)
+    )
+    return n == 1
+
+
+def claim_open_lobby(db, uid: int) -> int | None:
+    """Take a seat for `uid` in the fullest open public lobby; its GameID, or None if none was claimed."""
+    pick = _open_lobby(uid).with_for_update(skip_locked=True).scalar_subquery()
+    return db.execute(
+        update(Game)
+          .where(Game.GameID == pick, Game.CurrentPlayersCount < Game.MaxPlayers)
+          .values(CurrentPlayersCount=Game.CurrentPlayersCount + 1)
+          .returning(Game.GameID)
+    ).scalar()
+
+
+def find_and_claim(db, uid: int) -> int | None:
+    """
+    Seat `uid` for join_random; the GameID of the claimed seat (the caller adds the
+    PlayerGame row and commits) or None when no lobby is open.
+    """
+    for _ in range(MAX_ATTEMPTS):
+        gid = claim_open_lobby(db, uid)
+        if gid is not None:
+            return gid
+        if db.execute(_open_lobby(uid)).first() is None:
+            break   # nothing open (rather than a lost race)
+    return None
@@ -0,0 +1,142 @@
+# backend/app/room_cache.py
+"""
+In-process cache of room snapshots (see room_snapshot.py), one entry per game.
+
+Every write path that changes what a room looks like invalidates its game right after the
+commit (through room_events.publish_room_state). That bumps the game's version and drops the
+cached snapshots, so the next read reloads from the DB while polls of unchanged rooms are
+served from memory.
+
+Versions come from one process-wide counter, so they only ever grow for a given game
+(also across eviction and reload). The counter starts from the clock, so versions handed
+out by different web workers practically never coincide.
+
+With several workers, invalidations reach the other processes through the Socket.IO
+message queue (socket_queue.py); ROOM_CACHE_TTL additionally bounds how long a snapshot
+can be served if such a message is lost.
+"""
+from __future__ import annotations
+import os
+import time
+import itertools
+import threading
+from collections import OrderedDict
+
+from ..database.db import SessionLocal
+from .room_snapshot import RoomSnapshot, load_room_snapshot
+
+
+class _Entry:
+    __slots__ = ("version", "snapshots", "loaded_at")
+
+    def __init__(self, version: int):
+        self.version = version
+        self.snapshots: dict[int | None, RoomSnapshot] = {}   # round_no (None = latest) -> snapshot
+        self.loaded_at = 0.0                                 # monotonic time of the first snapshot
+
+
+class RoomStateCache:
+    def __init__(self, max_games: int = 1024, ttl: float = 0.0):
+        self.max_games = max_games
+        self.ttl = ttl                      # seconds; 0 = entries live until invalidated
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = itertools.count(int(time.time() * 1000) * 1000)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    # ---------- internals (call with the lock held) ----------
+    def _entry(self, game_id: int) -> _Entry:
+        entry = self._entries.get(game_id)
+        if entry is None:
+            entry = self._entries[game_id] = _Entry(next(self._clock))
+            while len(self._entries) > self.max_games:
+                self._entries.popitem(last=False)   # least recently used game
+                self.evictions += 1
+        else:
+            self._entries.move_to_end(game_id)
+            if self.ttl and entry.snapshots and time.monotonic() - entry.loaded_at > self.ttl:
+                entry.version = next(self._clock)
+                entry.snapshots.clear()
+                self.expired += 1
+        return entry
+
+    # ---------- public API ----------
+    def snapshot(self, game_id: int, round_no: int | None = None) -> RoomSnapshot | None:
+        """Cached snapshot of the game (latest round when `round_no` is None); loads on miss."""
+        return self.versioned(game_id, round_no)[1]
+
+    def versioned(self, game_id: int, round_no: int | None = None) -> tuple[int, RoomSnapshot | None]:
+        """Like snapshot(), but also returns the version the snapshot belongs to."""
+        with self._lock:
+            entry = self._entry(game_id)
+            snap = entry.snapshots.get(round_no)
+            if snap is not None:
+                self.hits += 1
+                return entry.version, snap
+            self.misses += 1
+            version = entry.version
+
+        db = SessionLocal()
+        try:
+            snap = load_room_snapshot(db, game_id, round_no)
+        finally:
+            db.close()
+
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if snap is None:
+                # unknown game (or round): don't let lookups of made-up IDs evict real rooms
+                if entry is not None and entry.version == version and not entry.snapshots:
+                    del self._entries[game_id]
+            # a write that committed while we were loading makes this snapshot stale: don't keep it
+            elif entry is not None and entry.version == version:
+                if not entry.snapshots:
+                    entry.loaded_at = time.monotonic()
+                entry.snapshots[round_no] = snap
+        return version, snap
+
+    def cached(self, game_id: int) -> tuple[int | None, RoomSnapshot | None]:
+        """(version, latest snapshot) if already in memory; never touches the DB or the counters."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None:
+                return None, None
+            return entry.version, entry.snapshots.get(None)
+
+    def version(self, game_id: int) -> int:
+        with self._lock:
+            return self._entry(game_id).version
+
+    def invalidate(self, game_id: int) -> int:
+        """Call after committing a change to the game; returns the new version."""
+        with self._lock:
+            entry = self._entry(game_id)
+            entry.version = next(self._clock)
+            entry.snapshots.clear()
+            return entry.version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "games": len(self._entries),
+                "max_games": self.max_games,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else None,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+room_cache = RoomStateCache(
+    max_games=int(os.getenv("ROOM_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("ROOM_CACHE_TTL", "0")),
+)
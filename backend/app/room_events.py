@@ -0,0 +1,74 @@
+# backend/app/room_events.py
+"""
+Server push of room state.
+
+Write paths call `publish_room_state(game_id)` right after their commit. It invalidates the
+cached room (room_cache.py), reloads it once and emits a versioned `room:state` delta to
+everyone in `game-<id>`:
+
+    {"gameId": 7, "version": 42, "baseVersion": 41, "delta": {"scores": {...}, "status": "completed"}}
+
+A client that holds `baseVersion` applies the delta and moves to `version`; any other client
+(missed an event, fresh page, reconnect) asks for the full state with `room:sync` (sockets.py).
+
+Players waiting in the menu lobby are in `lobby-<id>` instead (`lobby:join`). Joins and the
+start of the game push them the whole (small) lobby with `publish_lobby(game_id)`:
+
+    {"gameId": 7, "version": 42, "status": "waiting", "game_code": "AB12CD", "players": [...], "max_players": 5}
+"""
+from __future__ import annotations
+from ..extensions import socketio
+from .room_cache import room_cache
+from .socket_queue import broadcast_invalidation
+
+
+def lobby_room(game_id: int) -> str:
+    return f"lobby-{game_id}"
+
+
+def lobby_etag(game_id: int, version: int) -> str:
+    """ETag of GET /api/games/<id>/lobby; changes with every room_cache version of the game."""
+    return f"lobby-{game_id}-{version}"
+
+
+def state_delta(before: dict | None, after: dict) -> dict:
+    """Keys of `after` whose value differs from `before` (everything when there is no `before`)."""
+    before = before or {}
+    return {k: v for k, v in after.items() if before.get(k) != v}
+
+
+def publish_room_state(game_id: int) -> int:
+    """Invalidate + push the new state of `game_id`; returns the new version."""
+    base_version, before = room_cache.cached(game_id)
+    room_cache.invalidate(game_id)
+    try:
+        broadcast_invalidation(socketio, game_id)   # other workers' caches (multi-process mode)
+    except Exception:
+        pass
+    version, snap = room_cache.versioned(game_id)
+    if snap is None:
+        return version
+
+    try:
+        socketio.emit("room:state", {
+            "gameId": game_id,
+            "version": version,
+            # only a delta against a snapshot we actually had; otherwise clients must sync
+            "baseVersion": base_version if before is not None else None,
+            "delta": state_delta(before.public_state() if before else None, snap.public_state()),
+        }, to=f"game-{game_id}")
+    except Exception:
+        pass  # pushing is best-effort; room:sync / GET /api/room recover
+    return version
+
+
+def publish_lobby(game_id: int) -> None:
+    """Push the current lobby of `game_id` to `lobby-<id>`; call after publish_room_state()."""
+    version, snap = room_cache.versioned(game_id)
+    if snap is None:
+        return
+    try:
+        socketio.emit("lobby:update", {"gameId": game_id, "version": version, **snap.lobby_state()},
+                      to=lobby_room(game_id))
+    except Exception:
+        pass  # the lobby poll (304 while unchanged) picks it up
@@ -0,0 +1,137 @@
+# backend/app/room_snapshot.py
+"""
+Room snapshot builder shared by GET /api/room/<id> and GET /api/room/<id>/round/<n>.
+
+Everything the room view needs is loaded in exactly two queries:
+  1) Game + creator username + (latest or requested) Round + round winner username
+  2) players of the game with their scores (also used for the membership check)
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from sqlalchemy import func, select, and_
+from sqlalchemy.orm import aliased
+
+from ..database.models import Game, PlayerGame, Round, User
+
+
+@dataclass(frozen=True)
+class RoomSnapshot:
+    game_id: int
+    creator_id: int
+    turn: str | None                 # creator username (turn stays with creator)
+    total_rounds: int
+    round_no: int | None             # None when the game has no round yet
+    status: str                      # waiting_description | active | completed
+    description: str | None
+    started_at: str | None           # ISO + "Z", only once the round is described
+    winner: str | None
+    target_word: str | None
+    forbidden_words: tuple = ()
+    players: tuple = ()              # usernames, in join order
+    player_ids: frozenset = frozenset()
+    scores: dict = field(default_factory=dict)
+    game_status: str = "waiting"     # Game.Status: waiting | active | completed
+    game_code: str | None = None
+    max_players: int | None = None
+
+    def is_member(self, uid) -> bool:
+        return uid in self.player_ids
+
+    def public_state(self) -> dict:
+        """The part of the room every member sees (no secret words)."""
+        return {
+            "id": self.game_id,
+            "status": self.status,
+            "description": self.description,
+            "scores": dict(self.scores),
+            "players": list(self.players),
+            "turn": self.turn,
+            "startedAt": self.started_at,
+            "winner": self.winner,
+            "roundNumber": self.round_no or 1,
+            "totalRounds": self.total_rounds,
+        }
+
+    def lobby_state(self) -> dict:
+        """What the lobby panel in the menu shows (GET /api/games/<id>/lobby, lobby:update)."""
+        return {
+            "status": self.game_status,
+            "game_code": self.game_code,
+            "players": list(self.players),
+            "max_players": self.max_players,
+        }
+
+    def to_payload(self, uid) -> dict:
+        """JSON payload for `uid`; the creator sees the secret words until the round is described."""
+        payload = self.public_state()
+        if uid == self.creator_id and self.round_no is not None and not self.description:
+            payload["targetWord"] = self.target_word
+            payload["forbiddenWords"] = list(self.forbidden_words)
+        return payload
+
+
+def _round_status(rnd) -> str:
+    if not rnd or not rnd.Description:
+        return "waiting_description"
+    if rnd.Status == "completed":
+        return "completed"
+    return "active"
+
+
+def load_room_snapshot(db, game_id: int, round_no: int | None = None) -> RoomSnapshot | None:
+    """
+    Build the snapshot of `game_id` at round `round_no` (latest round when None).
+    Returns None if the game does not exist; a missing round yields `round_no=None`.
+    """
+    creator = aliased(User)
+    winner = aliased(User)
+
+    if round_no is None:
+        wanted_no = (
+            select(func.max(Round.RoundNumber))
+            .where(Round.GameID == game_id)
+            .scalar_subquery()
+        )
+    else:
+        wanted_no = round_no
+
+    row = (
+        db.query(Game, Round, creator.Username, winner.Username)
+          .outerjoin(creator, creator.UserID == Game.CreatorID)
+          .outerjoin(Round, and_(Round.GameID == Game.GameID, Round.RoundNumber == wanted_no))
+          .outerjoin(winner, winner.UserID == Round.RoundWinnerID)
+          .filter(Game.GameID == game_id)
+          .first()
+    )
+    if row is None:
+        return None
+    game, rnd, creator_name, winner_name = row
+
+    players_rows = (
+        db.query(PlayerGame.UserID, User.Username, PlayerGame.PlayerFinalScore)
+          .join(User, User.UserID == PlayerGame.UserID)
+          .filter(PlayerGame.GameID == game_id)
+          .order_by(PlayerGame.PlayerGameID.asc())
+          .all()
+    )
+
+    described = bool(rnd and rnd.Description)
+    return RoomSnapshot(
+        game_id=game.GameID,
+        creator_id=game.CreatorID,
+        turn=creator_name,
+        total_rounds=game.TotalRounds,
+        round_no=(rnd.RoundNumber if rnd else None),
+        status=_round_status(rnd),
+        description=(rnd.Description if rnd else None),
+        started_at=(rnd.StartTime.isoformat() + "Z") if (described and rnd.StartTime) else None,
+        winner=winner_name,
+        target_word=(rnd.TargetWord if rnd else None),
+        forbidden_words=tuple(rnd.ForbiddenWords or []) if rnd else (),
+        players=tuple(r[1] for r in players_rows),
+        player_ids=frozenset(r[0] for r in players_rows),
+        scores={r[1]: int(r[2] or 0) for r in players_rows},
+        game_status=game.Status,
+        game_code=game.GameCode,
+        max_players=game.MaxPlayers,
+    )
@@ -0,0 +1,171 @@
+# backend/app/rounds.py
+"""
+Round finalization shared by PUT /guess and the chat:send socket.
+
+A round is won by a single conditional UPDATE (... WHERE RoundWinnerID IS NULL);
+whoever gets rowcount 1 owns the win and does the scoring / next round, everyone
+else is treated as a late (wrong) guess. No Python-side "is it still open?" check,
+so two concurrent correct guesses can never both win.
+
+The leader (and final winner) is read from PlayerGame inside the same
+transaction, so it reflects the committed scores of every worker: highest
+score first, ties broken by the lower UserID.
+"""
+from __future__ import annotations
+import datetime as dt
+from dataclasses import dataclass
+
+from ..database.models import Game, GameSettings, PlayerGame, Round, Guess
+from .word_queue import word_queue
+from .user_stats import record_win
+
+
+@dataclass(frozen=True)
+class RoundWin:
+    award: int
+    round_no: int
+    word: str
+    game_completed: bool
+
+
+def claim_round(db, round_id: int, uid: int, now: dt.datetime) -> bool:
+    """
+    Mark `uid` as the winner of `round_id` unless somebody already is;
+    True if we got it.
+    """
+    n = (
+        db.query(Round)
+          .filter(Round.RoundID == round_id,
+                  Round.RoundWinnerID.is_(None),
+                  Round.Status != "completed")
+          .update({Round.RoundWinnerID: uid, Round.EndTime: now, Round.Status: "completed"},
+                  synchronize_session="evaluate")
+    )
+    return n == 1
+
+
+def current_leader(db, game_id: int) -> tuple[int, int] | None:
+    """
+    (UserID, PlayerFinalScore) of the stored leader of `game_id`, highest score
+    first, ties to the lower UserID (one ix_PlayerGame_GameID lookup).
+    """
+    row = (
+        db.query(PlayerGame.UserID, PlayerGame.PlayerFinalScore)
+          .filter(PlayerGame.GameID == game_id)
+          .order_by(PlayerGame.PlayerFinalScore.desc(), PlayerGame.UserID.asc())
+          .first()
+    )
+    return (int(row[0]), int(row[1] or 0)) if row else None
+
+
+def finish_round(db, game: Game, rnd: Round, uid: int, guess_text: str,
+                 now: dt.datetime, pg: PlayerGame | None = None) -> RoundWin | None:
+    """
+    Try to win `rnd` for `uid` with `guess_text`. On success records the scoring
+    Guess, player and profile stats, and either the next round or the end of the
+    game, all in the caller's transaction (the caller commits). The leader is
+    recomputed inside that same round transaction, from one current_leader()
+    query over PlayerGame, so a rollback leaves no trace of it.
+    Returns None if the round was already won.
+    """
+    if not claim_round(db, rnd.RoundID, uid, now):
+        return None
+
+    elapsed_sec = max(0.0, (now - (rnd.StartTime or now)).total_seconds())
+
+    # award points (from settings, default 100)
+    settings = db.query(GameSettings).filter(GameSettings.GameID == game.GameID).first()
+    award = int(getattr(settings, "PointsCorrectGuess", 100) or 100)
+
+    # scoring record of the win (profile / stats read these)
+    db.add(Guess(
+        GameID=game.GameID,
+        RoundID=rnd.RoundID,
+        GuesserID=uid,
+        GuessText=guess_text,
+        GuessTime=now,
+        ResponseTimeSeconds=elapsed_sec,
+        PointsAwarded=award,
+        IsCorrect=True,
+    ))
+
+    # correct-guess stats
+    if pg is None:
+        pg = db.query(PlayerGame).filter_by(GameID=game.GameID, UserID=uid).one()
+    prev_n  = int(pg.TotalCorrectGuesses or 0)
+    new_n   = prev_n + 1
+    prevavg = float(pg.AverageGuessTime or 0.0)
+    pg.TotalCorrectGuesses = new_n
+    pg.AverageGuessTime    = ((prevavg * prev_n) + elapsed_sec) / new_n
+    if pg.BestGuessTime is None:
+        pg.BestGuessTime = elapsed_sec
+    else:
+        pg.BestGuessTime = min(float(pg.BestGuessTime), elapsed_sec)
+
+    # ----- CURRENT LEADER (highest score so far), NOT turn owner -----
+    # one read of the stored scores, before this award: the new leader is either
+    # the old one or `uid`, whichever ranks first with the awarded score
+    prev_top = current_leader(db, game.GameID)
+    new_score = int(pg.PlayerFinalScore or 0) + award
+    pg.PlayerFinalScore = new_score
+    prev_top_user = prev_top[0] if prev_top else None
+    if (prev_top is None or prev_top_user == uid
+            or (-new_score, uid) < (-prev_top[1], prev_top_user)):
+        new_top_user = uid
+    else:
+        new_top_user = prev_top_user
+
+    game.CurrentLeaderID = int(new_top_user)
+    if new_top_user == uid and prev_top_user != uid:
+        pg.TimesAsLeader = int(pg.TimesAsLeader or 0) + 1
+
+    # profile totals + fastest/hardest lists
+    record_win(db, uid, award, game=game, rnd=rnd, secs=elapsed_sec, when=now)
+
+    # Advance currentRound = min(rnd.RoundNumber + 1, TotalRounds)
+    if game.TotalRounds:
+        game.CurrentRound = min((rnd.RoundNumber or 1) + 1, game.TotalRounds)
+    else:
+        game.CurrentRound = (rnd.RoundNumber or 1) + 1
+
+    # ---- Decide last round WITHOUT counting ----
+    is_last_round = bool(game.TotalRounds) and (rnd.RoundNumber >= game.TotalRounds)
+
+    if is_last_round:
+        # finalize game (pick winner by highest score)
+        winner_id = new_top_user
+        if winner_id is not None:
+            game.WinnerID = int(winner_id)
+            db.query(PlayerGame).filter(PlayerGame.GameID == game.GameID).update(
+                {PlayerGame.HasWon: PlayerGame.UserID == game.WinnerID},
+                synchronize_session=False,
+            )
+        game.Status = "completed"
+        game.EndedAt = now
+        word_queue.discard(db, game.GameID)
+    else:
+        # create next round; turn stays with creator
+        next_rn = (rnd.RoundNumber or 1) + 1
+
+        # pre-generated by the word queue; falls back instead of waiting on the AI
+        target_word, forbidden_list = word_queue.take(
+            db, game.GameID, rounds_left=(game.TotalRounds or next_rn) - next_rn)
+
+        db.add(Round(
+            GameID=game.GameID,
+            RoundNumber=next_rn,
+            RoundWinnerID=None,
+            TargetWord=target_word,
+            Description=None,             # player will fill in
+            ForbiddenWords=forbidden_list,
+            Hints=[],
+            StartTime=None,
+            EndTime=None,
+            MaxRoundTime=rnd.MaxRoundTime,
+            Status="waiting_description",
+        ))
+        game.Status = "active"
+
+    return RoundWin(award=award, round_no=rnd.RoundNumber, word=rnd.TargetWord,
+                    game_completed=is_last_round)
+
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, sessio
 from werkzeug.security import generate_password_hash, check_password_hash
 from ...database.db import SessionLocal
 from ...database.models import User
+from ...concurrency import run_blocking
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -26,6 +27,9 @@ def signup_post():
         flash("Please fill all fields.", "error")
         return redirect(url_for("auth.signup_get"))
 
+    # CPU-bound: hashed on a native thread, before a DB connection is checked out for it
+    password_hash = run_blocking(generate_password_hash, password)
+
     db = _get_db()
     try:
         if db.query(User).filter((User.Username == username) | (User.Email == email)).first():
@@ -35,7 +39,7 @@ def signup_post():
         user = User(
             Username=username,
             Email=email,
-            PasswordHash=generate_password_hash(password)
+            PasswordHash=password_hash
         )
         db.add(user)
         db.commit()
@@ -69,19 +73,24 @@ def login_post():
 
     db = _get_db()
     try:
-        user = db.query(User).filter(User.Username == username).first()
-        if not user or not check_password_hash(user.PasswordHash, password):
-            # RED message on wrong creds
-            flash("Wrong username or password.", "error")
-            return redirect(url_for("auth.login_get"))
+        user = (
+            db.query(User.UserID, User.Username, User.PasswordHash)
+              .filter(User.Username == username)
+              .first()
+        )
+    finally:
+        db.close()   # don't hold a connection while the hash is checked
 
-        session["user_id"] = user.UserID
-        session["username"] = user.Username
-        session.permanent = True
+    if not user or not run_blocking(check_password_hash, user.PasswordHash, password):
+        # RED message on wrong creds
+        flash("Wrong username or password.", "error")
+        return redirect(url_for("auth.login_get"))
 
-        return redirect(url_for("pages.menu"))
-    finally:
-        db.close()
+    session["user_id"] = user.UserID
+    session["username"] = user.Username
+    session.permanent = True
+
+    return redirect(url_for("pages.menu"))
 
 @auth_bp.get("/logout")
 def logout():
@@ -1,8 +1,16 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session
 from ...database.db import SessionLocal
 from ...database.models import User, Game, GameSettings, PlayerGame, Round
-from sqlalchemy import func
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import aliased
 from ...extensions import socketio
+from ..room_events import publish_room_state, publish_lobby, lobby_etag
+from ..room_cache import room_cache
+from ..frozen_cache import past_games
+from ..identity_cache import identity_cache
+from ..word_queue import word_queue, request_word_set, fallback_word_set
+from ..user_stats import record_join
+from ..matchmaking import find_and_claim, claim_slot
 import os, requests
 import unicodedata, re
 
@@ -21,18 +29,11 @@ def _gen_words():
     Fallback to a safe default if AI is unreachable.
     """
     try:
-        r = requests.post(f"{AI_BASE_URL}/gen_words", json={}, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        target = str(data.get("targetWord", "")).strip().lower()
-        forb   = [str(w).strip().lower() for w in (data.get("forbiddenWords") or []) if str(w).strip()]
-        if not target or not forb:
-            raise ValueError("AI returned incomplete data")
-        return target, forb
+        return request_word_set(timeout=30)
     except Exception:
         # safe fallback if AI is down
-        return "tree", ["leaf", "wood", "forest"]
-    
+        return fallback_word_set()
+
 def _db():
     return SessionLocal()
 
@@ -115,8 +116,10 @@ def create_game():
 
         # add creator as first player
         db.add(PlayerGame(UserID=user.UserID, GameID=game.GameID))
+        record_join(db, user.UserID)
 
         db.commit()
+        identity_cache.member_joined(user.UserID, game.GameID)
         return jsonify(
             ok=True,
             game_id=game.GameID,
@@ -145,15 +148,19 @@ def join_by_code():
         game = db.query(Game).filter_by(GameCode=code).first()
         if not game or game.Status != "waiting":
             return jsonify(error="not_joinable"), 400
-        if game.CurrentPlayersCount >= game.MaxPlayers:
-            return jsonify(error="room_full"), 409
 
-        # add player if not already in
+        # add player if not already in; the seat is claimed atomically (no overfill)
         if not db.query(PlayerGame).filter_by(UserID=uid, GameID=game.GameID).first():
+            if not claim_slot(db, game.GameID):
+                db.rollback()
+                return jsonify(error="room_full"), 409
             db.add(PlayerGame(UserID=uid, GameID=game.GameID))
-            game.CurrentPlayersCount += 1
+            record_join(db, uid)
 
         db.commit()
+        identity_cache.member_joined(uid, game.GameID)
+        publish_room_state(game.GameID)
+        publish_lobby(game.GameID)
         return jsonify(ok=True, game_id=game.GameID, game_code=game.GameCode)
     except Exception as e:
         db.rollback()
@@ -161,7 +168,7 @@ def join_by_code():
     finally:
         db.close()
 
-# --- Join random: any waiting public game with free slot ---
+# --- Join random: fullest waiting public game with a free slot ---
 @games_bp.post("/join_random")
 def join_random():
     uid, err = _require_login()
@@ -169,55 +176,52 @@ def join_random():
         return err
     db = _db()
     try:
-        game = (
-            db.query(Game)
-              .filter_by(Status="waiting", IsPrivate=False)
-              .filter(Game.CurrentPlayersCount < Game.MaxPlayers)
-              .order_by(func.random())
-              .first()
-        )
-        if not game:
+        game_id = find_and_claim(db, uid)   # seat already taken atomically
+        if game_id is None:
+            db.rollback()
             return jsonify(error="no_games_available"), 404
 
-        if not db.query(PlayerGame).filter_by(UserID=uid, GameID=game.GameID).first():
-            db.add(PlayerGame(UserID=uid, GameID=game.GameID))
-            game.CurrentPlayersCount += 1
+        db.add(PlayerGame(UserID=uid, GameID=game_id))
+        record_join(db, uid)
 
+        code = db.query(Game.GameCode).filter(Game.GameID == game_id).scalar()
         db.commit()
-        return jsonify(ok=True, game_id=game.GameID, game_code=game.GameCode)
+        identity_cache.member_joined(uid, game_id)
+        publish_room_state(game_id)
+        publish_lobby(game_id)
+        return jsonify(ok=True, game_id=game_id, game_code=code)
     except Exception as e:
         db.rollback()
         return jsonify(error="join_random_failed", detail=str(e)), 400
     finally:
         db.close()
 
-# --- Lobby: list players (polling) ---
+# --- Lobby: list players ---
+# Waiting players get `lobby:update` pushes (room_events.publish_lobby); this endpoint is the
+# fallback poll. The ETag is the room_cache version, so an unchanged lobby is a 304 without
+# touching the DB, and a changed one is served from the cached room snapshot.
 @games_bp.get("/<int:game_id>/lobby")
 def lobby(game_id: int):
     uid, err = _require_login()
     if err:
         return err
-    db = _db()
-    try:
-        game = db.query(Game).get(game_id)
-        if not game:
-            return jsonify(error="game_not_found"), 404
-        # anyone who joined can see lobby
-        rows = (
-            db.query(User.Username)
-              .join(PlayerGame, PlayerGame.UserID == User.UserID)
-              .filter(PlayerGame.GameID == game_id)
-              .all()
-        )
-        return jsonify(
-            ok=True,
-            status=game.Status,
-            game_code=game.GameCode,
-            players=[r[0] for r in rows],
-            max_players=game.MaxPlayers
-        )
-    finally:
-        db.close()
+    # cached(): no entry for a game that isn't in memory (or doesn't exist), so probing IDs
+    # cannot push real rooms out of the cache; without an entry there is nothing to match
+    version, _ = room_cache.cached(game_id)
+    etag = lobby_etag(game_id, version) if version is not None else None
+    if etag and etag in request.if_none_match:
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+
+    version, snap = room_cache.versioned(game_id)
+    if snap is None:
+        return jsonify(error="game_not_found"), 404
+    # anyone who joined can see lobby
+    resp = jsonify(ok=True, **snap.lobby_state())
+    resp.set_etag(lobby_etag(game_id, version))
+    resp.headers["Cache-Control"] = "no-cache"   # browsers must revalidate (cheap 304)
+    return resp
 
 # --- Start game (creator only) + create Round + word set, then return room_url ---
 @games_bp.post("/<int:game_id>/start")
@@ -242,9 +246,23 @@ def start_game(game_id: int):
         except Exception:
             pass  # ignore socket errors from api call to ai 
 
+        # never hold a DB connection across the AI call (ends the read transaction)
+        db.rollback()
         # uses AI (but has a fallback))
         target, forbidden_list = _gen_words()
 
+        # the status check above was before the AI call: claim the start again now, so of two
+        # concurrent starts only one creates round 1
+        claimed = (
+            db.query(Game)
+              .filter(Game.GameID == game_id, Game.Status == "waiting")
+              .update({Game.Status: "active", Game.StartedAt: dt.datetime.utcnow()},
+                      synchronize_session="evaluate")
+        )
+        if not claimed:
+            db.rollback()
+            return jsonify(error="bad_status"), 400
+
         round_rec = Round(
             GameID=game.GameID,
             RoundNumber=1,
@@ -260,10 +278,11 @@ def start_game(game_id: int):
             Status="waiting_description",
         )
         db.add(round_rec)
-
-        game.Status = "active"
-        game.StartedAt = dt.datetime.utcnow()
         db.commit()
+        publish_room_state(game.GameID)
+        publish_lobby(game.GameID)
+        # fetch the words of the next rounds while round 1 is being played
+        word_queue.prefill(db, game.GameID, rounds_left=(game.TotalRounds or 1) - 1)
 
         # Notifying clients that words are ready (creator modal switches from "loading" → "ready")
         try:
@@ -285,35 +304,58 @@ def start_game(game_id: int):
 
 
 # --- My active / past games for right panel ---
+# Both lists are paged (?limit=, ?cursor=) and built from a fixed number of queries:
+# one for the page of games, one grouped/IN query for the per-game extras.
+MY_GAMES_DEFAULT_LIMIT = 50
+MY_GAMES_MAX_LIMIT = 200
+
+def _page_limit() -> int:
+    try:
+        limit = int(request.args.get("limit", MY_GAMES_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = MY_GAMES_DEFAULT_LIMIT
+    return max(1, min(limit, MY_GAMES_MAX_LIMIT))
+
+
 @games_bp.get("/my_active")
 def my_active():
     uid, err = _require_login()
     if err:
         return err
 
+    limit = _page_limit()
+    cursor = request.args.get("cursor", type=int)   # GameID of the last game already shown
+
     db = _db()
     try:
-        games = (
+        q = (
             db.query(Game)
               .join(PlayerGame, PlayerGame.GameID == Game.GameID)
               .filter(PlayerGame.UserID == uid)
               .filter(Game.Status.in_(["waiting", "active"]))
-              .order_by(Game.CreatedAt.desc())
-              .all()
         )
+        if cursor:
+            q = q.filter(Game.GameID < cursor)
+        # GameID follows CreatedAt, and unlike it is unique (stable keyset)
+        games = q.order_by(Game.GameID.desc()).limit(limit + 1).all()
+        has_more = len(games) > limit
+        games = games[:limit]
+
+        completed = {}
+        if games:
+            completed = dict(
+                db.query(Round.GameID, func.count(Round.RoundID))
+                  .filter(Round.GameID.in_([g.GameID for g in games]), Round.Status == "completed")
+                  .group_by(Round.GameID)
+                  .all()
+            )
 
         out = []
         for g in games:
             total_rounds = int(getattr(g, "TotalRounds", 0) or 0)
 
-            completed_count = (
-                db.query(func.count(Round.RoundID))
-                  .filter(Round.GameID == g.GameID, Round.Status == "completed")
-                  .scalar()
-            ) or 0
-
             # shows currennt running round, or 1 if none started yet
-            current_round = completed_count + 1
+            current_round = int(completed.get(g.GameID, 0)) + 1
             if total_rounds > 0:
                 current_round = min(current_round, total_rounds)
 
@@ -329,55 +371,111 @@ def my_active():
                 "currentRound": int(max(1, current_round)),
             })
 
-        return jsonify(out)
+        resp = jsonify(out)   # body stays a plain list; the next page is announced in a header
+        if has_more:
+            resp.headers["X-Next-Cursor"] = str(games[-1].GameID)
+        return resp
     finally:
         db.close()
 
 
+def _past_cursor(ended_at, game_id) -> str:
+    return f"{ended_at.isoformat() if ended_at else ''}_{game_id}"
+
+def _parse_past_cursor(raw: str | None):
+    """'<EndedAt iso>_<GameID>' -> (datetime | None, int), or None when absent/invalid."""
+    if not raw or "_" not in raw:
+        return None
+    ts, _, gid = raw.rpartition("_")
+    try:
+        return (dt.datetime.fromisoformat(ts) if ts else None), int(gid)
+    except ValueError:
+        return None
+
+
 @games_bp.get("/my_past")
 def my_past_games():
     uid = session.get("user_id")
     if not uid:
         return jsonify(error="not_logged_in"), 401
 
+    limit = _page_limit()
+    cursor = _parse_past_cursor(request.args.get("cursor"))
+
     db = _db()
     try:
+        Winner = aliased(User)
         q = (
-            db.query(Game)
+            db.query(Game, Winner.Username)
               .join(PlayerGame, PlayerGame.GameID == Game.GameID)
+              .outerjoin(Winner, Winner.UserID == Game.WinnerID)
               .filter(PlayerGame.UserID == uid, Game.Status == "completed")
-              .order_by(Game.EndedAt.desc().nullslast())
         )
-
-        items = []
-        for g in q.all():
-            players = (
-                db.query(User.Username)
-                  .join(PlayerGame, PlayerGame.UserID == User.UserID)
-                  .filter(PlayerGame.GameID == g.GameID)
+        # newest first, games without EndedAt last; GameID breaks ties
+        if cursor:
+            c_ended, c_id = cursor
+            if c_ended is None:
+                q = q.filter(Game.EndedAt.is_(None), Game.GameID < c_id)
+            else:
+                q = q.filter(or_(
+                    Game.EndedAt < c_ended,
+                    and_(Game.EndedAt == c_ended, Game.GameID < c_id),
+                    Game.EndedAt.is_(None),
+                ))
+        rows = (
+            q.order_by(Game.EndedAt.is_(None), Game.EndedAt.desc(), Game.GameID.desc())
+             .limit(limit + 1)
+             .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # completed games never change: items come from past_games, and only the games
+        # missing there need their player names (everyone's, in one query)
+        items_by_game = {g.GameID: past_games.get(g.GameID) for g, _ in rows}
+        missing = [gid for gid, item in items_by_game.items() if item is None]
+        players_by_game = {}
+        if missing:
+            for gid, uname in (
+                db.query(PlayerGame.GameID, User.Username)
+                  .join(User, User.UserID == PlayerGame.UserID)
+                  .filter(PlayerGame.GameID.in_(missing))
+                  .order_by(PlayerGame.GameID, PlayerGame.PlayerGameID)
                   .all()
-            )
-            players = [p[0] for p in players]
-            duration_sec = None
-            if g.StartedAt and g.EndedAt:
-                duration_sec = int((g.EndedAt - g.StartedAt).total_seconds())
-
-            winner = "None"
-            if g.WinnerID:
-                winner = db.query(User.Username).filter(User.UserID == g.WinnerID).scalar()
-
-            items.append({
-                "game_id": g.GameID,
-                "game_code": g.GameCode,
-                "ended_at": g.EndedAt.isoformat() + "Z" if g.EndedAt else None,
-                "started_at": g.StartedAt.isoformat() + "Z" if g.StartedAt else None,
-                "total_rounds": g.TotalRounds,
-                "players_count": len(players),
-                "players": players,
-                "duration_sec": duration_sec,
-                "winner": winner
-            })
+            ):
+                players_by_game.setdefault(gid, []).append(uname)
 
-        return jsonify(ok=True, games=items)
+        items = []
+        for g, winner_name in rows:
+            item = items_by_game[g.GameID]
+            if item is None:
+                players = players_by_game.get(g.GameID, [])
+                duration_sec = None
+                if g.StartedAt and g.EndedAt:
+                    duration_sec = int((g.EndedAt - g.StartedAt).total_seconds())
+
+                item = {
+                    "game_id": g.GameID,
+                    "game_code": g.GameCode,
+                    "ended_at": g.EndedAt.isoformat() + "Z" if g.EndedAt else None,
+                    "started_at": g.StartedAt.isoformat() + "Z" if g.StartedAt else None,
+                    "total_rounds": g.TotalRounds,
+                    "players_count": len(players),
+                    "players": players,
+                    "duration_sec": duration_sec,
+                    "winner": winner_name if g.WinnerID else "None"
+                }
+                past_games.put(g.GameID, item)
+            items.append(item)
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1][0]
+            next_cursor = _past_cursor(last.EndedAt, last.GameID)
+        # the page only changes when a game of the user ends: a strong ETag makes reloads 304s
+        resp = jsonify(ok=True, games=items, next_cursor=next_cursor)
+        resp.add_etag()
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp.make_conditional(request)
     finally:
         db.close()
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, session, redirect, url_for, abort
 from ...database.db import SessionLocal
-from ...database.models import PlayerGame, Game
+from ...database.models import Game
+from ..identity_cache import identity_cache
 
 pages_bp = Blueprint("pages", __name__)
 
@@ -27,8 +28,7 @@ def room(game_id: int, round_no: int | None = None):
       game = db.query(Game).get(game_id)
       if not game:
           abort(404)
-      in_game = db.query(PlayerGame).filter_by(UserID=uid, GameID=game_id).first()
-      if not in_game:
+      if not identity_cache.is_member(db, uid, game_id):
           return redirect(url_for("pages.menu"))
       # Same template in both cases; JS reads game_id/round_no from URL
       return render_template("room.html")
@@ -1,7 +1,6 @@
 from flask import Blueprint, jsonify, session
 from ...database.db import SessionLocal
-from ...database.models import User, Game, Round, Guess, PlayerGame
-from sqlalchemy import func
+from ...database.models import User, UserStats
 
 profile_bp = Blueprint("profile", __name__)
 
@@ -16,62 +15,24 @@ def profile_summary():
 
     db = _db()
     try:
-        # some basic stats
-        total_games = (
-            db.query(func.count(PlayerGame.PlayerGameID))
-              .filter(PlayerGame.UserID == uid)
-              .scalar()
+        # materialized by app/user_stats.py: one primary-key lookup
+        row = (
+            db.query(User.TotalGamesPlayed, User.TotalScore, UserStats.Fastest, UserStats.Hardest)
+              .outerjoin(UserStats, UserStats.UserID == User.UserID)
+              .filter(User.UserID == uid)
+              .first()
         )
-        total_score = (
-            db.query(func.coalesce(func.sum(PlayerGame.PlayerFinalScore), 0))
-              .filter(PlayerGame.UserID == uid)
-              .scalar()
-        )
-
-        base = (
-            db.query(
-                Guess.ResponseTimeSeconds.label("secs"),
-                Round.TargetWord.label("word"),
-                Round.RoundNumber.label("round_no"),
-                Game.GameID.label("game_id"),
-                Game.GameCode.label("game_code"),
-                Guess.GuessTime.label("when_ts")
-            )
-            .join(Round, Round.RoundID == Guess.RoundID)
-            .join(Game,  Game.GameID  == Guess.GameID)
-            .filter(Guess.GuesserID == uid, Guess.IsCorrect == True)
-        )
-
-        fastest = (
-            base.order_by("secs")
-                .limit(3)
-                .all()
-        )
-
-        hardest = ( # longest time to answer correctly
-            base.order_by(func.coalesce(Guess.ResponseTimeSeconds, 0).desc())
-                .limit(3)
-                .all()
-        )
-
-        def _row_to_dict(r):
-            return {
-                "word": r.word,
-                "response_sec": float(r.secs or 0.0),
-                "game_id": r.game_id,
-                "game_code": r.game_code,
-                "round_no": r.round_no,
-                "when": r.when_ts.isoformat() + "Z" if r.when_ts else None
-            }
+        if row is None:
+            return jsonify(error="user_not_found"), 404
 
         return jsonify(
             ok=True,
             totals={
-                "total_games": int(total_games or 0),
-                "total_score": int(total_score or 0)
+                "total_games": int(row.TotalGamesPlayed or 0),
+                "total_score": int(row.TotalScore or 0)
             },
-            fastest=[_row_to_dict(x) for x in fastest],
-            hardest=[_row_to_dict(x) for x in hardest]
+            fastest=list(row.Fastest or []),
+            hardest=list(row.Hardest or [])
         )
     finally:
         db.close()
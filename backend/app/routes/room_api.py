@@ -1,8 +1,16 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session
 from ...database.db import SessionLocal
-from ...database.models import Game, PlayerGame, Round, Guess, User,  GameSettings, ChatMessage
+from ...database.models import Game, PlayerGame, Round, Guess, User,  GameSettings, ChatMessage, PendingDescriptionCheck
 from ...extensions import socketio
+from ..room_cache import room_cache
+from ..identity_cache import identity_cache
+from ..frozen_cache import FrozenPayload, completed_rounds, IMMUTABLE_CACHE_CONTROL
+from ..room_events import publish_room_state
+from ..word_matcher import normalize as _normalize, matcher_for_round
+from ..background import tasks
+from ..rounds import finish_round
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 import datetime as dt
 import re
@@ -12,26 +20,53 @@ room_bp = Blueprint("room_api", __name__)
 
 import os, requests  
 AI_BASE_URL = os.getenv("AI_BASE_URL", "http://ai:9001")
+# "async": put_description answers 202 after the local checks and the AI verdict is
+# delivered over round:ai_progress; "sync" (default) waits for the AI service.
+DESC_CHECK_MODE = os.getenv("DESC_CHECK_MODE", "sync").lower()
+
+# a PendingDescriptionCheck row marks a round whose verification is in flight, on any
+# process; a marker older than this (its process died mid-check) no longer blocks the round
+DESC_PENDING_TTL = float(os.getenv("DESC_PENDING_TTL", "120"))
 
 # ---------- helpers ----------
 def _db():
     return SessionLocal()
 
+def _claim_desc_check(round_id: int) -> bool:
+    """Mark `round_id` as being verified; False if a live check for it already runs."""
+    db = _db()
+    try:
+        now = dt.datetime.utcnow()
+        db.query(PendingDescriptionCheck).filter(
+            PendingDescriptionCheck.RoundID == round_id,
+            PendingDescriptionCheck.StartedAt < now - dt.timedelta(seconds=DESC_PENDING_TTL),
+        ).delete(synchronize_session=False)
+        db.add(PendingDescriptionCheck(RoundID=round_id, StartedAt=now))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+def _release_desc_check(round_id: int) -> None:
+    db = _db()
+    try:
+        db.query(PendingDescriptionCheck).filter(PendingDescriptionCheck.RoundID == round_id)\
+          .delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
 def _require_member(db, game_id):
     uid = session.get("user_id")
     if not uid:
         return None, (jsonify(error="not_logged_in"), 401)
-    in_game = db.query(PlayerGame).filter_by(UserID=uid, GameID=game_id).first()
-    if not in_game:
+    if not identity_cache.is_member(db, uid, game_id):
         return None, (jsonify(error="not_in_game"), 403)
     return uid, None
 
-_ws_re = re.compile(r"\s+")
-def _normalize(s: str) -> str:
-    s = (s or "").strip().lower()
-    s = re.sub(r"[^\w\s]", " ", s)
-    return _ws_re.sub(" ", s).strip()
-
 def _emit(event, data, game_id):
     if socketio:
         socketio.emit(event, data, to=f"game-{game_id}")
@@ -39,130 +74,115 @@ def _emit(event, data, game_id):
 def _emit_ai(game_id, phase, **extra):
     _emit("round:ai_progress", {"phase": phase, **extra}, game_id)
 
-def _round_status(rnd) -> str:
-    if not rnd or not rnd.Description:
-        return "waiting_description"
-    if rnd.Status == "completed":
-        return "completed"
-    return "active"
-
 # ---------- endpoints ----------
+def _frozen_response(frozen: FrozenPayload):
+    """Serve a completed round: 304 when the client has it, else the stored body."""
+    if frozen.etag in request.if_none_match:
+        resp = Response(status=304)
+    else:
+        resp = Response(frozen.body, mimetype="application/json")
+    resp.set_etag(frozen.etag)
+    resp.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return resp
+
+def _snapshot_response(game_id: int, round_no: int | None = None):
+    """Shared by get_room / get_room_round: membership comes from the snapshot's player list."""
+    uid = session.get("user_id")
+    if not uid:
+        return jsonify(error="not_logged_in"), 401
+    if round_no is not None:
+        frozen = completed_rounds.get((game_id, round_no))
+        if frozen is not None:
+            if uid not in frozen.member_ids:
+                return jsonify(error="not_in_game"), 403
+            return _frozen_response(frozen)
+    version, snap = room_cache.versioned(game_id, round_no)
+    if not snap or not snap.is_member(uid):
+        return jsonify(error="not_in_game"), 403
+    if round_no is not None and snap.round_no is None:
+        return jsonify(error="round_not_found"), 404
+    resp = jsonify({**snap.to_payload(uid), "version": version})
+    # a completed round of a completed game never changes again (scores are final too)
+    if round_no is not None and snap.status == "completed" and snap.game_status == "completed":
+        frozen = FrozenPayload.of(resp.get_data(), snap.player_ids)
+        completed_rounds.put((game_id, round_no), frozen)
+        return _frozen_response(frozen)
+    return resp
+
 @room_bp.get("/api/room/<int:game_id>")
 def get_room(game_id: int):
-    db = _db()
-    try:
-        uid, err = _require_member(db, game_id)
-        if err:
-            return err
+    return _snapshot_response(game_id)
 
-        game = db.query(Game).get(game_id)
-        if not game:
-            return jsonify(error="game_not_found"), 404
-
-        # latest round (by RoundNumber)
-        rnd = (
-            db.query(Round)
-              .filter_by(GameID=game_id)
-              .order_by(Round.RoundNumber.desc())
-              .first()
-        )
-
-        # players with scores (PlayerFinalScore)
-        players_rows = (
-            db.query(User.Username, PlayerGame.PlayerFinalScore)
-              .join(PlayerGame, PlayerGame.UserID == User.UserID)
-              .filter(PlayerGame.GameID == game_id)
-              .all()
-        )
-        players = [row[0] for row in players_rows]
-        scores  = {row[0]: int(row[1] or 0) for row in players_rows}
-
-        # (simple) turn user: creator (you can rotate later if desired)
-        turn_user = db.query(User.Username).filter(User.UserID == game.CreatorID).scalar()
-
-        # winner username (if round completed)
-        winner_name = None
-        if rnd and rnd.RoundWinnerID:
-            winner_name = db.query(User.Username).filter(User.UserID == rnd.RoundWinnerID).scalar()
+@room_bp.get("/api/room/<int:game_id>/round/<int:round_no>")
+def get_room_round(game_id: int, round_no: int):
+    return _snapshot_response(game_id, round_no)
 
-        forbidden_words = list(rnd.ForbiddenWords or []) if rnd else []
-        expose_secret = (uid == game.CreatorID and rnd and not rnd.Description)
 
+def _ai_check_description(target: str, forbidden: list, text: str):
+    """AI verdict {ok, violated, reason}, or None when the AI service is unavailable."""
+    try:
         payload = {
-            "id": game.GameID,
-            "status": _round_status(rnd),  # waiting_description | active | completed
-            "description": (rnd.Description if rnd else None),
-            "scores": scores,
-            "players": players,
-            "turn": turn_user,
-            "startedAt": (rnd.StartTime.isoformat() + "Z") if (rnd and rnd.Description and rnd.StartTime) else None,
-            "winner": winner_name,
-            "roundNumber": (rnd.RoundNumber if rnd else 1),
-            "totalRounds": game.TotalRounds,
+            "targetWord": target,
+            "forbiddenWords": list(forbidden),
+            "description": text,
+            "lexicalChecked": True,   # skip the service's own whole-word pass
         }
-
-        if expose_secret:
-            payload["targetWord"] = rnd.TargetWord
-            payload["forbiddenWords"] = forbidden_words
-
-        return jsonify(payload)
-    finally:
-        db.close()
-
-@room_bp.get("/api/room/<int:game_id>/round/<int:round_no>")
-def get_room_round(game_id: int, round_no: int):
+        chk = requests.post(f"{AI_BASE_URL}/check_description", json=payload, timeout=20)
+        chk.raise_for_status()
+        return chk.json()
+    except Exception:
+        return None
+
+def _accept_description(game_id: int, round_id: int, text: str):
+    """
+    Store the description unless the round got one in the meantime; returns the round's
+    startedAt (ISO) or None if it was already described. Broadcasts on success.
+    """
     db = _db()
     try:
-        uid, err = _require_member(db, game_id)
-        if err:
-            return err
-
-        game = db.query(Game).get(game_id)
-        if not game:
-            return jsonify(error="game_not_found"), 404
-
-        rnd = (
+        now = dt.datetime.utcnow()
+        updated = (
             db.query(Round)
-              .filter_by(GameID=game_id, RoundNumber=round_no)
-              .first()
-        )
-        if not rnd:
-            return jsonify(error="round_not_found"), 404
-
-        players_rows = (
-            db.query(User.Username, PlayerGame.PlayerFinalScore)
-              .join(PlayerGame, PlayerGame.UserID == User.UserID)
-              .filter(PlayerGame.GameID == game_id)
-              .all()
+              .filter(Round.RoundID == round_id, Round.Description.is_(None))
+              .update({
+                  Round.Description: text,
+                  Round.StartTime: func.coalesce(Round.StartTime, now),
+                  Round.Status: "active",
+              }, synchronize_session=False)
         )
-        players = [r[0] for r in players_rows]
-        scores  = {r[0]: int(r[1] or 0) for r in players_rows}
-
-        winner_name = (
-            db.query(User.Username).filter(User.UserID == rnd.RoundWinnerID).scalar()
-            if rnd.RoundWinnerID else None
-        )
-
-        payload = {
-            "id": game.GameID,
-            "status": ("completed" if rnd.Status == "completed" else ("active" if rnd.Description else "waiting_description")),
-            "description": rnd.Description,
-            "scores": scores,
-            "players": players,
-            "turn": db.query(User.Username).filter(User.UserID == game.CreatorID).scalar(),
-            "startedAt": (rnd.StartTime.isoformat() + "Z") if rnd.StartTime else None,
-            "winner": winner_name,
-            "roundNumber": rnd.RoundNumber,
-            "totalRounds": game.TotalRounds,
-        }
+        db.commit()
+        if not updated:
+            return None
+        started_at = db.query(Round.StartTime).filter(Round.RoundID == round_id).scalar().isoformat() + "Z"
+    finally:
+        db.close()
 
-        if (uid == game.CreatorID) and (not rnd.Description):
-            payload["targetWord"] = rnd.TargetWord
-            payload["forbiddenWords"] = list(rnd.ForbiddenWords or [])
+    publish_room_state(game_id)
+    # tell clients: accepted (creator UI can close if you listen to desc_ok)
+    _emit_ai(game_id, "desc_ok")
+    # existing broadcast that drives everyone to "active" + closes waiting modal
+    _emit("round:description", {"description": text, "startedAt": started_at}, game_id)
+    return started_at
 
-        return jsonify(payload)
+def _verify_description_job(game_id: int, round_id: int, target: str, forbidden: list, text: str):
+    """Background half of put_description in async mode; the verdict goes out as round:ai_progress."""
+    try:
+        verdict = _ai_check_description(target, forbidden, text)
+        if verdict is not None and not verdict.get("ok", False):
+            _emit_ai(
+                game_id,
+                "desc_bad",
+                reason=verdict.get("reason") or "Description violates constraints.",
+                which=verdict.get("violated", []),
+            )
+            return
+        if _accept_description(game_id, round_id, text) is None:
+            _emit_ai(game_id, "desc_bad", reason="The round already has a description.")
+    except Exception:
+        _emit_ai(game_id, "desc_bad", reason="Server error while saving description.")
+        raise
     finally:
-        db.close()
+        _release_desc_check(round_id)
 
 
 @room_bp.put("/api/room/<int:game_id>/description")
@@ -198,68 +218,54 @@ def put_description(game_id: int):
         # tell clients (creator sees "Verifying…")
         _emit_ai(game_id, "validating_desc")   # <<< ADDED
 
-        # Disallow target/forbidden words from appearing as whole words
-        norm_desc = _normalize(text)
-        norm_target = _normalize(rnd.TargetWord)
-        if norm_target and re.search(rf"(?:^| ){re.escape(norm_target)}(?: |$)", norm_desc):
-            _emit_ai(game_id, "desc_bad", reason=f'Used target word "{rnd.TargetWord}"')  # <<< ADDED
-            return jsonify(error="forbidden_word_used", which=rnd.TargetWord), 400
-
-        for w in (rnd.ForbiddenWords or []):
-            nw = _normalize(w)
-            if nw and re.search(rf"(?:^| ){re.escape(nw)}(?: |$)", norm_desc):
-                _emit_ai(game_id, "desc_bad", reason=f'Used forbidden word "{w}"')  # <<< ADDED
-                return jsonify(error="forbidden_word_used", which=w), 400
-
-        # Optional AI verification
-        try:
-            payload = {
-                "targetWord": rnd.TargetWord,
-                "forbiddenWords": list(rnd.ForbiddenWords or []),
-                "description": text,
-            }
-            chk = requests.post(f"{AI_BASE_URL}/check_description", json=payload, timeout=20)
-            chk.raise_for_status()
-            verdict = chk.json()
-            if not verdict.get("ok", False):
-                _emit_ai(  # <<< ADDED
-                    game_id,
-                    "desc_bad",
-                    reason=verdict.get("reason") or "Description violates constraints.",
-                )
-                return jsonify(
-                    error="forbidden_word_used_ai",
-                    which=verdict.get("violated", []),
-                    reason=verdict.get("reason"),
-                ), 400
-        except Exception:
-            # Degraded AI => proceed (keep verifying UI until we accept)
-            pass
-
-        # Accept description
-        rnd.Description = text
-        if not rnd.StartTime:
-            rnd.StartTime = dt.datetime.utcnow()
-        rnd.Status = "active"
-        db.commit()
+        # Disallow target/forbidden words from appearing as whole words (one pass, compiled per round)
+        violations = matcher_for_round(rnd).violations(text)
+        if violations:
+            which = violations[0]
+            label = "target" if which == rnd.TargetWord else "forbidden"
+            _emit_ai(game_id, "desc_bad", reason=f'Used {label} word "{which}"')  # <<< ADDED
+            return jsonify(error="forbidden_word_used", which=which, violations=violations), 400
 
-        # tell clients: accepted (creator UI can close if you listen to desc_ok)
-        _emit_ai(game_id, "desc_ok")  # <<< ADDED
-
-        # existing broadcast that drives everyone to "active" + closes waiting modal
-        _emit("round:description", {
-            "description": rnd.Description,
-            "startedAt": rnd.StartTime.isoformat() + "Z"
-        }, game_id)
-
-        return jsonify(ok=True, message="Description accepted", startedAt=rnd.StartTime.isoformat() + "Z")
+        round_id, target, forbidden = rnd.RoundID, rnd.TargetWord, list(rnd.ForbiddenWords or [])
     except Exception as e:
-        db.rollback()
         # if something blows up after we showed "validating", let UI recover:
         _emit_ai(game_id, "desc_bad", reason="Server error while saving description.")  # <<< ADDED (best-effort)
         return jsonify(error="desc_failed", detail=str(e)), 400
     finally:
-        db.close()
+        db.close()   # nothing below needs it: never hold a session across the AI call
+
+    try:
+        if DESC_CHECK_MODE == "async":
+            if not _claim_desc_check(round_id):
+                return jsonify(error="verification_pending"), 409
+            if tasks.submit(_verify_description_job, game_id, round_id, target, forbidden, text) is None:
+                _release_desc_check(round_id)
+                _emit_ai(game_id, "desc_bad", reason="Verifier is busy, please resend.")
+                return jsonify(error="verifier_busy"), 503
+            # verdict arrives as round:ai_progress desc_ok / desc_bad
+            return jsonify(ok=True, pending=True, message="Verifying description"), 202
+
+        # Optional AI verification (degraded AI => accept)
+        verdict = _ai_check_description(target, forbidden, text)
+        if verdict is not None and not verdict.get("ok", False):
+            _emit_ai(  # <<< ADDED
+                game_id,
+                "desc_bad",
+                reason=verdict.get("reason") or "Description violates constraints.",
+            )
+            return jsonify(
+                error="forbidden_word_used_ai",
+                which=verdict.get("violated", []),
+                reason=verdict.get("reason"),
+            ), 400
+
+        started_at = _accept_description(game_id, round_id, text)
+        if started_at is None:
+            return jsonify(error="already_described"), 409
+        return jsonify(ok=True, message="Description accepted", startedAt=started_at)
+    except Exception as e:
+        _emit_ai(game_id, "desc_bad", reason="Server error while saving description.")  # <<< ADDED (best-effort)
+        return jsonify(error="desc_failed", detail=str(e)), 400
 
 
 @room_bp.put("/api/room/<int:game_id>/guess")
@@ -300,162 +306,49 @@ def put_guess(game_id: int):
         elapsed_sec = max(0.0, (now - (rnd.StartTime or now)).total_seconds())
         elapsed_ms  = int(elapsed_sec * 1000)
 
-        # persist Guess
-        g = Guess(
+        # one write per guess: the chat timeline entry (a Guess row is kept only
+        # for the winning guess, see rounds.finish_round)
+        msg = ChatMessage(
             GameID=game_id,
             RoundID=rnd.RoundID,
-            GuesserID=uid,
-            GuessText=guess_raw,
-            GuessTime=now,
-            ResponseTimeSeconds=elapsed_sec,
-            PointsAwarded=0,
-            IsCorrect=False
+            SenderID=uid,
+            MessageText=guess_raw,
+            MessageType="guess",
+            Timestamp=now,
+            IsVisible=1,
         )
-        db.add(g)
-
-        # also persist ChatMessage (best-effort)
-        try:
-            msg = ChatMessage(
-                GameID=game_id,
-                RoundID=rnd.RoundID,
-                SenderID=uid,
-                MessageText=guess_raw,
-                MessageType="guess",
-                Timestamp=now,
-                IsVisible=1,
-            )
-            db.add(msg)
-        except Exception:
-            pass  # okay if ChatMessage model differs or is absent
-
-        # emit chat to clients so UI shows it immediately
-        # emit chat to clients so UI shows it immediately (match frontend Room JS)
-        sender_name = db.query(User.Username).filter(User.UserID == uid).scalar()
-        _emit("chat:new", {
+        db.add(msg)
+        db.flush()   # assigns MessageID for the chat:new cursor
+
+        # chat line for the clients (match frontend Room JS); sent right after the commit, so
+        # no emit (network I/O, a yield under gevent) happens while we hold the write lock
+        sender_name = identity_cache.username(db, uid)
+        chat = {
+            "id": msg.MessageID,                 # resume point for ?after_id=
             "user": sender_name,                 # <-- KEY FIX
             "text": guess_raw                    # <-- frontend uses msg.text
-        }, game.GameID)
+        }
 
         # --- PlayerGame stats updates ---
         pg = db.query(PlayerGame).filter_by(GameID=game.GameID, UserID=uid).one()
         pg.TotalGuesses = int(pg.TotalGuesses or 0) + 1
 
-        if correct and rnd.Status != "completed" and rnd.RoundWinnerID is None:
-            # award points (from settings, default 100)
-            settings = db.query(GameSettings).filter(GameSettings.GameID == game.GameID).first()
-            award = int(getattr(settings, "PointsCorrectGuess", 100) or 100)
-
-            # finalize round
-            rnd.RoundWinnerID = uid
-            rnd.EndTime = now
-            rnd.Status = "completed"
-            g.PointsAwarded = award
-            g.IsCorrect = True
-
-            # correct-guess stats
-            prev_n  = int(pg.TotalCorrectGuesses or 0)
-            new_n   = prev_n + 1
-            prevavg = float(pg.AverageGuessTime or 0.0)
-            newavg  = ((prevavg * prev_n) + elapsed_sec) / new_n
-            pg.TotalCorrectGuesses = new_n
-            pg.AverageGuessTime    = newavg
-            if pg.BestGuessTime is None:
-                pg.BestGuessTime = elapsed_sec
-            else:
-                pg.BestGuessTime = min(float(pg.BestGuessTime), elapsed_sec)
-            pg.PlayerFinalScore = int(pg.PlayerFinalScore or 0) + award
-
-            # ----- CURRENT LEADER (leaderboard top), NOT turn owner -----
-            # find previous top before we recompute (to update TimesAsLeader if leadership changes)
-                        # ----- CURRENT LEADER (highest score so far), NOT turn owner -----
-            prev_top = (
-                db.query(PlayerGame.UserID, PlayerGame.PlayerFinalScore)
-                  .filter(PlayerGame.GameID == game.GameID)
-                  .order_by(PlayerGame.PlayerFinalScore.desc(), PlayerGame.UserID.asc())
-                  .first()
-            )
-            prev_top_user = prev_top[0] if prev_top else None
-
-            # recompute top after this award
-            new_top = (
-                db.query(PlayerGame.UserID, PlayerGame.PlayerFinalScore)
-                  .filter(PlayerGame.GameID == game.GameID)
-                  .order_by(PlayerGame.PlayerFinalScore.desc(), PlayerGame.UserID.asc())
-                  .first()
-            )
-            if new_top:
-                game.CurrentLeaderID = int(new_top[0])
-
-            if new_top and int(new_top[0]) == uid and prev_top_user != uid:
-                pg.TimesAsLeader = int(pg.TimesAsLeader or 0) + 1
-
-            # Advance currentRound = min(rnd.RoundNumber + 1, TotalRounds)
-            if game.TotalRounds:
-                game.CurrentRound = min((rnd.RoundNumber or 1) + 1, game.TotalRounds)
-            else:
-                game.CurrentRound = (rnd.RoundNumber or 1) + 1
-
-            # ---- Decide last round WITHOUT counting ----
-            is_last_round = bool(game.TotalRounds) and (rnd.RoundNumber >= game.TotalRounds)
-
-            if is_last_round:
-                # finalize game (pick winner by highest score)
-                final_top = (
-                    db.query(PlayerGame.UserID, PlayerGame.PlayerFinalScore)
-                      .filter(PlayerGame.GameID == game.GameID)
-                      .order_by(PlayerGame.PlayerFinalScore.desc(), PlayerGame.UserID.asc())
-                      .first()
-                )
-                if final_top:
-                    game.WinnerID = int(final_top[0])
-                    for pg_row in db.query(PlayerGame).filter(PlayerGame.GameID == game.GameID).all():
-                        pg_row.HasWon = (pg_row.UserID == game.WinnerID)
-
-                game.Status = "completed"
-                game.EndedAt = now
-                db.commit()
-            else:
-                # create next round; turn stays with creator
-                next_rn = (rnd.RoundNumber or 1) + 1
-
-                try:
-                    ai_resp = requests.post(f"{AI_BASE_URL}/gen_words", json={}, timeout=30)
-                    ai_resp.raise_for_status()
-                    ai_data = ai_resp.json()
-                    target_word = str(ai_data.get("targetWord", "")).strip().lower()
-                    forbidden_list = list(ai_data.get("forbiddenWords") or [])
-                    if not target_word or not forbidden_list:
-                        raise ValueError("AI returned incomplete words")
-                except Exception:
-                    # safe fallback
-                    target_word = "tree"
-                    forbidden_list = ["leaf", "wood", "forest"]
-
-                new_round = Round(
-                    GameID=game.GameID,
-                    RoundNumber=next_rn,
-                    RoundWinnerID=None,
-                    TargetWord=target_word,
-                    Description=None,             # player will fill in
-                    ForbiddenWords=forbidden_list,
-                    Hints=[],
-                    StartTime=None,
-                    EndTime=None,
-                    MaxRoundTime=rnd.MaxRoundTime,
-                    Status="waiting_description",
-                )
-                db.add(new_round)
-                game.Status = "active"
-                db.commit()
+        # the conditional UPDATE in finish_round decides who wins; a late correct
+        # guess (round already claimed) is just a wrong one
+        win = finish_round(db, game, rnd, uid, guess_raw, now, pg=pg) if correct else None
+        if win:
+            db.commit()
+            _emit("chat:new", chat, game.GameID)
+            publish_room_state(game.GameID)
 
             # notify clients of round win
             _emit("round:won", {
                 "winner": sender_name,
-                "word": rnd.TargetWord,
+                "word": win.word,
                 "elapsedMs": elapsed_ms,
-                "roundNumber": rnd.RoundNumber,
+                "roundNumber": win.round_no,
                 "totalRounds": game.TotalRounds,
-                "gameCompleted": (game.Status == "completed")
+                "gameCompleted": win.game_completed
             }, game.GameID)
 
             return jsonify(
@@ -463,15 +356,16 @@ def put_guess(game_id: int):
                 message="🎉 Correct! You won!",
                 winner=sender_name,
                 elapsedMs=elapsed_ms,
-                word=rnd.TargetWord,
-                roundNumber=rnd.RoundNumber,
+                word=win.word,
+                roundNumber=win.round_no,
                 totalRounds=game.TotalRounds,
-                gameCompleted=(game.Status == "completed")
+                gameCompleted=win.game_completed
             )
 
         else:
-            # wrong guess: just commit persisted Guess and stats
+            # wrong guess: just commit the chat entry and stats
             db.commit()
+            _emit("chat:new", chat, game.GameID)
             return jsonify(correct=False, message="Nope, try again")
     except Exception as e:
         db.rollback()
@@ -490,7 +384,9 @@ def get_chat_history(game_id: int):
 
         # query params
         limit = max(1, min(int(request.args.get("limit", 200) or 200), 500))
-        since_iso = request.args.get("since")
+        after_id = request.args.get("after_id", type=int)     # newer than (reconnect tail)
+        before_id = request.args.get("before_id", type=int)   # older than (scroll back)
+        since_iso = request.args.get("since")                 # legacy; prefer after_id
         only_current_round = (request.args.get("round") == "current")
 
         since_dt = None
@@ -500,66 +396,60 @@ def get_chat_history(game_id: int):
             except Exception:
                 since_dt = None
 
-        # If round=current, resolve the latest round number
+        # If round=current, resolve the latest round id
         round_filter = None
         if only_current_round:
-            latest = (
-                db.query(Round)
+            round_filter = (
+                db.query(Round.RoundID)
                   .filter(Round.GameID == game_id)
                   .order_by(Round.RoundNumber.desc())
-                  .first()
+                  .limit(1)
+                  .scalar()
             )
-            if latest:
-                round_filter = latest.RoundID
 
-        # Do we have ChatMessage rows at all for this game?
-        has_cm = (
-            db.query(ChatMessage.MessageID)
+        # ChatMessage is the single timeline (guesses included; legacy Guess-only
+        # games are backfilled by database/migrations.py). MessageID is monotonic, so
+        # pages are keyset ranges on the (GameID, MessageID) index.
+        q = db.query(ChatMessage, User.Username)\
+              .outerjoin(User, User.UserID == ChatMessage.SenderID)\
               .filter(ChatMessage.GameID == game_id)
-              .first()
-            is not None
-        )
+        if round_filter:
+            q = q.filter(ChatMessage.RoundID == round_filter)
+        if since_dt:
+            q = q.filter(ChatMessage.Timestamp > since_dt)
+        if after_id is not None:
+            q = q.filter(ChatMessage.MessageID > after_id)
+        if before_id is not None:
+            # newest `limit` older messages, returned oldest first like every page
+            q = q.filter(ChatMessage.MessageID < before_id).order_by(ChatMessage.MessageID.desc())
+        else:
+            q = q.order_by(ChatMessage.MessageID.asc())
+        rows = q.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before_id is not None:
+            rows.reverse()
 
         messages = []
-
-        if has_cm:
-            # Primary source = ChatMessage
-            q = db.query(ChatMessage, User.Username)\
-                  .join(User, User.UserID == ChatMessage.SenderID)\
-                  .filter(ChatMessage.GameID == game_id)
-            if round_filter:
-                q = q.filter(ChatMessage.RoundID == round_filter)
-            if since_dt:
-                q = q.filter(ChatMessage.Timestamp > since_dt)
-            q = q.order_by(ChatMessage.Timestamp.asc()).limit(limit)
-
-            for cm, uname in q.all():
-                messages.append({
-                    "user": uname or "Unknown",
-                    "text": cm.MessageText or "",
-                    "ts": (cm.Timestamp.isoformat() + "Z") if cm.Timestamp else None,
-                    "type": cm.MessageType or "chat"
-                })
-        else:
-            # Fallback for legacy games = use Guess table
-            q = db.query(Guess, User.Username)\
-                  .join(User, User.UserID == Guess.GuesserID)\
-                  .filter(Guess.GameID == game_id)
-            if round_filter:
-                q = q.filter(Guess.RoundID == round_filter)
-            if since_dt:
-                q = q.filter(Guess.GuessTime > since_dt)
-            q = q.order_by(Guess.GuessTime.asc()).limit(limit)
-
-            for g, uname in q.all():
-                messages.append({
-                    "user": uname or "Unknown",
-                    "text": g.GuessText or "",
-                    "ts": (g.GuessTime.isoformat() + "Z") if g.GuessTime else None,
-                    "type": "guess"
-                })
-
-        return jsonify(ok=True, messages=messages)
+        for cm, uname in rows:
+            messages.append({
+                "id": cm.MessageID,
+                "user": uname or "Unknown",
+                "text": cm.MessageText or "",
+                "ts": (cm.Timestamp.isoformat() + "Z") if cm.Timestamp else None,
+                "type": cm.MessageType or "chat"
+            })
+
+        first_id = messages[0]["id"] if messages else None
+        last_id = messages[-1]["id"] if messages else None
+        return jsonify(
+            ok=True,
+            messages=messages,
+            has_more=has_more,
+            # poll / reconnect with ?after_id=next_cursor, scroll back with ?before_id=prev_cursor
+            next_cursor=last_id if last_id is not None else (after_id if before_id is None else None),
+            prev_cursor=first_id,
+        )
     except Exception as e:
         return jsonify(ok=False, error="chat_history_failed", detail=str(e)), 400
     finally:
@@ -0,0 +1,124 @@
+# backend/app/socket_queue.py
+"""
+Socket.IO fan-out across web workers.
+
+With SOCKETIO_MESSAGE_QUEUE set, every emit (socket handlers, `_emit` in room_api,
+room:state pushes, ...) goes through a pub/sub channel so clients connected to any
+worker receive it:
+
+  SOCKETIO_MESSAGE_QUEUE=redis://redis:6379/0   Redis (production, see docker-compose.yml)
+  SOCKETIO_MESSAGE_QUEUE=local://               in-process bus (tests / benchmarks)
+
+The same channel carries room-cache invalidations: publish_room_state() tells the other
+workers to drop their cached snapshot of the game (and its cached memberships, see
+identity_cache.py), so GET /api/room and room:sync never serve a room another worker has
+changed.
+"""
+from __future__ import annotations
+import os
+import json
+import queue
+import threading
+from collections import defaultdict
+
+import socketio as python_socketio
+
+from .room_cache import room_cache
+from .identity_cache import identity_cache
+
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")
+SOCKETIO_CHANNEL = os.getenv("SOCKETIO_CHANNEL", "guesswhat")
+
+ROOM_INVALIDATE = "room:invalidate"   # worker-to-worker only, never delivered to clients
+
+
+class _RoomCacheSync:
+    """Mixin for pub/sub managers: turns ROOM_INVALIDATE emits into local cache drops."""
+
+    def _handle_emit(self, message):
+        if message.get("event") == ROOM_INVALIDATE:
+            if message.get("host_id") != self.host_id:     # the sender already invalidated
+                game_id = int(message["data"]["gameId"])
+                room_cache.invalidate(game_id)
+                identity_cache.invalidate_game(game_id)     # e.g. a player left on that worker
+            return
+        return super()._handle_emit(message)
+
+
+class RedisQueueManager(_RoomCacheSync, python_socketio.RedisManager):
+    pass
+
+
+class LocalBus:
+    """Minimal in-process pub/sub with the delivery semantics of a Redis channel."""
+
+    def __init__(self):
+        self._subs: dict[str, list[queue.Queue]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str) -> queue.Queue:
+        inbox: queue.Queue = queue.Queue()
+        with self._lock:
+            self._subs[channel].append(inbox)
+        return inbox
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            inboxes = list(self._subs[channel])
+        for inbox in inboxes:
+            inbox.put(message)
+
+
+local_bus = LocalBus()
+
+
+class LocalQueueManager(_RoomCacheSync, python_socketio.PubSubManager):
+    """Stand-in for RedisQueueManager: several servers in one process share `bus`."""
+    name = "local"
+
+    def __init__(self, channel="socketio", write_only=False, logger=None, bus: LocalBus | None = None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.bus = bus or local_bus
+        self._inbox = self.bus.subscribe(channel)
+
+    def _publish(self, data):
+        self.bus.publish(self.channel, json.dumps(data))   # serialized, like on the wire
+
+    def _listen(self):
+        while True:
+            yield self._inbox.get()
+
+
+def client_manager(url: str = SOCKETIO_MESSAGE_QUEUE, channel: str = SOCKETIO_CHANNEL):
+    """Socket.IO client manager for `url`; None means single process (default manager)."""
+    if not url:
+        return None
+    if url.startswith("local://"):
+        return LocalQueueManager(channel=channel)
+    if url.startswith(("redis://", "rediss://", "redis+sentinel://")):
+        return RedisQueueManager(url, channel=channel)
+    raise ValueError(f"unsupported SOCKETIO_MESSAGE_QUEUE: {url}")
+
+
+def socketio_options() -> dict:
+    """Extra socketio.init_app() kwargs for the configured queue."""
+    manager = client_manager()
+    return {"client_manager": manager} if manager is not None else {}
+
+
+def start_listener(sio) -> None:
+    """
+    python-socketio starts a manager's queue listener on the first client connection; start it
+    now so a worker without clients still receives cache invalidations.
+    """
+    server = getattr(sio, "server", None)
+    if server is not None and isinstance(server.manager, _RoomCacheSync) and not server.manager_initialized:
+        server.manager_initialized = True
+        server.manager.initialize()
+
+
+def broadcast_invalidation(sio, game_id: int) -> None:
+    """Tell the other workers that `game_id` changed (no-op without a queue)."""
+    manager = getattr(getattr(sio, "server", None), "manager", None)
+    if isinstance(manager, _RoomCacheSync):
+        manager.emit(ROOM_INVALIDATE, {"gameId": game_id}, namespace="/")
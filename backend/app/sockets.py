@@ -3,28 +3,73 @@ from flask import session, request
 from flask_socketio import join_room
 from ..extensions import socketio
 
-from .routes.room_api import _db, _require_member, _normalize
-from ..database.models import Game, PlayerGame, Round, Guess, User
+from .routes.room_api import _db, _normalize
+from .room_cache import room_cache
+from .identity_cache import identity_cache
+from .room_events import publish_room_state, lobby_room
+from .rounds import finish_round
+from ..database.models import Game, PlayerGame, Round, Guess, User, ChatMessage
 import datetime as dt
 
 def _room(game_id: int) -> str:
     return f"game-{game_id}"
 
+def _member_snapshot(game_id: int):
+    """Cached room snapshot if the session user is a member of the game, else None."""
+    uid = session.get("user_id")
+    snap = room_cache.snapshot(game_id) if uid else None
+    if not snap or not snap.is_member(uid):
+        return uid, None
+    return uid, snap
+
 @socketio.on("room:join")
 def on_room_join(data):
     game_id = int(data.get("game_id", 0)) if data else 0
     if not game_id:
         return
-    db = _db()
-    try:
-        uid, err = _require_member(db, game_id)
-        if err:
-            socketio.emit("room:error", {"error": "not_in_game"}, to=request.sid)
-            return
-        join_room(_room(game_id))
-        socketio.emit("room:joined", {"ok": True, "game_id": game_id}, to=request.sid)
-    finally:
-        db.close()
+    uid, snap = _member_snapshot(game_id)
+    if not snap:
+        socketio.emit("room:error", {"error": "not_in_game"}, to=request.sid)
+        return
+    join_room(_room(game_id))
+    socketio.emit("room:joined", {"ok": True, "game_id": game_id}, to=request.sid)
+
+@socketio.on("lobby:join")
+def on_lobby_join(data):
+    """
+    payload: { game_id: int }
+    Subscribe a waiting player to `lobby:update` pushes; acks with the current lobby.
+    """
+    game_id = int(data.get("game_id", 0)) if data else 0
+    if not game_id:
+        return {"error": "bad_request"}
+    uid, snap = _member_snapshot(game_id)
+    if not snap:
+        return {"error": "not_in_game"}
+    join_room(lobby_room(game_id))
+    version, snap = room_cache.versioned(game_id)
+    if snap is None:
+        return {"error": "game_not_found"}
+    return {"gameId": game_id, "version": version, **snap.lobby_state()}
+
+@socketio.on("room:sync")
+def on_room_sync(data):
+    """
+    payload: { game_id: int, version: int | null }
+    Ack with the full room snapshot, or just {upToDate: true} when the client's version is current.
+    """
+    game_id = int(data.get("game_id", 0)) if data else 0
+    if not game_id:
+        return {"error": "bad_request"}
+    uid, snap = _member_snapshot(game_id)
+    if not snap:
+        return {"error": "not_in_game"}
+    version, snap = room_cache.versioned(game_id)
+    if snap is None:
+        return {"error": "game_not_found"}
+    if data.get("version") == version:
+        return {"upToDate": True, "version": version}
+    return {**snap.to_payload(uid), "version": version}
 
 @socketio.on("chat:send")
 def on_chat_send(data):
@@ -39,65 +84,71 @@ def on_chat_send(data):
     if not txt or not game_id:
         return
 
-    db = _db()
-    try:
-        uid, err = _require_member(db, game_id)
-        if err:
-            socketio.emit("room:error", {"error": "not_in_game"}, to=request.sid)
-            return
+    uid, snap = _member_snapshot(game_id)
+    if not snap:
+        socketio.emit("room:error", {"error": "not_in_game"}, to=request.sid)
+        return
 
-        game = db.query(Game).get(game_id)
-        if not game:
-            socketio.emit("room:error", {"error": "game_not_found"}, to=request.sid)
-            return
+    chat = {"user": session.get("username", "anon"), "text": txt}
 
+    # If round not ready (or already won), it's just chat: no DB work at all
+    if snap.status != "active":
+        socketio.emit("chat:new", chat, to=_room(game_id))
+        return
+
+    db = _db()
+    try:
         rnd = (
             db.query(Round)
             .filter_by(GameID=game_id)
             .order_by(Round.RoundNumber.desc())
             .first()
         )
-
-        # Broadcast the chat message
-        socketio.emit("chat:new", {
-            "user": session.get("username", "anon"),
-            "text": txt
-        }, to=_room(game_id))
-
-        # If round not ready, it's just chat
         if not rnd or not rnd.Description:
+            socketio.emit("chat:new", chat, to=_room(game_id))
             return
 
         # Guess check
-        guess  = _normalize(txt)
-        target = _normalize(rnd.TargetWord)
-        correct = (guess == target)
+        guess_n  = _normalize(txt)
+        target_n = _normalize(rnd.TargetWord)
+        correct = (guess_n == target_n) and uid != snap.creator_id   # the describer can't win
 
         now = dt.datetime.utcnow()
-        # Persist guess (optional but you have a table)
-        g = Guess(
+        # one write per guess, same as PUT /guess: the chat timeline entry
+        msg = ChatMessage(
             GameID=game_id,
             RoundID=rnd.RoundID,
-            GuesserID=uid,
-            GuessText=txt,
-            ResponseTimeSeconds=((now - (rnd.StartTime or now)).total_seconds()),
-            IsCorrect=bool(correct)
+            SenderID=uid,
+            MessageText=txt,
+            MessageType="guess",
+            Timestamp=now,
+            IsVisible=1,
         )
-        db.add(g)
+        db.add(msg)
+
+        pg = db.query(PlayerGame).filter_by(GameID=game_id, UserID=uid).one()
+        pg.TotalGuesses = int(pg.TotalGuesses or 0) + 1
+
+        # same finalization as PUT /guess: the conditional UPDATE picks one winner
+        win = None
+        if correct:
+            game = db.get(Game, game_id)
+            win = finish_round(db, game, rnd, uid, txt, now, pg=pg)
+        db.commit()
 
-        if correct and rnd.Status != "completed" and (rnd.RoundWinnerID is None):
-            rnd.RoundWinnerID = uid
-            rnd.EndTime = now
-            rnd.Status = "completed"
-            db.commit()
+        # id lets clients resume history with ?after_id= after a reconnect
+        socketio.emit("chat:new", {**chat, "id": msg.MessageID}, to=_room(game_id))
 
-            winner_name = db.query(User.Username).filter(User.UserID == uid).scalar()
+        if win:
+            publish_room_state(game_id)
+            winner_name = identity_cache.username(db, uid)
             socketio.emit("round:won", {
                 "winner": winner_name,
-                "word": rnd.TargetWord,
-                "elapsedMs": int(((now - (rnd.StartTime or now)).total_seconds()) * 1000)
+                "word": win.word,
+                "elapsedMs": int(((now - (rnd.StartTime or now)).total_seconds()) * 1000),
+                "roundNumber": win.round_no,
+                "totalRounds": game.TotalRounds,
+                "gameCompleted": win.game_completed
             }, to=_room(game_id))
-        else:
-            db.commit()
     finally:
         db.close()
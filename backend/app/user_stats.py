@@ -0,0 +1,134 @@
+# backend/app/user_stats.py
+"""
+Materialized per-user stats behind /api/profile/summary.
+
+The totals live on User (TotalGamesPlayed, TotalScore, AvgScorePerGame), the fastest /
+hardest correct guesses in UserStats as fixed-size top-3 lists. Both are updated in the
+transaction that changes them - joining a game, winning a round - so the profile is a
+primary-key read. `rebuild_user_stats()` recomputes everything from PlayerGame / Guess:
+
+  $ python -m backend.app.user_stats [user_id ...]
+"""
+from __future__ import annotations
+import datetime as dt
+
+from sqlalchemy import case, func
+
+from ..database.models import User, UserStats, PlayerGame, Guess, Round, Game
+
+TOP_N = 3
+
+
+def _entry(word, secs, game_id, game_code, round_no, when) -> dict:
+    return {
+        "word": word,
+        "response_sec": float(secs or 0.0),
+        "game_id": game_id,
+        "game_code": game_code,
+        "round_no": round_no,
+        "when": when.isoformat() + "Z" if when else None,
+    }
+
+def _fastest_key(e):
+    return (e["response_sec"], e["when"] or "")
+
+def _hardest_key(e):   # longest time to answer correctly
+    return (-e["response_sec"], e["when"] or "")
+
+def _merge(top: list, entry: dict, key) -> list:
+    return sorted([*(top or []), entry], key=key)[:TOP_N]
+
+
+def _avg(total_score, games):
+    """AvgScorePerGame as a SQL expression over the new totals."""
+    return case((games > 0, total_score * 1.0 / games), else_=0.0)
+
+
+def record_join(db, uid: int) -> None:
+    """`uid` got a PlayerGame row (created or joined a game); caller commits."""
+    db.query(User).filter(User.UserID == uid).update({
+        User.TotalGamesPlayed: func.coalesce(User.TotalGamesPlayed, 0) + 1,
+        User.AvgScorePerGame: _avg(func.coalesce(User.TotalScore, 0),
+                                   func.coalesce(User.TotalGamesPlayed, 0) + 1),
+    }, synchronize_session=False)
+
+
+def record_win(db, uid: int, award: int, *, game: Game, rnd: Round,
+               secs: float, when: dt.datetime) -> None:
+    """`uid` won `rnd` for `award` points after `secs` seconds; caller commits."""
+    db.query(User).filter(User.UserID == uid).update({
+        User.TotalScore: func.coalesce(User.TotalScore, 0) + award,
+        User.AvgScorePerGame: _avg(func.coalesce(User.TotalScore, 0) + award,
+                                   func.coalesce(User.TotalGamesPlayed, 0)),
+    }, synchronize_session=False)
+
+    entry = _entry(rnd.TargetWord, secs, game.GameID, game.GameCode, rnd.RoundNumber, when)
+    stats = db.get(UserStats, uid)
+    if stats is None:
+        stats = UserStats(UserID=uid, Fastest=[], Hardest=[])
+        db.add(stats)
+    # new list objects, so the JSON columns are seen as changed
+    stats.Fastest = _merge(stats.Fastest, entry, _fastest_key)
+    stats.Hardest = _merge(stats.Hardest, entry, _hardest_key)
+    stats.UpdatedAt = when
+
+
+def rebuild_user_stats(db, user_ids: list[int] | None = None) -> int:
+    """Recompute totals and top lists from history (all users by default); returns users rebuilt."""
+    users = db.query(User)
+    if user_ids is not None:
+        users = users.filter(User.UserID.in_(user_ids))
+    users = users.all()
+    ids = [u.UserID for u in users]
+    if not ids:
+        return 0
+
+    totals = {
+        uid: (int(n or 0), int(score or 0))
+        for uid, n, score in (
+            db.query(PlayerGame.UserID, func.count(PlayerGame.PlayerGameID),
+                     func.coalesce(func.sum(PlayerGame.PlayerFinalScore), 0))
+              .filter(PlayerGame.UserID.in_(ids))
+              .group_by(PlayerGame.UserID)
+        )
+    }
+
+    fastest: dict[int, list] = {}
+    hardest: dict[int, list] = {}
+    for r in (
+        db.query(Guess.GuesserID, Guess.ResponseTimeSeconds, Guess.GuessTime,
+                 Round.TargetWord, Round.RoundNumber, Game.GameID, Game.GameCode)
+          .join(Round, Round.RoundID == Guess.RoundID)
+          .join(Game, Game.GameID == Guess.GameID)
+          .filter(Guess.GuesserID.in_(ids), Guess.IsCorrect == True)
+    ):
+        e = _entry(r.TargetWord, r.ResponseTimeSeconds, r.GameID, r.GameCode, r.RoundNumber, r.GuessTime)
+        fastest[r.GuesserID] = _merge(fastest.get(r.GuesserID), e, _fastest_key)
+        hardest[r.GuesserID] = _merge(hardest.get(r.GuesserID), e, _hardest_key)
+
+    existing = {s.UserID: s for s in db.query(UserStats).filter(UserStats.UserID.in_(ids))}
+    now = dt.datetime.utcnow()
+    for u in users:
+        n, score = totals.get(u.UserID, (0, 0))
+        u.TotalGamesPlayed = n
+        u.TotalScore = score
+        u.AvgScorePerGame = (score / n) if n else 0.0
+        stats = existing.get(u.UserID)
+        if stats is None:
+            stats = UserStats(UserID=u.UserID)
+            db.add(stats)
+        stats.Fastest = fastest.get(u.UserID, [])
+        stats.Hardest = hardest.get(u.UserID, [])
+        stats.UpdatedAt = now
+    return len(users)
+
+
+if __name__ == "__main__":
+    import sys
+    from ..database.db import SessionLocal
+
+    only = [int(a) for a in sys.argv[1:]] or None
+    with SessionLocal() as db:
+        n = rebuild_user_stats(db, only)
+        db.commit()
+    print(f"rebuilt stats of {n} user(s)")
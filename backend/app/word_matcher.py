@@ -0,0 +1,70 @@
+# backend/app/word_matcher.py
+"""
+Whole-word matching of a description against a round's target + forbidden words.
+
+The words of a round never change, so they are compiled once into a single regex
+alternation (cached by RoundID) and every description is checked in one pass.
+
+Descriptions are split on everything that is not a letter (digits and underscores too), like
+the AI service's own `[a-zA-Z]+` pass that callers tell it to skip: "tree2" and "tree_house"
+contain "tree".
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+
+_ws_re = re.compile(r"\s+")
+_punct_re = re.compile(r"[^\w\s]")
+_non_letter_re = re.compile(r"[\W\d_]+")
+
+def normalize(s: str) -> str:
+    s = (s or "").strip().lower()
+    s = _punct_re.sub(" ", s)
+    return _ws_re.sub(" ", s).strip()
+
+def letter_tokens(s: str) -> str:
+    """Lowercased letter runs joined by single spaces: the matcher's view of a text."""
+    return _non_letter_re.sub(" ", (s or "").lower()).strip()
+
+
+class ForbiddenMatcher:
+    """
+    Matches normalized whole words/phrases. `violations(text)` returns the original spelling of
+    every term found, target first, then forbidden words in their list order.
+    """
+
+    def __init__(self, target: str, forbidden: list[str] | tuple[str, ...]):
+        self._terms: dict[str, str] = {}      # normalized -> original, first one wins
+        self._rank: dict[str, int] = {}       # normalized -> priority (target = 0)
+        for w in [target, *forbidden]:
+            nw = letter_tokens(w)
+            if nw and nw not in self._terms:
+                self._terms[nw] = w
+                self._rank[nw] = len(self._rank)
+
+        if self._terms:
+            # longest first so "ice cream" wins over "ice"; the lookahead makes every
+            # word boundary a candidate start, so overlapping terms are all reported
+            alts = "|".join(re.escape(t) for t in sorted(self._terms, key=len, reverse=True))
+            self._re = re.compile(rf"(?<![^ ])(?=({alts})(?![^ ]))")
+        else:
+            self._re = None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def violations(self, text: str) -> list[str]:
+        if self._re is None:
+            return []
+        found = {m.group(1) for m in self._re.finditer(letter_tokens(text))}
+        return [self._terms[t] for t in sorted(found, key=self._rank.__getitem__)]
+
+
+@lru_cache(maxsize=4096)
+def _compiled(round_id: int, target: str, forbidden: tuple[str, ...]) -> ForbiddenMatcher:
+    return ForbiddenMatcher(target, forbidden)
+
+def matcher_for_round(rnd) -> ForbiddenMatcher:
+    """Matcher for a Round row, built once per RoundID (the words are part of the key, so a
+    reused id with different words never hits a stale entry)."""
+    return _compiled(rnd.RoundID, rnd.TargetWord or "", tuple(rnd.ForbiddenWords or ()))
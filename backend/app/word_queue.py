@@ -0,0 +1,181 @@
+# backend/app/word_queue.py
+"""
+Per-game queue of ready word sets (target + forbidden words).
+
+start_game asks for the sets of the coming rounds right away; they are fetched from the
+AI service on the background executor, so creating the next round after a correct guess
+is a dequeue instead of a /gen_words call inside the guess transaction. An empty queue
+never blocks: the round gets a built-in fallback set and a refill is scheduled.
+
+The sets are QueuedWordSet rows, so any web process can take what another one fetched;
+prefill / take / discard run in the caller's session (a take is undone if the guess
+transaction rolls back). Only the count of this process's fetches in flight and the
+metrics are per process; two processes topping up the same game at once can fetch a set
+too many, which is simply dropped with the rest of the queue when the game ends.
+"""
+from __future__ import annotations
+import os
+import random
+import threading
+import time
+
+import requests
+from sqlalchemy import func
+
+from ..database.db import SessionLocal
+from ..database.models import Game, QueuedWordSet
+from .background import tasks
+
+AI_BASE_URL = os.getenv("AI_BASE_URL", "http://ai:9001")
+
+# used when the AI is down or the queue ran dry
+FALLBACK_WORD_SETS = [
+    ("tree", ["leaf", "wood", "forest"]),
+    ("ocean", ["sea", "water", "wave"]),
+    ("guitar", ["music", "strings", "play"]),
+    ("bread", ["bake", "flour", "toast"]),
+    ("rain", ["cloud", "wet", "umbrella"]),
+    ("clock", ["time", "hour", "watch"]),
+]
+
+def fallback_word_set() -> tuple[str, list[str]]:
+    target, forbidden = random.choice(FALLBACK_WORD_SETS)
+    return target, list(forbidden)
+
+def request_word_set(timeout: float = 30) -> tuple[str, list[str]]:
+    """One {"targetWord", "forbiddenWords"} set from the AI service; raises on any problem."""
+    r = requests.post(f"{AI_BASE_URL}/gen_words", json={}, timeout=timeout)
+    r.raise_for_status()
+    data = r.json()
+    target = str(data.get("targetWord", "")).strip().lower()
+    forb = [str(w).strip().lower() for w in (data.get("forbiddenWords") or []) if str(w).strip()]
+    if not target or not forb:
+        raise ValueError("AI returned incomplete words")
+    return target, forb
+
+
+class WordQueue:
+    def __init__(self, depth: int = 2, session_factory=SessionLocal):
+        self.depth = depth                  # ready sets to keep per game
+        self._session = session_factory     # for the background fetches and stats()
+        self._in_flight: dict[int, int] = {}
+        self._lock = threading.Lock()
+        # metrics (this process)
+        self.takes = 0
+        self.fallbacks = 0
+        self.fetch_failures = 0
+        self.filled = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+
+    @staticmethod
+    def _ready(db, game_id: int) -> int:
+        return db.query(func.count(QueuedWordSet.QueueID)).filter(QueuedWordSet.GameID == game_id).scalar()
+
+    def _top_up(self, db, game_id: int, rounds_left: int) -> None:
+        want = min(self.depth, max(0, rounds_left))
+        ready = self._ready(db, game_id) if want else 0
+        with self._lock:
+            need = want - ready - self._in_flight.get(game_id, 0)
+            if need > 0:
+                self._in_flight[game_id] = self._in_flight.get(game_id, 0) + need
+        for _ in range(max(0, need)):
+            if tasks.submit(self._fetch, game_id, time.monotonic()) is None:
+                self._fetch_done(game_id)
+
+    def _fetch_done(self, game_id: int) -> None:
+        with self._lock:
+            left = self._in_flight.get(game_id, 0) - 1
+            if left > 0:
+                self._in_flight[game_id] = left
+            else:
+                self._in_flight.pop(game_id, None)
+
+    def _fetch(self, game_id: int, scheduled_at: float) -> None:
+        try:
+            try:
+                target, forbidden = request_word_set()
+            except Exception:
+                with self._lock:
+                    self.fetch_failures += 1
+                return
+            db = self._session()
+            try:
+                if db.query(Game.Status).filter(Game.GameID == game_id).scalar() != "active":
+                    return   # game finished (or never started) while we were fetching
+                db.add(QueuedWordSet(GameID=game_id, TargetWord=target, ForbiddenWords=forbidden))
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self.fetch_failures += 1
+                return
+            finally:
+                db.close()
+            lag = time.monotonic() - scheduled_at
+            with self._lock:
+                self.filled += 1
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+        finally:
+            self._fetch_done(game_id)
+
+    # ---------- public API ----------
+    def prefill(self, db, game_id: int, rounds_left: int) -> None:
+        """Start filling the queue of a game that still needs `rounds_left` word sets."""
+        self._top_up(db, game_id, rounds_left)
+
+    def take(self, db, game_id: int, rounds_left: int = 0) -> tuple[str, list[str]]:
+        """
+        Next word set for `game_id`, removed in the caller's transaction; never waits for the
+        AI. `rounds_left` is how many sets the game needs after this one, used to keep the
+        queue topped up.
+        """
+        words = None
+        for row in (db.query(QueuedWordSet)
+                      .filter(QueuedWordSet.GameID == game_id)
+                      .order_by(QueuedWordSet.QueueID)
+                      .limit(3)
+                      .all()):
+            # rowcount 0: another transaction took this one first
+            if db.query(QueuedWordSet).filter(QueuedWordSet.QueueID == row.QueueID)\
+                   .delete(synchronize_session=False):
+                words = (row.TargetWord, list(row.ForbiddenWords or []))
+                break
+        with self._lock:
+            self.takes += 1
+            if words is None:
+                self.fallbacks += 1
+        self._top_up(db, game_id, rounds_left)
+        return words if words is not None else fallback_word_set()
+
+    def discard(self, db, game_id: int) -> None:
+        """Drop the queue of a finished game (in the caller's transaction)."""
+        db.query(QueuedWordSet).filter(QueuedWordSet.GameID == game_id).delete(synchronize_session=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._in_flight.clear()
+
+    def stats(self) -> dict:
+        db = self._session()
+        try:
+            games, depth = db.query(func.count(func.distinct(QueuedWordSet.GameID)),
+                                    func.count(QueuedWordSet.QueueID)).one()
+        finally:
+            db.close()
+        with self._lock:
+            return {
+                "games": games,
+                "depth": depth,
+                "in_flight": sum(self._in_flight.values()),
+                "takes": self.takes,
+                "fallbacks": self.fallbacks,
+                "fallback_rate": (self.fallbacks / self.takes) if self.takes else None,
+                "fetch_failures": self.fetch_failures,
+                "refill_lag_avg_sec": (self._lag_total / self.filled) if self.filled else None,
+                "refill_lag_max_sec": self._lag_max if self.filled else None,
+            }
+
+
+word_queue = WordQueue(depth=int(os.getenv("WORD_QUEUE_DEPTH", "2")))
@@ -0,0 +1,52 @@
+# backend/concurrency.py
+"""
+Which concurrency model the web process runs under, and how to keep blocking work off it.
+
+The production server (backend/gunicorn_conf.py) uses gevent workers: the worker
+monkey-patches the standard library before loading the app, so sockets (requests.post to
+the AI service, Redis, the DB drivers' network I/O) and threads become cooperative. The dev
+server (`python -m backend.main`) and the tests run unpatched with real threads.
+
+Socket.IO must use the matching async mode. It is derived from the patching, never from what
+happens to be installed (python-engineio would otherwise pick gevent as soon as it can be
+imported, even in an unpatched process); SOCKETIO_ASYNC_MODE overrides it.
+
+CPU-bound calls (password hashing) don't yield to a cooperative loop: `run_blocking()`
+runs them on a real OS thread so the other clients of the worker keep being served.
+
+SQLite calls don't yield either. Request handlers therefore release their session before
+slow waits (AI calls, hashing) and emit only after committing, so a greenlet never sits on a
+connection or the write lock while others queue behind it.
+"""
+from __future__ import annotations
+import os
+import sys
+
+
+def cooperative_mode() -> str | None:
+    """'gevent' or 'eventlet' if this process is monkey-patched by it, else None."""
+    if "gevent" in sys.modules:
+        from gevent import monkey
+        if monkey.is_module_patched("socket"):
+            return "gevent"
+    if "eventlet" in sys.modules:
+        from eventlet import patcher
+        if patcher.is_monkey_patched("socket"):
+            return "eventlet"
+    return None
+
+
+def socketio_async_mode() -> str:
+    return os.getenv("SOCKETIO_ASYNC_MODE") or cooperative_mode() or "threading"
+
+
+def run_blocking(fn, *args, **kwargs):
+    """Call `fn` on a native thread when running cooperatively (waiting yields), else inline."""
+    mode = cooperative_mode()
+    if mode == "gevent":
+        from gevent import get_hub
+        return get_hub().threadpool.apply(fn, args, kwargs)
+    if mode == "eventlet":
+        from eventlet import tpool
+        return tpool.execute(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
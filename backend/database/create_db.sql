@@ -99,3 +99,22 @@ CREATE TABLE ChatMessage (
   Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   IsVisible INTEGER DEFAULT 1
 );
+
+CREATE INDEX ix_ChatMessage_GameID_MessageID ON ChatMessage(GameID, MessageID);
+CREATE INDEX ix_ChatMessage_GameID_Timestamp ON ChatMessage(GameID, Timestamp);
+CREATE INDEX ix_Game_Lobby_FreeSlots ON Game(Status, IsPrivate, (MaxPlayers - CurrentPlayersCount), GameID);
+CREATE INDEX ix_PlayerGame_GameID ON PlayerGame(GameID);
+CREATE INDEX ix_Guess_GuesserID_IsCorrect_ResponseTime ON Guess(GuesserID, IsCorrect, ResponseTimeSeconds);
+
+CREATE TABLE UserStats (
+  UserID INTEGER PRIMARY KEY,
+  Fastest JSON NOT NULL DEFAULT '[]',
+  Hardest JSON NOT NULL DEFAULT '[]',
+  UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (UserID) REFERENCES "User"(UserID)
+);
+
+CREATE TABLE SchemaMigration (
+  Name VARCHAR(100) PRIMARY KEY,
+  AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
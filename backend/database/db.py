@@ -64,7 +64,9 @@ from __future__ import annotations
 import os
 from pathlib import Path
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 # Project root: backend/database -> go up two levels
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -75,25 +77,77 @@ default_sqlite = PROJECT_ROOT / "data" / "app.db"
 # Use env if set; otherwise default
 sqlite_path = Path(os.getenv("SQLITE_PATH", str(default_sqlite)))
 
-# Ensure directory exists
-sqlite_path.parent.mkdir(parents=True, exist_ok=True)
-
-# Build a proper sqlite URL (Path takes care of Windows backslashes)
-DB_URL = f"sqlite:///{sqlite_path.as_posix()}"
-
-engine = create_engine(
-    DB_URL,
-    connect_args={"check_same_thread": False},  # needed for SQLite + threads
-    echo=False,
-    future=True,
-)
-
-# Enforce foreign keys in SQLite
-@event.listens_for(engine, "connect")
-def _set_sqlite_pragma(dbapi_conn, connection_record):
-    cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+# DB_URL wins (tests use sqlite :memory:, Postgres via postgresql+psycopg://...);
+# otherwise a proper sqlite URL (Path takes care of Windows backslashes)
+DB_URL = os.getenv("DB_URL") or f"sqlite:///{sqlite_path.as_posix()}"
+SQL_ECHO = os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes")
+
+# ----- SQLite tuning -----
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))   # wait for the write lock
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")               # readers never block the writer
+
+# ----- server database pool -----
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))      # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))    # drop connections older than this
+
+
+def _sqlite_pragmas(in_memory: bool, journal_mode: str):
+    def on_connect(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        if not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            # WAL is crash-safe with NORMAL; only the last commits can be lost on power failure
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.close()
+    return on_connect
+
+
+def make_engine(url: str | None = None, *, echo: bool | None = None,
+                sqlite_journal_mode: str | None = None, **kwargs) -> Engine:
+    """
+    Engine for `url` (default DB_URL), tuned for the backend:
+      - SQLite file: WAL, busy_timeout, synchronous=NORMAL, mmap; usable from any thread
+      - SQLite :memory:: one shared connection (StaticPool) so every session sees the same db
+      - anything else (Postgres, ...): bounded QueuePool with pre-ping and recycling
+    Extra kwargs go to create_engine() and override the defaults.
+    """
+    url = make_url(url or DB_URL)
+    echo = SQL_ECHO if echo is None else echo
+
+    if url.get_backend_name() == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        opts = {
+            "connect_args": {"check_same_thread": False,              # needed for SQLite + threads
+                             "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        }
+        if in_memory:
+            opts["poolclass"] = StaticPool
+        else:
+            # Ensure directory exists
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+        opts.update(kwargs)
+        eng = create_engine(url, echo=echo, future=True, **opts)
+        event.listen(eng, "connect", _sqlite_pragmas(in_memory, sqlite_journal_mode or SQLITE_JOURNAL_MODE))
+        return eng
+
+    opts = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    opts.update(kwargs)
+    return create_engine(url, echo=echo, future=True, **opts)
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
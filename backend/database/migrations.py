@@ -0,0 +1,123 @@
+# backend/database/migrations.py
+"""
+One-time data migrations, applied in order and recorded in SchemaMigration.
+
+create_all() only creates missing tables; anything that has to rewrite existing
+rows lives here. `run_migrations()` is called from create_app and is a no-op once
+every migration is recorded. It can also be run by hand:
+
+  $ python -m backend.database.migrations
+"""
+from __future__ import annotations
+import datetime as dt
+
+from sqlalchemy import insert, select, exists, literal, and_, inspect, Index
+from sqlalchemy.exc import IntegrityError
+
+from .db import engine, SessionLocal, Base
+from .models import Game, Guess, ChatMessage, SchemaMigration
+
+
+def _backfill_guess_chat(db) -> int:
+    """
+    Guesses are written once, as a ChatMessage of type 'guess'. Games played before
+    that only have Guess rows, so copy them into ChatMessage for games without any
+    guess messages yet.
+    """
+    has_guess_msgs = exists().where(and_(
+        ChatMessage.GameID == Guess.GameID,
+        ChatMessage.MessageType == "guess",
+    ))
+    rows = (
+        select(
+            Guess.GameID, Guess.RoundID, Guess.GuesserID, Guess.GuessText,
+            literal("guess"), Guess.GuessTime, literal(True),
+        )
+        .where(~has_guess_msgs)
+        .order_by(Guess.GuessTime, Guess.GuessID)
+    )
+    res = db.execute(
+        insert(ChatMessage).from_select(
+            ["GameID", "RoundID", "SenderID", "MessageText", "MessageType", "Timestamp", "IsVisible"],
+            rows,
+        )
+    )
+    return res.rowcount or 0
+
+
+def _index_names(conn, table: str) -> set[str]:
+    # SQLite reflection skips expression indexes, so ask sqlite_master by name there
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))
+        return {name for (name,) in rows}
+    return {ix["name"] for ix in inspect(conn).get_indexes(table)}
+
+
+def _create_missing_indexes(db) -> int:
+    """create_all() skips indexes of tables that already exist; add the ones declared since."""
+    conn = db.connection()
+    created = 0
+    for table in Base.metadata.sorted_tables:
+        existing = _index_names(conn, table.name)
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=conn)
+                created += 1
+    return created
+
+
+def _lobby_slots_index(db) -> int:
+    """ix_Game_Lobby_FreeSlots replaces ix_Game_Status_IsPrivate (its prefix)."""
+    conn = db.connection()
+    if "ix_Game_Status_IsPrivate" in _index_names(conn, "Game"):
+        Index("ix_Game_Status_IsPrivate", Game.Status, Game.IsPrivate).drop(bind=conn)
+    return _create_missing_indexes(db)
+
+
+def _rebuild_user_stats(db) -> int:
+    """Profile totals / top lists are maintained incrementally from now on; seed them."""
+    from ..app.user_stats import rebuild_user_stats
+    return rebuild_user_stats(db)
+
+
+# (name, fn) in the order they must run; never rename or reorder applied entries
+MIGRATIONS = [
+    ("0001_backfill_guess_chat", _backfill_guess_chat),
+    ("0002_chat_keyset_index", _create_missing_indexes),
+    ("0003_hot_path_indexes", _create_missing_indexes),
+    ("0004_user_stats", _rebuild_user_stats),
+    ("0005_lobby_slots_index", _lobby_slots_index),
+]
+
+
+def run_migrations(bind=None) -> list[str]:
+    """Apply pending migrations; returns the names applied by this call."""
+    Base.metadata.create_all(bind=bind or engine, tables=[SchemaMigration.__table__])
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    applied = []
+    try:
+        done = {name for (name,) in db.query(SchemaMigration.Name).all()}
+        for name, fn in MIGRATIONS:
+            if name in done:
+                continue
+            fn(db)
+            db.add(SchemaMigration(Name=name, AppliedAt=dt.datetime.utcnow()))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()   # another worker applied it first; its data wins
+                continue
+            applied.append(name)
+        return applied
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)   # start.sh runs this once, before the web processes
+    names = run_migrations()
+    print("applied: " + (", ".join(names) if names else "nothing (up to date)"))
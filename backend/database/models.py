@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Integer, String, Text, ForeignKey, DateTime, Boolean, CheckConstraint,
-    UniqueConstraint, Column
+    UniqueConstraint, Column, Index
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
@@ -56,6 +56,10 @@ class Game(Base):
     settings = relationship("GameSettings", back_populates="game", uselist=False, cascade="all, delete-orphan")
     chat_messages = relationship("ChatMessage", cascade="all, delete-orphan", backref="game")
 
+# join_random: open public lobbies, fewest free slots first (see app/matchmaking.py)
+Index("ix_Game_Lobby_FreeSlots", Game.Status, Game.IsPrivate,
+      Game.MaxPlayers - Game.CurrentPlayersCount, Game.GameID)
+
 # ---------- GameSettings (1:1 with Game) ----------
 class GameSettings(Base):
     __tablename__ = "GameSettings"
@@ -87,7 +91,10 @@ class PlayerGame(Base):
     HasWon: Mapped[bool] = mapped_column(Boolean, default=False)
     TimesAsLeader: Mapped[int] = mapped_column(Integer, default=0)
 
-    __table_args__ = (UniqueConstraint("UserID", "GameID"),)
+    __table_args__ = (
+        UniqueConstraint("UserID", "GameID"),          # also serves per-user lookups
+        Index("ix_PlayerGame_GameID", "GameID"),       # players of a game (room snapshot, lobby)
+    )
 
     user = relationship("User")
     game = relationship("Game", back_populates="players")
@@ -135,6 +142,11 @@ class Guess(Base):
     # In your DDL: IsCorrect BOOLEAN DEFAULT 0 (moved below to keep standards)
     IsCorrect: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    __table_args__ = (
+        # profile: a user's correct guesses ordered by response time
+        Index("ix_Guess_GuesserID_IsCorrect_ResponseTime", "GuesserID", "IsCorrect", "ResponseTimeSeconds"),
+    )
+
 # ---------- ChatMessage ----------
 class ChatMessage(Base):
     __tablename__ = "ChatMessage"
@@ -149,4 +161,52 @@ class ChatMessage(Base):
 
     __table_args__ = (
         CheckConstraint("MessageType IN ('guess','hint','system','general')"),
+        # chat history pages by (GameID, MessageID) keyset cursors
+        Index("ix_ChatMessage_GameID_MessageID", "GameID", "MessageID"),
+        Index("ix_ChatMessage_GameID_Timestamp", "GameID", "Timestamp"),   # legacy ?since=
     )
+
+# ---------- QueuedWordSet ----------
+class QueuedWordSet(Base):
+    """
+    Word sets fetched ahead for the coming rounds of a game (app/word_queue.py). In the
+    database so that whichever web process starts the next round can take them.
+    """
+    __tablename__ = "QueuedWordSet"
+    QueueID: Mapped[int] = mapped_column(Integer, primary_key=True)
+    GameID: Mapped[int] = mapped_column(ForeignKey("Game.GameID"), nullable=False)
+    TargetWord: Mapped[str] = mapped_column(String(100), nullable=False)
+    ForbiddenWords: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    CreatedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # take(): oldest set of a game
+        Index("ix_QueuedWordSet_GameID_QueueID", "GameID", "QueueID"),
+    )
+
+# ---------- PendingDescriptionCheck ----------
+class PendingDescriptionCheck(Base):
+    """A round whose description is being verified by the AI (DESC_CHECK_MODE=async)."""
+    __tablename__ = "PendingDescriptionCheck"
+    RoundID: Mapped[int] = mapped_column(ForeignKey("Round.RoundID"), primary_key=True)
+    StartedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# ---------- UserStats ----------
+class UserStats(Base):
+    """
+    Per-user top-3 correct guesses, maintained by app/user_stats.py next to the
+    User.TotalGamesPlayed / TotalScore / AvgScorePerGame totals.
+    """
+    __tablename__ = "UserStats"
+    UserID: Mapped[int] = mapped_column(ForeignKey("User.UserID"), primary_key=True)
+    # [{word, response_sec, game_id, game_code, round_no, when}, ...]
+    Fastest: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    Hardest: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    UpdatedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# ---------- SchemaMigration ----------
+class SchemaMigration(Base):
+    """One row per data migration already applied (see database/migrations.py)."""
+    __tablename__ = "SchemaMigration"
+    Name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    AppliedAt: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
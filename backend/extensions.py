@@ -1,5 +1,7 @@
 # backend/extensions.py
 from flask_socketio import SocketIO
+from .concurrency import socketio_async_mode
 
 # CORS "*" is OK for local dev. Tighten later.
-socketio = SocketIO(cors_allowed_origins="*")
+# threading under the dev server / tests, gevent under gunicorn (see concurrency.py)
+socketio = SocketIO(cors_allowed_origins="*", async_mode=socketio_async_mode())
@@ -0,0 +1,38 @@
+# backend/gunicorn_conf.py
+"""
+Production server settings, used by services/web/start.sh:
+
+  $ gunicorn -c backend/gunicorn_conf.py "backend.main:create_app()"
+
+Workers are gevent by default: one process holds thousands of idle Socket.IO connections and
+lobby polls, and a request waiting on the AI service or on Redis yields instead of blocking
+everybody else (see backend/concurrency.py). WEB_WORKER_CLASS=gthread is the thread-per-
+request fallback (WEB_THREADS threads per worker).
+
+Socket.IO keeps a session in the process that opened it, so a gunicorn serves it with one
+worker; start.sh scales with WEB_PROCESSES single-worker gunicorns behind nginx sticky
+sessions rather than with WEB_WORKERS.
+
+Graceful reload: `kill -HUP <master>` starts fresh workers on new code and lets the old ones
+finish their requests (up to WEB_GRACEFUL_TIMEOUT seconds); start.sh forwards HUP/TERM to
+every gunicorn it started.
+"""
+import os
+
+bind = os.getenv("WEB_BIND", f"0.0.0.0:{os.getenv('WEB_PORT', '8000')}")
+worker_class = os.getenv("WEB_WORKER_CLASS", "gevent")
+workers = int(os.getenv("WEB_WORKERS", "1"))
+worker_connections = int(os.getenv("WEB_WORKER_CONNECTIONS", "2000"))   # gevent: concurrent clients per worker
+threads = int(os.getenv("WEB_THREADS", "100"))                          # gthread only
+
+# nginx keeps idle upstream connections open (services/nginx/nginx.conf, 60s); stay open a
+# little longer so it is always nginx that closes them, never a request racing our close
+keepalive = int(os.getenv("WEB_KEEPALIVE", "75"))
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+backlog = int(os.getenv("WEB_BACKLOG", "2048"))
+
+accesslog = os.getenv("WEB_ACCESS_LOG") or None    # "-" = stdout
+errorlog = "-"
+loglevel = os.getenv("WEB_LOG_LEVEL", "info")
+forwarded_allow_ips = "*"                           # behind nginx
@@ -1,13 +1,26 @@
 # backend/llm_core/api.py
-import os, json, re
-import requests
-from fastapi import FastAPI, HTTPException
+import os, json, re, time, asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 
-app = FastAPI(title="AI Service (Words + Description Check)")
+from .ollama_client import ollama
+from .verdict_cache import verdicts, verdict_key
+from .word_reservoir import WordReservoir
 
-OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
 MODEL = os.getenv("LLM_MODEL", "phi3:mini")  # use mini by default
+GEN_WORDS_TIMEOUT = float(os.getenv("GEN_WORDS_TIMEOUT", "45"))      # seconds per LLM call
+CHECK_TIMEOUT = float(os.getenv("CHECK_DESCRIPTION_TIMEOUT", "45"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reservoir.start()       # loads the persisted word sets, starts the refill workers
+    yield
+    await reservoir.stop()
+    await ollama.aclose()   # pooled keep-alive connections to Ollama
+
+app = FastAPI(title="AI Service (Words + Description Check)", lifespan=lifespan)
 
 # ---------- Schemas ----------
 class WordsOut(BaseModel):
@@ -18,6 +31,7 @@ class CheckIn(BaseModel):
     targetWord: str
     forbiddenWords: list[str]
     description: str
+    lexicalChecked: bool = False  # caller already ran the whole-word check (web app does)
 
 class CheckOut(BaseModel):
     ok: bool
@@ -26,108 +40,293 @@ class CheckOut(BaseModel):
 
 # ---------- Health ----------
 @app.get("/healthz")
-def healthz():
+async def healthz():
     try:
-        r = requests.get(f"{OLLAMA_URL}/api/tags", timeout=2)
-        ok = r.status_code == 200
+        await ollama.tags(timeout=2)
+        ok = True
     except Exception:
         ok = False
     return {"status": "ok" if ok else "degraded", "model": MODEL}
 
 # ---------- Generate only words ----------
-@app.post("/gen_words", response_model=WordsOut)
-def gen_words():
+WORDS_PROMPT = (
+    "Generate JSON for a guessing game with keys exactly: "
+    '{"targetWord","forbiddenWords"}.\n'
+    "- targetWord: ONE common English noun, one word, lowercase.\n"
+    "- forbiddenWords: 3-5 lowercase words strongly related to the target.\n"
+    "- Do NOT include the target in forbiddenWords.\n"
+    "Return ONLY the compact JSON, no extra text.\n"
+)
+
+
+def validate_word_set(data: dict) -> dict:
+    """Normalized {"targetWord", "forbiddenWords"}; raises ValueError when unusable."""
+    target = str(data.get("targetWord", "")).strip().lower()
+    fwords = [str(w).strip().lower() for w in (data.get("forbiddenWords") or []) if str(w).strip()]
+    if not target or not fwords:
+        raise ValueError("missing fields")
+    if any(target == w for w in fwords):
+        raise ValueError("target present in forbiddenWords")
+    return {"targetWord": target, "forbiddenWords": fwords}
+
+
+async def generate_word_set() -> dict:
     """
     Ask the model to output strict JSON:
     {"targetWord":"...", "forbiddenWords":["...","...","..."]}
     """
-    prompt = (
-        "Generate JSON for a guessing game with keys exactly: "
-        '{"targetWord","forbiddenWords"}.\n'
-        "- targetWord: ONE common English noun, one word, lowercase.\n"
-        "- forbiddenWords: 3-5 lowercase words strongly related to the target.\n"
-        "- Do NOT include the target in forbiddenWords.\n"
-        "Return ONLY the compact JSON, no extra text.\n"
-    )
+    text = await ollama.generate(MODEL, WORDS_PROMPT, timeout=GEN_WORDS_TIMEOUT)
+    # Extract first {...}
+    m = re.search(r"\{.*\}", text, flags=re.S)
+    if m:
+        text = m.group(0)
+    return validate_word_set(json.loads(text))
+
+
+reservoir = WordReservoir(generate_word_set, validate_word_set)   # refilled in the background
+
+
+@app.post("/gen_words", response_model=WordsOut)
+async def gen_words():
+    """A validated word set from the reservoir; waits for the model only when it is empty."""
     try:
-        r = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={"model": MODEL, "prompt": prompt, "stream": False},
-            timeout=45,
-        )
-        r.raise_for_status()
-        text = r.json().get("response", "").strip()
-        # Extract first {...}
-        m = re.search(r"\{.*\}", text, flags=re.S)
-        if m:
-            text = m.group(0)
-        data = json.loads(text)
-        target = str(data.get("targetWord", "")).strip().lower()
-        fwords = [str(w).strip().lower() for w in (data.get("forbiddenWords") or []) if str(w).strip()]
-        if not target or not fwords:
-            raise ValueError("missing fields")
-        if any(target == w for w in fwords):
-            raise ValueError("target present in forbiddenWords")
-        return WordsOut(targetWord=target, forbiddenWords=fwords)
+        return WordsOut(**await reservoir.take())
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"AI gen_words failed: {e}")
 
 # ---------- Check description (no target/forbidden words) ----------
-@app.post("/check_description", response_model=CheckOut)
-def check_description(body: CheckIn):
-    """
-    Ask the model to return strict JSON {ok:bool, violated:[...], reason:"..."}.
-    The model must mark 'ok=false' if the description includes the target or any forbidden words
-    as WHOLE WORDS (case-insensitive).
-    """
+VALIDATOR_PROMPT = (
+    "You are a strict validator. Given a target word, a list of forbidden words, "
+    "and a description, determine if the description contains any of the words as "
+    "WHOLE WORDS (case-insensitive). Do not consider synonyms or related words—"
+    "only EXACT token matches after basic punctuation removal. Return ONLY JSON:\n"
+    '{"ok": true/false, "violated": ["w1","w2"], "reason": "short"}'
+)
+
+
+def _normalize_check(body: CheckIn) -> tuple[str, list[str], str]:
     target = (body.targetWord or "").strip().lower()
     forb = [w.strip().lower() for w in (body.forbiddenWords or []) if w.strip()]
     desc  = (body.description or "").strip()
+    return target, forb, desc
+
 
-    # Local lexical pre-check (fast, deterministic)
-    violated = []
-    tokens = re.findall(r"[a-zA-Z]+", desc.lower())
-    vocab = set(tokens)
-    if target in vocab:
-        violated.append(target)
+def _lexical_violations(target: str, forb: list[str], desc: str) -> list[str]:
+    vocab = set(re.findall(r"[a-zA-Z]+", desc.lower()))
+    violated = [target] if target in vocab else []
     violated.extend([w for w in forb if w in vocab])
-    if violated:
-        return CheckOut(ok=False, violated=sorted(set(violated)), reason="lexical match")
-
-    # LLM confirmation (in case of punctuation tricks / minor variants)
-    sys_prompt = (
-        "You are a strict validator. Given a target word, a list of forbidden words, "
-        "and a description, determine if the description contains any of the words as "
-        "WHOLE WORDS (case-insensitive). Do not consider synonyms or related words—"
-        "only EXACT token matches after basic punctuation removal. Return ONLY JSON:\n"
-        '{"ok": true/false, "violated": ["w1","w2"], "reason": "short"}'
-    )
+    return sorted(set(violated))
+
+
+def _parse_verdict(data: dict) -> dict:
+    ok = bool(data.get("ok", False))
+    vio = [str(w).strip().lower() for w in (data.get("violated") or []) if str(w).strip()]
+    reason = str(data.get("reason") or "").strip() or None
+    return {"ok": ok, "violated": vio, "reason": reason}
+
+
+async def _llm_verdict(target: str, forb: list[str], desc: str) -> CheckOut:
+    """LLM confirmation (in case of punctuation tricks / minor variants)."""
     user_prompt = json.dumps({
         "targetWord": target,
         "forbiddenWords": forb,
         "description": desc
     }, ensure_ascii=False)
 
-    try:
-        r = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": MODEL,
-                "prompt": f"{sys_prompt}\nInput: {user_prompt}\nOutput JSON:",
-                "stream": False,
-            },
-            timeout=45,
-        )
-        r.raise_for_status()
-        resp = r.json().get("response", "").strip()
+    async def ask_model() -> dict:
+        resp = await ollama.generate(MODEL, f"{VALIDATOR_PROMPT}\nInput: {user_prompt}\nOutput JSON:",
+                                     timeout=CHECK_TIMEOUT)
         m = re.search(r"\{.*\}", resp, flags=re.S)
         if m:
             resp = m.group(0)
-        data = json.loads(resp)
-        ok = bool(data.get("ok", False))
-        vio = [str(w).strip().lower() for w in (data.get("violated") or []) if str(w).strip()]
-        reason = str(data.get("reason") or "").strip() or None
-        return CheckOut(ok=ok, violated=vio, reason=reason)
+        return _parse_verdict(json.loads(resp))
+
+    try:
+        # resubmitted (or concurrent identical) checks reuse one model answer
+        verdict = await verdicts.get_or_compute(verdict_key(MODEL, target, forb, desc), ask_model)
+        return CheckOut(**verdict)
     except Exception as e:
         # If the model fails, fall back to lexical result
         return CheckOut(ok=True, violated=[], reason=f"llm degraded: {e}")
+
+
+@app.post("/check_description", response_model=CheckOut)
+async def check_description(body: CheckIn):
+    """
+    Ask the model to return strict JSON {ok:bool, violated:[...], reason:"..."}.
+    The model must mark 'ok=false' if the description includes the target or any forbidden words
+    as WHOLE WORDS (case-insensitive).
+    """
+    target, forb, desc = _normalize_check(body)
+
+    # Local lexical pre-check (fast, deterministic); skipped when the caller already did it
+    if not body.lexicalChecked:
+        violated = _lexical_violations(target, forb, desc)
+        if violated:
+            return CheckOut(ok=False, violated=violated, reason="lexical match")
+    return await _llm_verdict(target, forb, desc)
+
+
+# ---------- Batches ----------
+# Many items per HTTP call (prefetchers, offline jobs), packed into few model calls: one prompt
+# yields up to WORDS_PER_PROMPT word sets or CHECKS_PER_PROMPT verdicts, and one batch runs
+# at most AI_BATCH_CONCURRENCY prompts at a time. Items a packed answer misses are retried
+# (word sets) or checked one by one (verdicts).
+WORDS_PER_PROMPT = int(os.getenv("WORDS_PER_PROMPT", "8"))
+CHECKS_PER_PROMPT = int(os.getenv("CHECKS_PER_PROMPT", "8"))
+BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "256"))
+BATCH_WORD_ROUNDS = 3          # packed rounds before /gen_words:batch settles for fewer sets
+
+BATCH_VALIDATOR_PROMPT = (
+    "You are a strict validator. For EACH input item (id, target word, forbidden words, "
+    "description), determine if the description contains the target or any forbidden word as "
+    "WHOLE WORDS (case-insensitive). Do not consider synonyms or related words—only EXACT token "
+    "matches after basic punctuation removal. Return ONLY a JSON array with one object per "
+    "input item, same ids:\n"
+    '[{"id": 0, "ok": true/false, "violated": ["w1","w2"], "reason": "short"}]'
+)
+
+
+class WordsBatchOut(BaseModel):
+    requested: int
+    items: list[WordsOut]
+
+class CheckBatchIn(BaseModel):
+    items: list[CheckIn]
+
+class CheckBatchOut(BaseModel):
+    items: list[CheckOut]
+
+
+def _words_batch_prompt(n: int, avoid: list[str]) -> str:
+    return (
+        f"Generate JSON for a guessing game: an array of {n} objects, each with keys exactly "
+        '{"targetWord","forbiddenWords"}.\n'
+        "- targetWord: ONE common English noun, one word, lowercase, different in every object.\n"
+        "- forbiddenWords: 3-5 lowercase words strongly related to the target.\n"
+        "- Do NOT include the target in forbiddenWords.\n"
+        + (f"- Do NOT use these targets: {', '.join(avoid)}.\n" if avoid else "")
+        + "Return ONLY the compact JSON array, no extra text.\n"
+    )
+
+
+async def generate_word_sets(n: int, avoid: list[str] = ()) -> list[dict]:
+    """Up to `n` validated word sets from one model call (invalid entries are dropped)."""
+    text = await ollama.generate(MODEL, _words_batch_prompt(n, list(avoid)[-100:]), timeout=GEN_WORDS_TIMEOUT)
+    m = re.search(r"\[.*\]", text, flags=re.S)
+    data = json.loads(m.group(0) if m else text)
+    out = []
+    for raw in data if isinstance(data, list) else [data]:
+        try:
+            out.append(validate_word_set(raw))
+        except (ValueError, TypeError, AttributeError):
+            continue
+    return out[:n]
+
+
+@app.post("/gen_words:batch", response_model=WordsBatchOut)
+async def gen_words_batch(n: int = Query(..., ge=1, le=BATCH_MAX_ITEMS)):
+    """`n` word sets with distinct targets: reservoir first, the rest in packed model calls.
+    Returns fewer when the model keeps failing; 502 only when there is none at all."""
+    items = reservoir.take_many(n)
+    seen = {w["targetWord"] for w in items}
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def packed(k: int, avoid: list[str]) -> list[dict]:
+        async with limit:
+            return await generate_word_sets(k, avoid)
+
+    errors = []
+    for _ in range(BATCH_WORD_ROUNDS):
+        missing = n - len(items)
+        if missing <= 0:
+            break
+        sizes = [min(WORDS_PER_PROMPT, missing - j) for j in range(0, missing, WORDS_PER_PROMPT)]
+        avoid = sorted(seen)        # later rounds only top up: steer the model off the repeats
+        for result in await asyncio.gather(*(packed(k, avoid) for k in sizes), return_exceptions=True):
+            if isinstance(result, BaseException):
+                errors.append(result)
+                continue
+            for words in result:
+                if len(items) < n and words["targetWord"] not in seen:
+                    seen.add(words["targetWord"])
+                    items.append(words)
+    if not items:
+        raise HTTPException(status_code=502, detail=f"AI gen_words failed: {errors[-1] if errors else 'no sets'}")
+    return WordsBatchOut(requested=n, items=[WordsOut(**w) for w in items])
+
+
+async def _packed_verdicts(chunk: list[tuple[str, str, list[str], str]]) -> dict[str, dict]:
+    """Verdicts for (key, target, forbidden, description) items from one model call, by key;
+    each is stored in the verdict cache. Items the answer leaves out are simply absent."""
+    payload = [{"id": i, "targetWord": t, "forbiddenWords": f, "description": d}
+               for i, (_, t, f, d) in enumerate(chunk)]
+    t0 = time.perf_counter()
+    resp = await ollama.generate(
+        MODEL, f"{BATCH_VALIDATOR_PROMPT}\nInput: {json.dumps(payload, ensure_ascii=False)}\nOutput JSON:",
+        timeout=CHECK_TIMEOUT)
+    m = re.search(r"\[.*\]", resp, flags=re.S)
+    data = json.loads(m.group(0) if m else resp)
+    cost = (time.perf_counter() - t0) / len(chunk)
+    out = {}
+    for row in data if isinstance(data, list) else []:
+        try:
+            key = chunk[int(row.get("id"))][0]
+        except (AttributeError, TypeError, ValueError, IndexError):
+            continue
+        if key not in out:
+            out[key] = _parse_verdict(row)
+            verdicts.put(key, out[key], cost)
+    return out
+
+
+@app.post("/check_description:batch", response_model=CheckBatchOut)
+async def check_description_batch(body: CheckBatchIn):
+    """/check_description for many items; results come back in input order."""
+    if len(body.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"at most {BATCH_MAX_ITEMS} items per batch")
+    results: list[CheckOut | None] = [None] * len(body.items)
+    todo: dict[str, tuple[str, list[str], str]] = {}        # key -> inputs, identical items once
+    keys: list[str | None] = [None] * len(body.items)
+    for i, item in enumerate(body.items):
+        target, forb, desc = _normalize_check(item)
+        if not item.lexicalChecked:
+            violated = _lexical_violations(target, forb, desc)
+            if violated:
+                results[i] = CheckOut(ok=False, violated=violated, reason="lexical match")
+                continue
+        key = keys[i] = verdict_key(MODEL, target, forb, desc)
+        if key in todo:
+            continue
+        cached = verdicts.get(key)
+        if cached is not None:
+            results[i] = CheckOut(**cached)
+        else:
+            todo[key] = (target, forb, desc)
+
+    found: dict[str, CheckOut] = {}
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+    pending = [(key, *inputs) for key, inputs in todo.items()]
+
+    async def packed(chunk):
+        async with limit:
+            try:
+                answers = await _packed_verdicts(chunk)
+            except Exception:
+                answers = {}
+        found.update((key, CheckOut(**v)) for key, v in answers.items())
+        for key, target, forb, desc in chunk:
+            if key not in found:
+                async with limit:
+                    found[key] = await _llm_verdict(target, forb, desc)
+
+    await asyncio.gather(*(packed(pending[j:j + CHECKS_PER_PROMPT])
+                           for j in range(0, len(pending), CHECKS_PER_PROMPT)))
+    return CheckBatchOut(items=[r if r is not None else found[keys[i]] for i, r in enumerate(results)])
+
+
+# ---------- Metrics ----------
+@app.get("/metrics")
+async def metrics():
+    return {"verdict_cache": verdicts.stats(), "word_reservoir": reservoir.stats()}
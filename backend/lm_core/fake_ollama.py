@@ -0,0 +1,316 @@
+# backend/lm_core/fake_ollama.py
+"""
+Deterministic stand-in for Ollama, for load and latency tests without a model.
+
+Speaks the two endpoints the repo uses, `/api/generate` (streaming NDJSON or a single JSON
+object, like Ollama - `stream` defaults to true) and `/api/tags`, and answers the prompts it
+recognises with well-formed output:
+
+  - word-set prompts (api.gen_words)         -> {"targetWord": ..., "forbiddenWords": [...]}
+                                                 (an array of N for "an array of N objects")
+  - validator prompts (api.check_description) -> a whole-word verdict for the embedded Input JSON
+                                                 (one per item, with its id, for an Input array)
+  - clue-term prompts (bin/generator.LLMClient) -> a JSON array of terms
+  - findings prompts (bin/generator.ForbiddenAPI) -> [{"span", "rule"}] for forbidden words used
+  - anything else                             -> a short canned sentence
+
+Every call draws from its own RNG, seeded by (seed, call number), so a run with the same seed
+and the same request order gets the same latencies, failures and answers. Knobs (CLI flags or
+FAKE_OLLAMA_* env vars):
+
+  --latency / FAKE_OLLAMA_LATENCY           fixed:S | uniform:LO,HI | normal:MEAN,SD |
+                                            lognormal:MEDIAN,SIGMA | exp:MEAN   (seconds)
+  --error-rate / FAKE_OLLAMA_ERROR_RATE     fraction answered with HTTP 500
+  --malformed-rate / FAKE_OLLAMA_MALFORMED_RATE
+                                            fraction whose `response` is broken JSON
+  --token-latency / FAKE_OLLAMA_TOKEN_LATENCY
+                                            extra seconds per output token (~4 characters), so
+                                            long answers take longer, as they do on a real model
+  --chunk-delay / FAKE_OLLAMA_CHUNK_DELAY   seconds between streamed chunks
+  --seed / FAKE_OLLAMA_SEED
+  --models / FAKE_OLLAMA_MODELS             comma-separated names listed by /api/tags
+
+`GET /_stats` reports calls, errors, malformed answers and client connections seen;
+`POST /_stats/reset` clears them. Run it where the real one would be:
+
+  $ python -m backend.lm_core.fake_ollama --port 11434 --latency lognormal:0.8,0.4 --error-rate 0.02
+  $ OLLAMA_URL=http://127.0.0.1:11434 uvicorn backend.lm_core.api:app --port 9001
+"""
+from __future__ import annotations
+import os
+import re
+import ast
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORD_SETS = [
+    ("tree", ["leaf", "wood", "forest", "branch"]),
+    ("ocean", ["sea", "water", "wave", "salt"]),
+    ("guitar", ["music", "string", "chord", "band"]),
+    ("bread", ["bake", "flour", "toast", "loaf"]),
+    ("rocket", ["space", "launch", "fuel", "nasa"]),
+    ("camera", ["photo", "lens", "picture", "flash"]),
+    ("winter", ["snow", "cold", "ice", "december"]),
+    ("doctor", ["hospital", "nurse", "medicine", "patient"]),
+    ("pizza", ["cheese", "italy", "slice", "oven"]),
+    ("bicycle", ["pedal", "wheel", "ride", "bike"]),
+    ("library", ["book", "read", "shelf", "quiet"]),
+    ("volcano", ["lava", "eruption", "mountain", "magma"]),
+    ("coffee", ["bean", "cup", "caffeine", "espresso"]),
+    ("castle", ["king", "tower", "knight", "moat"]),
+    ("garden", ["flower", "plant", "soil", "grow"]),
+    ("airport", ["plane", "flight", "gate", "luggage"]),
+    ("candle", ["wax", "flame", "wick", "light"]),
+    ("penguin", ["bird", "ice", "antarctica", "waddle"]),
+    ("umbrella", ["rain", "wet", "open", "shade"]),
+    ("piano", ["keys", "music", "play", "notes"]),
+    ("desert", ["sand", "hot", "dry", "camel"]),
+    ("mirror", ["reflection", "glass", "look", "face"]),
+    ("ladder", ["climb", "steps", "rungs", "high"]),
+    ("honey", ["bee", "sweet", "hive", "sticky"]),
+    ("train", ["rail", "station", "track", "ticket"]),
+    ("clock", ["time", "hour", "watch", "tick"]),
+    ("island", ["sea", "beach", "palm", "surrounded"]),
+    ("dragon", ["fire", "myth", "wings", "scales"]),
+    ("wallet", ["money", "cash", "card", "pocket"]),
+    ("tent", ["camp", "sleep", "outdoor", "pole"]),
+    ("moon", ["night", "sky", "crescent", "lunar"]),
+    ("kettle", ["boil", "water", "tea", "steam"]),
+]
+
+
+def parse_latency(spec: str):
+    """'kind:a,b' -> function(rng) -> seconds (never negative)."""
+    kind, _, args = spec.partition(":")
+    try:
+        a = [float(x) for x in args.split(",") if x.strip()]
+    except ValueError:
+        raise ValueError(f"bad latency spec {spec!r}")
+    dists = {
+        "fixed": (1, lambda r: a[0]),
+        "uniform": (2, lambda r: r.uniform(a[0], a[1])),
+        "normal": (2, lambda r: r.gauss(a[0], a[1])),
+        "lognormal": (2, lambda r: a[0] * r.lognormvariate(0.0, a[1])),
+        "exp": (1, lambda r: r.expovariate(1.0 / a[0]) if a[0] > 0 else 0.0),
+    }
+    if kind not in dists or len(a) != dists[kind][0]:
+        raise ValueError(f"bad latency spec {spec!r}; expected one of "
+                         "fixed:S, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA, exp:MEAN")
+    draw = dists[kind][1]
+    return lambda r: max(0.0, draw(r))
+
+
+@dataclass
+class FakeConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    token_latency: float = 0.0
+    chunk_delay: float = 0.0
+    seed: int = 0
+    models: list[str] = field(default_factory=lambda: ["phi3:mini"])
+
+    @classmethod
+    def from_env(cls) -> "FakeConfig":
+        models = os.getenv("FAKE_OLLAMA_MODELS")
+        return cls(latency=os.getenv("FAKE_OLLAMA_LATENCY", "fixed:0"),
+                   error_rate=float(os.getenv("FAKE_OLLAMA_ERROR_RATE", "0")),
+                   malformed_rate=float(os.getenv("FAKE_OLLAMA_MALFORMED_RATE", "0")),
+                   token_latency=float(os.getenv("FAKE_OLLAMA_TOKEN_LATENCY", "0")),
+                   chunk_delay=float(os.getenv("FAKE_OLLAMA_CHUNK_DELAY", "0")),
+                   seed=int(os.getenv("FAKE_OLLAMA_SEED", "0")),
+                   **({"models": [m.strip() for m in models.split(",") if m.strip()]} if models else {}))
+
+
+# ---------- Canned answers ----------
+def _word_set(rng: random.Random) -> dict:
+    target, forbidden = rng.choice(WORD_SETS)
+    return {"targetWord": target, "forbiddenWords": list(forbidden)}
+
+
+def _word_sets(n: int, prompt: str, rng: random.Random) -> list[dict]:
+    m = re.search(r"Do NOT use these targets: ([^.\n]*)", prompt)
+    avoid = {w.strip() for w in m.group(1).split(",")} if m else set()
+    # a real model knows far more nouns than WORD_SETS: numbered variants ("tree2") stand in for
+    # them, so parallel batch prompts overlap about as rarely as they would on a model
+    fresh = [s for s in WORD_SETS if s[0] not in avoid]
+    k = 2
+    while len(fresh) < max(n, 8 * len(WORD_SETS)):
+        fresh += [(f"{t}{k}", f) for t, f in WORD_SETS if f"{t}{k}" not in avoid]
+        k += 1
+    picks = rng.sample(fresh, n)
+    return [{"targetWord": t, "forbiddenWords": list(f)} for t, f in picks]
+
+
+def _verdicts(prompt: str):
+    m = re.search(r"Input:\s*(\[.*\]|\{.*\})", prompt, flags=re.S)
+    try:
+        data = json.loads(m.group(1)) if m else {}
+    except ValueError:
+        data = {}
+    if isinstance(data, list):
+        return [{"id": item.get("id"), **_verdict(item)} for item in data if isinstance(item, dict)]
+    return _verdict(data)
+
+
+def _verdict(data: dict) -> dict:
+    vocab = set(re.findall(r"[a-z]+", str(data.get("description", "")).lower()))
+    words = [str(data.get("targetWord", ""))] + [str(w) for w in data.get("forbiddenWords") or []]
+    violated = sorted({w.lower() for w in words if w and w.lower() in vocab})
+    return {"ok": not violated, "violated": violated, "reason": "whole-word match" if violated else "clean"}
+
+
+def _terms(prompt: str, rng: random.Random) -> list[str]:
+    m = re.search(r'terms for "([^"]+)"', prompt)
+    word = (m.group(1) if m else "thing").lower()
+    for target, forbidden in WORD_SETS:
+        if target == word:
+            return list(forbidden)
+    return [f"{word} {suffix}" for suffix in rng.sample(["kind", "use", "place", "part", "maker"], 3)]
+
+
+def _findings(prompt: str) -> list[dict]:
+    target = re.search(r'Target word: "([^"]*)"', prompt)
+    lemmas = re.search(r"Forbidden lemmas[^:]*:\s*(\[.*?\])", prompt)
+    desc = re.search(r'Description:\s*"""(.*?)"""', prompt, flags=re.S)
+    try:
+        words = ast.literal_eval(lemmas.group(1)) if lemmas else []
+    except (ValueError, SyntaxError):
+        words = []
+    text = (desc.group(1) if desc else "").lower()
+    out = []
+    if target and re.search(rf"\b{re.escape(target.group(1).lower())}", text):
+        out.append({"span": target.group(1), "rule": "target-stem-forbidden"})
+    out += [{"span": w, "rule": "lemma-forbidden"} for w in words
+            if isinstance(w, str) and w and re.search(rf"\b{re.escape(w.lower())}\b", text)]
+    return out
+
+
+def answer(prompt: str, rng: random.Random) -> str:
+    """The text a well-behaved model would return for `prompt`."""
+    if "validator" in prompt:
+        return json.dumps(_verdicts(prompt))
+    if "targetWord" in prompt and "forbiddenWords" in prompt:
+        m = re.search(r"an array of (\d+) objects", prompt)
+        return json.dumps(_word_sets(int(m.group(1)), prompt, rng) if m else _word_set(rng))
+    if "rule violations" in prompt:
+        return json.dumps(_findings(prompt))
+    if "JSON array" in prompt:
+        return json.dumps(_terms(prompt, rng))
+    return "This is a canned answer from the fake Ollama server."
+
+
+def _malform(text: str, rng: random.Random) -> str:
+    return rng.choice([
+        text[: max(1, len(text) // 2)],                 # truncated
+        "Sure! Here is the JSON you asked for: " + text.replace('"', "'"),
+        "I'm sorry, I can't help with that.",
+        "```json\n" + text.rstrip("}]") + ",\n```",     # fenced, trailing comma, unclosed
+    ])
+
+
+# ---------- App ----------
+def create_app(config: FakeConfig | None = None) -> FastAPI:
+    config = config or FakeConfig.from_env()
+    latency = parse_latency(config.latency)
+    app = FastAPI(title="Fake Ollama")
+    app.state.config = config
+    calls = itertools.count()
+    stats = {"calls": 0, "errors": 0, "malformed": 0, "streamed": 0}
+    connections: set = set()
+
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        if request.client:
+            connections.add((request.client.host, request.client.port))
+        rng = random.Random(f"{config.seed}:{next(calls)}")
+        stats["calls"] += 1
+        model, prompt = body.get("model", config.models[0]), str(body.get("prompt", ""))
+        delay = latency(rng)
+        fail = rng.random() < config.error_rate
+        broken = rng.random() < config.malformed_rate
+        text = answer(prompt, rng)
+        if broken:
+            text = _malform(text, rng)
+        delay += config.token_latency * len(text) / 4
+
+        if fail:
+            await asyncio.sleep(delay)
+            stats["errors"] += 1
+            return JSONResponse({"error": "fake ollama: injected failure"}, status_code=500)
+        if broken:
+            stats["malformed"] += 1
+        if not body.get("stream", True):
+            t0 = time.perf_counter_ns()
+            await asyncio.sleep(delay)
+            return {"model": model, "created_at": _now(), "response": text, "done": True,
+                    "total_duration": time.perf_counter_ns() - t0}
+
+        stats["streamed"] += 1
+        chunks = re.findall(r".{1,8}", text, flags=re.S) or [""]
+
+        async def ndjson():
+            t0 = time.perf_counter_ns()
+            await asyncio.sleep(delay)              # time to first token
+            for piece in chunks:
+                yield json.dumps({"model": model, "created_at": _now(), "response": piece, "done": False}) + "\n"
+                if config.chunk_delay:
+                    await asyncio.sleep(config.chunk_delay)
+            yield json.dumps({"model": model, "created_at": _now(), "response": "", "done": True,
+                              "total_duration": time.perf_counter_ns() - t0}) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": m, "model": m} for m in config.models]}
+
+    @app.get("/_stats")
+    async def get_stats():
+        return {**stats, "connections": len(connections)}
+
+    @app.post("/_stats/reset")
+    async def reset_stats():
+        out = {**stats, "connections": len(connections)}
+        stats.update(calls=0, errors=0, malformed=0, streamed=0)
+        connections.clear()
+        return out
+
+    return app
+
+
+def main(argv=None):
+    env = FakeConfig.from_env()
+    ap = argparse.ArgumentParser(description="Deterministic fake Ollama server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=11434)
+    ap.add_argument("--latency", default=env.latency)
+    ap.add_argument("--error-rate", type=float, default=env.error_rate)
+    ap.add_argument("--malformed-rate", type=float, default=env.malformed_rate)
+    ap.add_argument("--token-latency", type=float, default=env.token_latency)
+    ap.add_argument("--chunk-delay", type=float, default=env.chunk_delay)
+    ap.add_argument("--seed", type=int, default=env.seed)
+    ap.add_argument("--models", default=",".join(env.models))
+    args = ap.parse_args(argv)
+    parse_latency(args.latency)     # fail fast on a bad spec
+
+    import uvicorn
+    config = FakeConfig(latency=args.latency, error_rate=args.error_rate, malformed_rate=args.malformed_rate,
+                        token_latency=args.token_latency, chunk_delay=args.chunk_delay, seed=args.seed,
+                        models=[m.strip() for m in args.models.split(",") if m.strip()])
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning", backlog=4096)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# backend/lm_core/ollama_client.py
+"""
+Shared async Ollama client for the AI service.
+
+One httpx.AsyncClient per process keeps connections to OLLAMA_URL alive between calls, so a
+request pays TCP setup only when the pool has to grow, and the handlers in api.py `await`
+the model instead of holding a threadpool slot for the whole generation. Limits and
+timeouts come from the environment:
+
+  OLLAMA_MAX_CONNECTIONS     open connections to Ollama (in-flight generations), default 100
+  OLLAMA_MAX_KEEPALIVE       idle connections kept for reuse, default 100
+  OLLAMA_KEEPALIVE_EXPIRY    seconds an idle connection is kept, default 30
+  OLLAMA_TIMEOUT             seconds per generation (read), default 45 - overridable per call
+  OLLAMA_CONNECT_TIMEOUT     seconds to connect, default 5
+  OLLAMA_POOL_TIMEOUT        seconds to wait for a free connection, default 30
+"""
+from __future__ import annotations
+import os
+import httpx
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "100"))
+OLLAMA_MAX_KEEPALIVE = int(os.getenv("OLLAMA_MAX_KEEPALIVE", "100"))
+OLLAMA_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "30"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "45"))
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_POOL_TIMEOUT = float(os.getenv("OLLAMA_POOL_TIMEOUT", "30"))
+
+
+class OllamaClient:
+    def __init__(self, base_url: str = OLLAMA_URL, *,
+                 max_connections: int = OLLAMA_MAX_CONNECTIONS,
+                 max_keepalive: int = OLLAMA_MAX_KEEPALIVE,
+                 keepalive_expiry: float = OLLAMA_KEEPALIVE_EXPIRY,
+                 timeout: float = OLLAMA_TIMEOUT,
+                 connect_timeout: float = OLLAMA_CONNECT_TIMEOUT,
+                 pool_timeout: float = OLLAMA_POOL_TIMEOUT,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive,
+                                   keepalive_expiry=keepalive_expiry)
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout, pool=pool_timeout)
+        self._transport = transport        # tests inject httpx.MockTransport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Created on first use, inside the running event loop."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, limits=self.limits,
+                                             timeout=self.timeout, transport=self._transport)
+        return self._client
+
+    def _timeout(self, seconds: float | None) -> httpx.Timeout:
+        if seconds is None:
+            return self.timeout
+        return httpx.Timeout(seconds, connect=self.timeout.connect, pool=self.timeout.pool)
+
+    async def generate(self, model: str, prompt: str, *, timeout: float | None = None, **options) -> str:
+        """Non-streaming /api/generate; returns the model's `response` text (stripped)."""
+        r = await self.client.post("/api/generate",
+                                   json={"model": model, "prompt": prompt, "stream": False, **options},
+                                   timeout=self._timeout(timeout))
+        r.raise_for_status()
+        return (r.json().get("response") or "").strip()
+
+    async def tags(self, *, timeout: float = 2.0) -> list[str]:
+        """Names of the models Ollama has pulled; raises when it is unreachable."""
+        r = await self.client.get("/api/tags", timeout=self._timeout(timeout))
+        r.raise_for_status()
+        return [m.get("name") for m in (r.json().get("models") or [])]
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+ollama = OllamaClient()
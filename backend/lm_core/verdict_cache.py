@@ -0,0 +1,143 @@
+# backend/lm_core/verdict_cache.py
+"""
+Content-addressed cache for /check_description verdicts.
+
+A verdict only depends on the model and on (target, forbidden words, description), so it is
+stored under a SHA-256 of those inputs after normalisation (case, surrounding/duplicate
+whitespace, duplicate and reordered forbidden words), in an LRU bounded by
+VERDICT_CACHE_SIZE whose entries expire after VERDICT_CACHE_TTL seconds.
+
+Identical checks that arrive while the first one is still waiting on the model join it
+instead of prompting again (singleflight). Failed calls are neither cached nor shared beyond
+the requests already waiting on them.
+
+Runs on the service's event loop only, so no locking: nothing awaits between reading and
+updating the dicts.
+"""
+from __future__ import annotations
+import os
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "10000"))
+VERDICT_CACHE_TTL = float(os.getenv("VERDICT_CACHE_TTL", "3600"))
+
+
+def verdict_key(model: str, target: str, forbidden: list[str], description: str) -> str:
+    normalized = [
+        model,
+        target.strip().casefold(),
+        sorted({w.strip().casefold() for w in forbidden if w.strip()}),
+        " ".join(description.casefold().split()),
+    ]
+    return hashlib.sha256(json.dumps(normalized, ensure_ascii=False).encode()).hexdigest()
+
+
+class VerdictCache:
+    def __init__(self, max_items: int = VERDICT_CACHE_SIZE, ttl: float = VERDICT_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._clock = clock
+        self._items: OrderedDict[str, tuple[float, float, dict]] = OrderedDict()  # key -> (expires, cost, verdict)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def _lookup(self, key: str) -> dict | None:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        expires, cost, verdict = entry
+        if expires <= self._clock():
+            del self._items[key]
+            self.expired += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += cost
+        return verdict
+
+    def _store(self, key: str, cost: float, verdict: dict) -> None:
+        self._items[key] = (self._clock() + self.ttl, cost, verdict)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> dict | None:
+        """The cached verdict, or None (counted as a miss: the caller asks the model)."""
+        verdict = self._lookup(key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        return dict(verdict)
+
+    def put(self, key: str, verdict: dict, cost: float) -> None:
+        """Store a verdict obtained elsewhere (a packed batch prompt); `cost` is its share of
+        the model time, credited to saved_seconds on later hits."""
+        self._store(key, cost, dict(verdict))
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """The cached verdict for `key`, or the result of `compute()` shared with concurrent
+        callers of the same key. Exceptions from `compute` propagate to every waiter.
+
+        The model call runs as its own task, so a waiter that goes away (client disconnect)
+        does not cancel it for the others."""
+        verdict = self._lookup(key)
+        if verdict is not None:
+            return dict(verdict)
+
+        task = self._inflight.get(key)
+        joined = task is not None
+        if joined:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())   # never "unretrieved"
+            self._inflight[key] = task
+        verdict, cost = await asyncio.shield(task)
+        if joined:
+            self.saved_seconds += cost
+        return dict(verdict)
+
+    async def _compute(self, key: str, compute) -> tuple[dict, float]:
+        t0 = time.perf_counter()
+        try:
+            verdict = await compute()
+        finally:
+            self._inflight.pop(key, None)
+        cost = time.perf_counter() - t0
+        self._store(key, cost, dict(verdict))
+        return verdict, cost
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "items": len(self._items),
+            "max_items": self.max_items,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": ((self.hits + self.coalesced) / lookups) if lookups else None,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+verdicts = VerdictCache()
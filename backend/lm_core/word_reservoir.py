@@ -0,0 +1,206 @@
+# backend/lm_core/word_reservoir.py
+"""
+Reservoir of validated word sets behind /gen_words.
+
+Background workers prompt the model until the reservoir holds WORD_RESERVOIR_SIZE sets,
+then sleep until takes bring it below WORD_RESERVOIR_LOW_WATER, so /gen_words is normally a
+popleft. Only an empty reservoir makes a caller wait for a model call of its own. Sets are
+validated before they go in (a malformed answer is dropped and retried, never served), and
+targets already in the reservoir are skipped so back-to-back games do not repeat a word
+(workers back off when the model keeps repeating itself, as they do on errors).
+
+The contents are written to WORD_RESERVOIR_PATH (JSON, replaced atomically) shortly after
+they change and on shutdown, and loaded back - re-validated - on start, so a restart serves
+warm. An empty path keeps the reservoir in memory only; WORD_RESERVOIR_SIZE=0 turns it off.
+
+Like the verdict cache it lives on the service's event loop: no locks.
+"""
+from __future__ import annotations
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable
+
+log = logging.getLogger(__name__)
+
+WORD_RESERVOIR_PATH = os.getenv("WORD_RESERVOIR_PATH", "data/word_reservoir.json")
+WORD_RESERVOIR_SIZE = int(os.getenv("WORD_RESERVOIR_SIZE", "64"))
+WORD_RESERVOIR_LOW_WATER = int(os.getenv("WORD_RESERVOIR_LOW_WATER", "16"))
+WORD_RESERVOIR_WORKERS = int(os.getenv("WORD_RESERVOIR_WORKERS", "2"))
+WORD_RESERVOIR_PERSIST_DELAY = float(os.getenv("WORD_RESERVOIR_PERSIST_DELAY", "2"))
+
+
+class WordReservoir:
+    def __init__(self, produce: Callable[[], Awaitable[dict]], validate: Callable[[dict], dict], *,
+                 path: str | None = WORD_RESERVOIR_PATH, capacity: int = WORD_RESERVOIR_SIZE,
+                 low_water: int = WORD_RESERVOIR_LOW_WATER, workers: int = WORD_RESERVOIR_WORKERS,
+                 persist_delay: float = WORD_RESERVOIR_PERSIST_DELAY, max_backoff: float = 30.0):
+        self._produce = produce             # one model call -> validated {"targetWord", "forbiddenWords"}
+        self._validate = validate           # raises ValueError on a bad set
+        self.path = Path(path) if path else None
+        self.capacity = max(0, capacity)
+        self.low_water = min(max(0, low_water), self.capacity)
+        self.workers = workers
+        self.persist_delay = persist_delay
+        self.max_backoff = max_backoff
+        self._items: deque[dict] = deque()
+        self._inflight = 0
+        self._wanted: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._persist_task: asyncio.Task | None = None
+        # metrics
+        self.served = 0
+        self.blocked = 0
+        self.produced = 0
+        self.failures = 0
+        self.duplicates = 0
+        self.loaded = 0
+        self._blocked_seconds = 0.0
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        """Load the persisted sets and start the refill workers (inside the running loop)."""
+        if self._tasks or not self.capacity:
+            return
+        self._wanted = asyncio.Event()
+        self._load()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+        self._refill_if_low(force=True)
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._persist_task:
+            self._persist_task.cancel()
+            self._persist_task = None
+        self._save()
+
+    # ---------- serving ----------
+    async def take(self) -> dict:
+        """A word set: from the reservoir if it has one, else straight from the model."""
+        if self._items:
+            words = self._items.popleft()
+            self.served += 1
+            self._changed()
+            self._refill_if_low()
+            return dict(words)
+        self.blocked += 1
+        self._refill_if_low()
+        t0 = time.perf_counter()
+        try:
+            return dict(await self._produce())
+        finally:
+            self._blocked_seconds += time.perf_counter() - t0
+
+    def take_many(self, n: int) -> list[dict]:
+        """Up to `n` sets, only what the reservoir holds right now (never waits)."""
+        out = [dict(self._items.popleft()) for _ in range(min(n, len(self._items)))]
+        if out:
+            self.served += len(out)
+            self._changed()
+            self._refill_if_low()
+        return out
+
+    # ---------- refill ----------
+    def _refill_if_low(self, force: bool = False) -> None:
+        if self._tasks and (force or len(self._items) < self.low_water):
+            self._wanted.set()
+
+    async def _worker(self) -> None:
+        failures = 0
+        while True:
+            await self._wanted.wait()
+            if len(self._items) + self._inflight >= self.capacity:
+                self._wanted.clear()        # full: sleep until a take crosses the low-water mark
+                continue
+            self._inflight += 1
+            try:
+                words = await self._produce()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                failures += 1
+                log.warning("word reservoir refill failed (%s): %s", failures, e)
+                words = None
+            finally:
+                self._inflight -= 1
+            if words is not None:
+                self.produced += 1
+                if self._add(words):
+                    failures = 0
+                    continue
+                failures += 1               # model keeps repeating itself: slow down as well
+            await asyncio.sleep(min(self.max_backoff, 0.5 * 2 ** (failures - 1)))
+            self._wanted.set()              # this slot is still to fill (another worker may have parked)
+
+    def _add(self, words: dict) -> bool:
+        if len(self._items) >= self.capacity:
+            return False
+        if any(w["targetWord"] == words["targetWord"] for w in self._items):
+            self.duplicates += 1
+            return False
+        self._items.append(dict(words))
+        self._changed()
+        return True
+
+    # ---------- persistence ----------
+    def _changed(self) -> None:
+        if self.path and self._tasks and self._persist_task is None:
+            self._persist_task = asyncio.get_running_loop().create_task(self._save_soon())
+
+    async def _save_soon(self) -> None:
+        await asyncio.sleep(self.persist_delay)     # one write per burst of changes
+        self._persist_task = None
+        await asyncio.to_thread(self._write, list(self._items))
+
+    def _save(self) -> None:
+        if self.path:
+            self._write(list(self._items))
+
+    def _write(self, items: list[dict]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(items, ensure_ascii=False))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning("word reservoir not saved to %s: %s", self.path, e)
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            items = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            log.warning("word reservoir at %s unreadable, starting cold: %s", self.path, e)
+            return
+        for raw in items if isinstance(items, list) else []:
+            try:
+                if self._add(self._validate(raw)):
+                    self.loaded += 1
+            except (ValueError, TypeError, AttributeError, KeyError):
+                continue
+
+    def stats(self) -> dict:
+        takes = self.served + self.blocked
+        return {
+            "size": len(self._items),
+            "capacity": self.capacity,
+            "low_water": self.low_water,
+            "inflight": self._inflight,
+            "served": self.served,
+            "blocked": self.blocked,
+            "hit_ratio": (self.served / takes) if takes else None,
+            "blocked_avg_sec": (self._blocked_seconds / self.blocked) if self.blocked else None,
+            "produced": self.produced,
+            "failures": self.failures,
+            "duplicates": self.duplicates,
+            "loaded_from_disk": self.loaded,
+        }
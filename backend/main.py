@@ -4,15 +4,32 @@ from pathlib import Path
 from datetime import timedelta
 from .database.db import engine, Base
 from .database import models
+from .database.migrations import run_migrations
 from .app import register_blueprints, register_error_handlers
 from .extensions import socketio
 from .app import sockets
+from .app.room_cache import room_cache
+from .app.background import tasks
+from .app.word_queue import word_queue
+from .app.frozen_cache import completed_rounds, past_games
+from .app.identity_cache import identity_cache
+from .app.socket_queue import socketio_options, start_listener
 import os
+import hmac
 
 ROOT = Path(__file__).resolve().parents[1]
 FRONTEND_STATIC = ROOT / "frontend" / "static"
 FRONTEND_TEMPLATES = ROOT / "frontend" / "templates"
 
+# /api/metrics: with METRICS_TOKEN set, callers send it as X-Metrics-Token; without it the
+# endpoint only answers local requests. nginx does not route it at all.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+def _metrics_allowed() -> bool:
+    if METRICS_TOKEN:
+        return hmac.compare_digest(request.headers.get("X-Metrics-Token", ""), METRICS_TOKEN)
+    return request.remote_addr in ("127.0.0.1", "::1")
+
 def create_app() -> Flask:
 
     app = Flask(
@@ -24,14 +41,25 @@ def create_app() -> Flask:
 
     with app.app_context():
         Base.metadata.create_all(bind=engine)
+        run_migrations()
 
     register_blueprints(app)
     register_error_handlers(app)
+    socketio.init_app(app, **socketio_options())
+    start_listener(socketio)
 
     @app.get("/api/health")
     def health():
         return jsonify(ok=True)
 
+    @app.get("/api/metrics")
+    def metrics():
+        if not _metrics_allowed():
+            return jsonify(error="forbidden"), 403
+        return jsonify(room_cache=room_cache.stats(), background=tasks.stats(),
+                       word_queue=word_queue.stats(), completed_rounds=completed_rounds.stats(),
+                       past_games=past_games.stats(), identity_cache=identity_cache.stats())
+
     # Serve landing directly here (matches our auth.landing too; keep one of them)
     @app.get("/")
     def root():
@@ -46,7 +74,6 @@ import os
 
 if __name__ == "__main__":
     app = create_app()
-    socketio.init_app(app, cors_allowed_origins="*")
     port = int(os.getenv("WEB_PORT", "8000"))
     debug = os.getenv("FLASK_DEBUG", "0") == "1"
     socketio.run(
@@ -25,7 +25,7 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass # easy to tune configurations 
 import re # basic pacage for working with text
 import numpy as np
-import re, requests, json # for prompting  
+import os, re, requests, json # for prompting  
 
 from nltk.corpus import wordnet as wn # for working with synsets (antonyms, description, synonyms etc.)
 from nltk.stem import WordNetLemmatizer # for working with same-stem words
@@ -34,6 +34,9 @@ from nltk.stem import SnowballStemmer
 from .core_index import EmbedIndex # used only for defining the type of parmeter in function
 from typing import Dict, List, Tuple
 
+# Ollama (or backend/lm_core/fake_ollama.py) address when llm_params has no "host"
+DEFAULT_OLLAMA_HOST = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
 
 @dataclass
 class GenConfig:
@@ -93,7 +96,7 @@ class LLMClient:
         )
 
         if self.backend == "ollama":
-            host = self.params.get("host", "http://localhost:11434")
+            host = self.params.get("host", DEFAULT_OLLAMA_HOST)
             model = self.params["model"]
 
             # ① Ask Ollama to enforce JSON
@@ -378,7 +381,7 @@ class ForbiddenAPI:
 
         findings = []
         if self.llm.backend == "ollama":
-            host = self.llm.params.get("host", "http://localhost:11434")
+            host = self.llm.params.get("host", DEFAULT_OLLAMA_HOST)
             model = self.llm.params["model"]
             r = requests.post(
                 f"{host}/api/generate",
@@ -31,6 +31,12 @@
     // State
     let currentGame = null;   // { id, code, isCreator }
     let lobbyTimer  = null;
+    let lobbyEtag   = null;   // ETag of the last lobby we rendered (poll answers 304 while unchanged)
+    let lobbySocket = null;
+
+    // Lobby updates are pushed over Socket.IO; polling is only a fallback
+    const LOBBY_POLL_MS        = 2000;    // socket unavailable / disconnected
+    const LOBBY_POLL_SOCKET_MS = 15000;   // socket connected: safety net only
 
     // ---------- UI helpers ----------
     function openPanel(panel){
@@ -44,7 +50,7 @@
       overlay.hidden = true;
       [panelNew, panelJoin, panelLobby].forEach(p => { if (p) p.hidden = true; });
       document.body.classList.remove("modal-open");
-      if (lobbyTimer){ clearInterval(lobbyTimer); lobbyTimer = null; }
+      stopLobbyUpdates();
     }
 
     // Close handler for any element with [data-close]
@@ -141,13 +147,7 @@
     });
 
     // ---------- Lobby ----------
-    async function pollLobby() {
-      if (!currentGame) return;
-
-      const res  = await fetch(`/api/games/${currentGame.id}/lobby`);
-      const data = await res.json();
-      if (!res.ok || !data.ok) return;
-
+    function renderLobby(data) {
       // Players
       const ul = $("#lobby-players");
       if (ul) {
@@ -169,17 +169,63 @@
         `;
       }
 
-      // If game started elsewhere, redirect (hook up your game room route here)
-    if (data.status === "active" && currentGame) {
-      if (lobbyTimer) { clearInterval(lobbyTimer); lobbyTimer = null; }
-      window.location.href = `/room/${currentGame.id}`;
-      return; // stop rendering further
+      // If game started elsewhere, redirect to the room
+      if (data.status === "active" && currentGame) {
+        const id = currentGame.id;
+        stopLobbyUpdates();
+        window.location.href = `/room/${id}`;
+      }
     }
+
+    async function pollLobby() {
+      if (!currentGame) return;
+
+      const headers = lobbyEtag ? { "If-None-Match": lobbyEtag } : {};
+      const res = await fetch(`/api/games/${currentGame.id}/lobby`, { headers, cache: "no-store" });
+      if (res.status === 304) return;   // nothing changed since the last render
+      const data = await res.json();
+      if (!res.ok || !data.ok) return;
+
+      lobbyEtag = res.headers.get("ETag");
+      renderLobby(data);
+    }
+
+    function setLobbyPollInterval(ms) {
+      if (lobbyTimer) clearInterval(lobbyTimer);
+      lobbyTimer = setInterval(pollLobby, ms);
+    }
+
+    function startLobbySocket() {
+      if (typeof io === "undefined") return;
+      const gameId = currentGame.id;
+      lobbySocket = io();
+      lobbySocket.on("connect", () => {
+        lobbySocket.emit("lobby:join", { game_id: gameId }, (resp) => {
+          if (!resp || resp.error || !currentGame || currentGame.id !== gameId) return;
+          setLobbyPollInterval(LOBBY_POLL_SOCKET_MS);
+          lobbyEtag = null;   // the ack is newer than whatever the poll saw
+          renderLobby(resp);
+        });
+      });
+      lobbySocket.on("disconnect", () => { if (lobbySocket && currentGame) setLobbyPollInterval(LOBBY_POLL_MS); });
+      lobbySocket.on("lobby:update", (msg) => {
+        if (!msg || !currentGame || msg.gameId !== currentGame.id) return;
+        lobbyEtag = null;
+        renderLobby(msg);
+      });
     }
 
     function startLobbyPolling() {
+      lobbyEtag = null;
       pollLobby();
-      lobbyTimer = setInterval(pollLobby, 2000);
+      setLobbyPollInterval(LOBBY_POLL_MS);
+      startLobbySocket();
+    }
+
+    function stopLobbyUpdates() {
+      if (lobbyTimer) { clearInterval(lobbyTimer); lobbyTimer = null; }
+      if (lobbySocket) { const s = lobbySocket; lobbySocket = null; s.disconnect(); }
+      lobbyEtag = null;
     }
 
     function renderLobbyHeader() {
@@ -205,12 +251,6 @@
 
         // ---------- Active games (right panel) ----------
 
-    async function _fetchJSON(url) {
-      const r = await fetch(url, { credentials: 'same-origin' });
-      if (!r.ok) throw new Error(await r.text());
-      return r.json();
-    }
-
     function _fmtElapsedMs(ms) {
       if (typeof ms !== 'number' || ms < 0) return '—';
       const m = Math.floor(ms / 60000).toString().padStart(2, '0');
@@ -219,21 +259,33 @@
     }
 
 // ---------- Active games (right panel) ----------
+// Paged like past_games.html: the next page's cursor comes in the X-Next-Cursor header
+let activeCursor = null;
+
 async function loadMyActiveGames() {
   const grid = document.getElementById('my-active-games');
+  const more = document.getElementById('active-more');
   if (!grid) return;
 
-  grid.innerHTML = `<p class="muted">Loading…</p>`;
+  const firstPage = !activeCursor;
+  if (firstPage) grid.innerHTML = `<p class="muted">Loading…</p>`;
+  if (more) more.disabled = true;
 
   try {
     // expects backend /api/games/my_active -> [{id, code, players, max, createdAt, startedAt, status, currentRound, totalRounds}]
-    const data = await _fetchJSON('/api/games/my_active');
-    if (!Array.isArray(data) || data.length === 0) {
+    const url = '/api/games/my_active' + (activeCursor ? `?cursor=${encodeURIComponent(activeCursor)}` : '');
+    const r = await fetch(url, { credentials: 'same-origin' });
+    if (!r.ok) throw new Error(await r.text());
+    const data = await r.json();
+    activeCursor = r.headers.get('X-Next-Cursor');
+    if (more) more.hidden = !activeCursor;
+
+    if (firstPage && (!Array.isArray(data) || data.length === 0)) {
       grid.innerHTML = `<p class="muted">No active games yet.</p>`;
       return;
     }
 
-    grid.innerHTML = '';
+    if (firstPage) grid.innerHTML = '';
     const now = Date.now();
 
     data.forEach(g => {
@@ -269,13 +321,16 @@ async function loadMyActiveGames() {
       grid.appendChild(card);
     });
   } catch (e) {
-    grid.innerHTML = `<p class="error">Failed to load games.</p>`;
+    if (firstPage) grid.innerHTML = `<p class="error">Failed to load games.</p>`;
     console.error(e);
+  } finally {
+    if (more) more.disabled = false;
   }
 }
 
 
     // Kick off right panel population on page load
+    document.getElementById('active-more')?.addEventListener('click', loadMyActiveGames);
     loadMyActiveGames();
   }
 })();
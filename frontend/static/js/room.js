@@ -10,7 +10,10 @@
     startedAt: null,
     timerId: null,
     isCreator: false,
-    betweenRounds: false
+    betweenRounds: false,
+    version: null,        // room state version we have applied (server-side counter)
+    last: null,           // last full room state, deltas are merged into it
+    chatCursor: null      // highest chat MessageID shown; resume point after a reconnect
   };
 
   const overlay = $("#modal-overlay");
@@ -60,7 +63,11 @@
     });
   }
 
-  function addChatLine(user,text){
+  function addChatLine(user,text,ts,type,id){
+    if (id != null) {
+      if (state.chatCursor != null && id <= state.chatCursor) return;   // already shown
+      state.chatCursor = id;
+    }
     const box=$("#chat-list");
     const div=document.createElement("div");
     div.className="chat-item";
@@ -132,13 +139,34 @@
         // clear + render
         const box = $("#chat-list");
         if (box) box.innerHTML = '';
-        (data.messages || []).forEach(m => addChatLine(m.user, m.text, m.ts, m.type));
+        state.chatCursor = null;
+        (data.messages || []).forEach(m => addChatLine(m.user, m.text, m.ts, m.type, m.id));
       } catch (e) {
         console.error('chat history load failed', e);
       }
     }
 
-  // ---------- POLLING ----------
+    // only the messages missed while disconnected: everything after the last id we showed
+    async function loadChatTail() {
+      const gid = state.gameId;
+      if (!gid || state.chatCursor == null) return loadChatHistory({ round: 'current' });
+      try {
+        let cursor = state.chatCursor, more = true;
+        while (more) {
+          const params = new URLSearchParams({ round: 'current', after_id: String(cursor), limit: '200' });
+          const res  = await fetch(`/api/room/${gid}/chat?` + params.toString(), { credentials: 'same-origin' });
+          const data = await res.json();
+          if (!res.ok || !data.ok) return;
+          (data.messages || []).forEach(m => addChatLine(m.user, m.text, m.ts, m.type, m.id));
+          more = !!data.has_more && data.next_cursor != null && data.next_cursor !== cursor;
+          cursor = data.next_cursor;
+        }
+      } catch (e) {
+        console.error('chat tail load failed', e);
+      }
+    }
+
+  // ---------- POLLING (fallback only when Socket.IO is unavailable) ----------
   let pollId=null;
   function startPolling(){
     stopPolling();
@@ -156,8 +184,17 @@
 
   // ---------- SOCKETS ----------
   function setupSockets(){
-    if (typeof io === "undefined") return;
+    if (typeof io === "undefined") { startPolling(); return; }
     const socket = io();
+
+    // full state, but only if ours is stale (server answers {upToDate:true} otherwise)
+    const requestSync = ()=>{
+      socket.emit("room:sync", { game_id: state.gameId, version: state.version }, (resp)=>{
+        if (!resp || resp.error || resp.upToDate) return;
+        applySnapshot(resp, { from: "sync" });
+      });
+    };
+
         socket.on("connect", ()=>{
       socket.emit("room:join", { game_id: state.gameId });
       // optimistic loader for creators until first snapshot arrives
@@ -168,14 +205,48 @@
         showModal(modals.describer);
       }
     });
+    // (re)joined the game room: catch up on anything missed while disconnected
+    socket.on("room:joined", ()=> { requestSync(); loadChatTail(); });
+
+    socket.on("room:state", (msg)=>{
+      if (!msg || msg.gameId !== state.gameId) return;
+      const d = msg.delta || {};
+      const roundChanged = ("roundNumber" in d) && state.last && d.roundNumber !== state.last.roundNumber;
+      if (!state.last || msg.baseVersion !== state.version || roundChanged) {
+        // missed an update (or a new round needs the creator's secret words): fetch full state
+        requestSync();
+        return;
+      }
+      applySnapshot({ ...state.last, ...d, version: msg.version }, { from: "push" });
+    });
+
+    // description verdict; with async verification this is the only answer the creator gets
+    socket.on("round:ai_progress", (msg)=>{
+      if (!msg || state.reviewMode || !state.isCreator) return;
+      if (msg.phase === "desc_bad") {
+        if (dsec.descErr) {
+          dsec.descErr.textContent = msg.reason || "Description rejected.";
+          dsec.descErr.hidden = false;
+        }
+        dsec.loading && (dsec.loading.hidden = true);
+        dsec.verifying && (dsec.verifying.hidden = true);
+        dsec.ready && (dsec.ready.hidden = false);
+      }
+    });
 
-    socket.on("chat:new", (msg)=> addChatLine(msg.user, msg.text));
+    socket.on("chat:new", (msg)=> addChatLine(msg.user, msg.text, null, null, msg.id));
     socket.on("round:description", (data)=> onDescriptionLive(data));
     socket.on("round:won", (data)=> onWinnerLive(data));
   }
 
   // ---------- SNAPSHOT -> UI ----------
   function applySnapshot(d, {from}={}){
+    if (d.version != null) {
+      if (state.version != null && d.version < state.version) return;   // out-of-order response
+      state.version = d.version;
+    }
+    state.last = d;
+
     // creator lock
     state.isCreator = (d.turn && (d.turn === (state.user?.username||"")));
     const inp = $("#chat-input");
@@ -477,8 +548,9 @@ function onWinnerLive(data){
         setupReviewNav();
       })();
     } else {
+      // one snapshot on load, then pushed room:state deltas (see setupSockets)
+      getRoom().then(data => { if (!data.error) applySnapshot(data, { from: "load" }); }).catch(()=>{});
       setupSockets();
-      startPolling();
       // show chat history for the *current* live round
       loadChatHistory({ round: 'current' });
     }
@@ -2,4 +2,38 @@
 set -euo pipefail
 export FLASK_SECRET_KEY="${FLASK_SECRET_KEY:-change-me}"
 export PORT=8000
-exec python -m backend.main
+
+# WEB_SERVER=dev: Werkzeug development server (auto-reload with FLASK_DEBUG=1)
+if [ "${WEB_SERVER:-gunicorn}" = "dev" ]; then
+  exec python -m backend.main
+fi
+
+# Production: gunicorn with gevent workers (settings and env knobs in backend/gunicorn_conf.py)
+WEB_PROCESSES="${WEB_PROCESSES:-1}"
+if [ "$WEB_PROCESSES" -le 1 ]; then
+  exec gunicorn -c backend/gunicorn_conf.py --bind "0.0.0.0:8000" "backend.main:create_app()"
+fi
+
+# One single-worker gunicorn per port (8001..) behind nginx sticky sessions
+# (services/nginx/nginx.conf). Socket.IO emits fan out between the processes
+# through SOCKETIO_MESSAGE_QUEUE, e.g. redis://redis:6379/0; game state shared
+# between them (queued word sets, pending description checks) is in the database.
+if [ -z "${SOCKETIO_MESSAGE_QUEUE:-}" ]; then
+  echo "WEB_PROCESSES=$WEB_PROCESSES needs SOCKETIO_MESSAGE_QUEUE" >&2
+  exit 1
+fi
+python -m backend.database.migrations   # tables + migrations once, before the workers race to do it
+pids=()
+for i in $(seq 1 "$WEB_PROCESSES"); do
+  gunicorn -c backend/gunicorn_conf.py --bind "0.0.0.0:$((8000 + i))" "backend.main:create_app()" &
+  pids+=("$!")
+done
+
+# HUP: graceful reload of every gunicorn; TERM/INT: graceful shutdown
+trap 'kill -HUP "${pids[@]}"' HUP
+trap 'kill -TERM "${pids[@]}"; wait; exit 0' TERM INT
+while true; do
+  wait -n && status=0 || status=$?
+  [ "$status" -gt 128 ] && continue     # interrupted by a trapped signal (HUP)
+  exit 1                                # a gunicorn died
+done
@@ -18,7 +18,13 @@ if str(PROJECT_ROOT) not in sys.path:
 from backend.main import create_app
 from backend.database.db import SessionLocal, Base, engine
 import uuid
-from backend.database.models import User
+import datetime as dt
+from sqlalchemy import event
+from backend.database.models import User, Game, PlayerGame, Round
+from backend.app.room_cache import room_cache
+from backend.app.word_queue import word_queue
+from backend.app.frozen_cache import completed_rounds, past_games
+from backend.app.identity_cache import identity_cache
 
 @pytest.fixture(scope="session")
 def app():
@@ -48,6 +54,11 @@ def _clean_db_between_tests():
     """Hard-reset the schema before each test to avoid cross-test leakage."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    room_cache.clear()   # ids get reused after the reset
+    word_queue.clear()
+    completed_rounds.clear()
+    past_games.clear()
+    identity_cache.clear()
     yield
 
 
@@ -81,4 +92,67 @@ def login_session(client, db_session):
         def __exit__(self, exc_type, exc, tb):
             with client.session_transaction() as sess:
                 sess.clear()
-    return _LoginCtx()
\ No newline at end of file
+    return _LoginCtx()
+
+
+@pytest.fixture
+def login_as(client):
+    """Log the test client in as an existing User row."""
+    def _login(user):
+        with client.session_transaction() as sess:
+            sess["user_id"] = user.UserID
+            sess["username"] = user.Username
+    return _login
+
+
+@pytest.fixture
+def query_counter():
+    """`with query_counter() as qc: ...` counts (and keeps) SQL statements sent to the engine."""
+    class _Counter:
+        def __init__(self):
+            self.count = 0
+            self.statements = []
+            self.executions = []   # (statement, parameters)
+        def __call__(self, conn, cursor, statement, parameters, *args, **kwargs):
+            self.count += 1
+            self.statements.append(statement)
+            self.executions.append((statement, parameters))
+        def __enter__(self):
+            event.listen(engine, "before_cursor_execute", self)
+            return self
+        def __exit__(self, *exc):
+            event.remove(engine, "before_cursor_execute", self)
+    return _Counter
+
+
+@pytest.fixture
+def room(db_session):
+    """
+    An active game with a creator and two guessers: round 1 won by p1 (100 points),
+    round 2 waiting for its description. Returns (game_id, creator, p1, p2).
+    """
+    users = []
+    for name in ("creator", "p1", "p2"):
+        uname = f"{name}_{uuid.uuid4().hex[:6]}"
+        users.append(User(Username=uname, Email=f"{uname}@t.com", PasswordHash="x"))
+    db_session.add_all(users); db_session.commit()
+    creator, p1, p2 = users
+
+    g = Game(CreatorID=creator.UserID, GameCode=uuid.uuid4().hex[:8], MaxPlayers=5,
+             TotalRounds=3, Status="active", CurrentPlayersCount=3)
+    db_session.add(g); db_session.commit()
+    db_session.add_all([
+        PlayerGame(UserID=creator.UserID, GameID=g.GameID),
+        PlayerGame(UserID=p1.UserID, GameID=g.GameID, PlayerFinalScore=100),
+        PlayerGame(UserID=p2.UserID, GameID=g.GameID),
+    ])
+    now = dt.datetime.utcnow()
+    db_session.add_all([
+        Round(GameID=g.GameID, RoundNumber=1, TargetWord="apple", TargetWordNorm="apple",
+              Description="red fruit", ForbiddenWords=["red"], StartTime=now, EndTime=now,
+              RoundWinnerID=p1.UserID, Status="completed"),
+        Round(GameID=g.GameID, RoundNumber=2, TargetWord="pear", TargetWordNorm="pear",
+              ForbiddenWords=["green", "fruit"], StartTime=None, Status="waiting_description"),
+    ])
+    db_session.commit()
+    return g.GameID, creator, p1, p2
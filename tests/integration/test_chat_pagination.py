@@ -0,0 +1,69 @@
+import datetime as dt
+import pytest
+from backend.database.models import ChatMessage
+
+
+@pytest.fixture
+def chat(room, db_session):
+    """12 messages in the room, all with the same timestamp."""
+    game_id, _, p1, _ = room
+    ts = dt.datetime(2024, 1, 1, 12, 0, 0)
+    msgs = [ChatMessage(GameID=game_id, SenderID=p1.UserID, MessageText=f"m{i}",
+                        MessageType="general", Timestamp=ts) for i in range(12)]
+    db_session.add_all(msgs)
+    db_session.commit()
+    return game_id, [m.MessageID for m in msgs]
+
+
+def _page(client, game_id, **params):
+    r = client.get(f"/api/room/{game_id}/chat", query_string=params)
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def test_after_id_walks_forward_without_gaps_or_duplicates(client, room, login_as, chat):
+    game_id, ids = chat
+    login_as(room[2])
+
+    seen, cursor = [], None
+    while True:
+        body = _page(client, game_id, limit=5, **({"after_id": cursor} if cursor else {}))
+        seen += [m["id"] for m in body["messages"]]
+        cursor = body["next_cursor"]
+        if not body["has_more"]:
+            break
+    assert seen == ids
+    assert cursor == ids[-1]
+
+    # nothing new: empty page, cursor unchanged
+    body = _page(client, game_id, after_id=cursor)
+    assert body["messages"] == [] and body["next_cursor"] == cursor
+
+
+def test_before_id_returns_older_page_oldest_first(client, room, login_as, chat):
+    game_id, ids = chat
+    login_as(room[2])
+
+    body = _page(client, game_id, before_id=ids[8], limit=3)
+    assert [m["id"] for m in body["messages"]] == ids[5:8]
+    assert [m["text"] for m in body["messages"]] == ["m5", "m6", "m7"]
+    assert body["has_more"] is True
+    assert body["prev_cursor"] == ids[5]
+
+
+def test_chat_new_carries_message_id(app, client, room, login_as, db_session):
+    from backend.extensions import socketio
+    from backend.database.models import Round
+    game_id, _, _, p2 = room
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=2).one()
+    rnd.Description = "sweet"
+    db_session.commit()
+    login_as(p2)
+    sc = socketio.test_client(app, flask_test_client=client)
+    sc.emit("room:join", {"game_id": game_id})
+    sc.get_received()
+
+    client.put(f"/api/room/{game_id}/guess", json={"guess": "plum"})
+    pushed = [e["args"][0] for e in sc.get_received() if e["name"] == "chat:new"]
+    history = _page(client, game_id)["messages"]
+    assert pushed[0]["id"] == history[-1]["id"]
@@ -0,0 +1,76 @@
+"""
+Completed rounds of completed games (and my_past items) are served from the frozen caches
+with strong ETags; rounds that can still change are not.
+"""
+from backend.database.models import Game
+from backend.app.frozen_cache import completed_rounds, past_games, IMMUTABLE_CACHE_CONTROL
+
+
+def _finish_game(db, game_id):
+    db.query(Game).filter_by(GameID=game_id).update({"Status": "completed"})
+    db.commit()
+
+
+def test_completed_round_is_served_from_memory_with_strong_etag(client, room, login_as, query_counter, db_session):
+    game_id, _, p1, p2 = room
+    _finish_game(db_session, game_id)
+    db_session.refresh(p2)         # load before counting queries
+    login_as(p1)
+
+    first = client.get(f"/api/room/{game_id}/round/1")
+    assert first.status_code == 200
+    assert first.get_json()["winner"] == p1.Username
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert first.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+    with query_counter() as qc:
+        again = client.get(f"/api/room/{game_id}/round/1")
+        not_modified = client.get(f"/api/room/{game_id}/round/1", headers={"If-None-Match": etag})
+        login_as(p2)
+        other_member = client.get(f"/api/room/{game_id}/round/1")
+    assert qc.count == 0
+    assert again.data == first.data
+    assert not_modified.status_code == 304
+    assert other_member.data == first.data
+    assert completed_rounds.stats()["hits"] == 3
+
+
+def test_frozen_round_still_checks_membership(client, room, login_as, db_session):
+    game_id, creator, _, _ = room
+    _finish_game(db_session, game_id)
+    login_as(creator)
+    assert client.get(f"/api/room/{game_id}/round/1").status_code == 200
+
+    from backend.database.models import User
+    outsider = User(Username="outsider_rc", Email="outsider_rc@t.com", PasswordHash="x")
+    db_session.add(outsider); db_session.commit()
+    login_as(outsider)
+    assert client.get(f"/api/room/{game_id}/round/1").status_code == 403
+
+
+def test_rounds_of_running_games_are_not_frozen(client, room, login_as):
+    game_id, _, p1, _ = room          # round 1 completed, game still active: scores still move
+    login_as(p1)
+    r = client.get(f"/api/room/{game_id}/round/1")
+    assert r.status_code == 200
+    assert "ETag" not in r.headers
+    assert completed_rounds.stats()["items"] == 0
+
+
+def test_my_past_reuses_game_items_and_answers_304(client, room, login_as, query_counter, db_session):
+    game_id, _, p1, _ = room
+    _finish_game(db_session, game_id)
+    login_as(p1)
+
+    first = client.get("/api/games/my_past")
+    assert [g["game_id"] for g in first.get_json()["games"]] == [game_id]
+    assert past_games.stats()["items"] == 1
+
+    with query_counter() as qc:
+        again = client.get("/api/games/my_past")
+    assert again.data == first.data
+    assert not any(" IN (" in s for s in qc.statements)   # no players query for cached games
+
+    cached = client.get("/api/games/my_past", headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
@@ -0,0 +1,111 @@
+import time
+import datetime as dt
+import threading
+import pytest
+from backend.extensions import socketio
+from backend.app.routes import room_api
+from backend.app.background import tasks
+from backend.database.models import Round, PendingDescriptionCheck
+
+
+def _wait_idle(timeout=5.0):
+    deadline = time.time() + timeout
+    while tasks.stats()["in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert tasks.stats()["in_flight"] == 0
+
+
+def _phases(sc):
+    return [e["args"][0] for e in sc.get_received() if e["name"] == "round:ai_progress"]
+
+
+@pytest.fixture
+def creator_socket(app, client, room, login_as):
+    game_id, creator, _, _ = room
+    login_as(creator)
+    sc = socketio.test_client(app, flask_test_client=client)
+    sc.emit("room:join", {"game_id": game_id})
+    sc.get_received()
+    return game_id, sc
+
+
+def _description(db_session, game_id):
+    db_session.expire_all()
+    return db_session.query(Round.Description).filter_by(GameID=game_id, RoundNumber=2).scalar()
+
+
+def test_lexical_violation_lists_every_match(client, creator_socket):
+    game_id, _ = creator_socket
+    r = client.put(f"/api/room/{game_id}/description", json={"description": "A green fruit, like a pear"})
+    assert r.status_code == 400
+    body = r.get_json()
+    assert body["which"] == "pear"
+    assert body["violations"] == ["pear", "green", "fruit"]
+
+
+def test_async_mode_returns_202_and_delivers_desc_ok(client, creator_socket, db_session, monkeypatch):
+    game_id, sc = creator_socket
+    monkeypatch.setattr(room_api, "DESC_CHECK_MODE", "async")
+    monkeypatch.setattr(room_api, "_ai_check_description", lambda *a: {"ok": True})
+
+    r = client.put(f"/api/room/{game_id}/description", json={"description": "sweet and juicy"})
+    assert r.status_code == 202
+    assert r.get_json()["pending"] is True
+    _wait_idle()
+
+    assert _description(db_session, game_id) == "sweet and juicy"
+    assert [p["phase"] for p in _phases(sc)] == ["validating_desc", "desc_ok"]
+
+
+def test_async_mode_delivers_desc_bad(client, creator_socket, db_session, monkeypatch):
+    game_id, sc = creator_socket
+    monkeypatch.setattr(room_api, "DESC_CHECK_MODE", "async")
+    monkeypatch.setattr(room_api, "_ai_check_description",
+                        lambda *a: {"ok": False, "violated": ["pears"], "reason": "plural of target"})
+
+    r = client.put(f"/api/room/{game_id}/description", json={"description": "like pears"})
+    assert r.status_code == 202
+    _wait_idle()
+
+    assert _description(db_session, game_id) is None
+    bad = _phases(sc)[-1]
+    assert bad["phase"] == "desc_bad"
+    assert bad["reason"] == "plural of target"
+
+
+def test_async_mode_rejects_resubmission_while_pending(client, creator_socket, monkeypatch):
+    game_id, _ = creator_socket
+    release = threading.Event()
+
+    def slow_check(*a):
+        release.wait(5)
+        return {"ok": False, "reason": "nope"}
+
+    monkeypatch.setattr(room_api, "DESC_CHECK_MODE", "async")
+    monkeypatch.setattr(room_api, "_ai_check_description", slow_check)
+    try:
+        assert client.put(f"/api/room/{game_id}/description", json={"description": "one"}).status_code == 202
+        r = client.put(f"/api/room/{game_id}/description", json={"description": "two"})
+        assert r.status_code == 409
+        assert r.get_json()["error"] == "verification_pending"
+    finally:
+        release.set()
+        _wait_idle()
+
+
+@pytest.mark.parametrize("age, status", [(5, 409), (600, 202)])
+def test_async_mode_honours_markers_of_other_processes(client, creator_socket, db_session, monkeypatch,
+                                                       age, status):
+    game_id, _ = creator_socket
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=2).one()
+    db_session.add(PendingDescriptionCheck(RoundID=rnd.RoundID,
+                                           StartedAt=dt.datetime.utcnow() - dt.timedelta(seconds=age)))
+    db_session.commit()
+    monkeypatch.setattr(room_api, "DESC_CHECK_MODE", "async")
+    monkeypatch.setattr(room_api, "_ai_check_description", lambda *a: {"ok": True})
+
+    # a live marker (another process is verifying) blocks; one left by a dead process does not
+    assert client.put(f"/api/room/{game_id}/description", json={"description": "sweet and juicy"}).status_code == status
+    _wait_idle()
+    db_session.expire_all()
+    assert db_session.query(PendingDescriptionCheck).count() == (1 if status == 409 else 0)
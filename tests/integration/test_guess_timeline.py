@@ -0,0 +1,79 @@
+import datetime as dt
+from backend.database.models import Round, Guess, ChatMessage, SchemaMigration
+from backend.database.migrations import run_migrations
+
+
+def _describe(db_session, game_id):
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=2).one()
+    rnd.Description = "sweet and juicy"
+    db_session.commit()
+    return rnd
+
+
+def test_wrong_guess_is_a_single_chat_row(client, room, login_as, db_session):
+    game_id, _, _, p2 = room
+    _describe(db_session, game_id)
+    login_as(p2)
+
+    assert client.put(f"/api/room/{game_id}/guess", json={"guess": "plum"}).get_json()["correct"] is False
+
+    db_session.expire_all()
+    assert db_session.query(Guess).filter_by(GameID=game_id).count() == 0
+    msgs = db_session.query(ChatMessage).filter_by(GameID=game_id).all()
+    assert [(m.MessageType, m.MessageText, m.SenderID) for m in msgs] == [("guess", "plum", p2.UserID)]
+
+
+def test_winning_guess_keeps_scoring_record(client, room, login_as, db_session):
+    game_id, _, _, p2 = room
+    rnd = _describe(db_session, game_id)
+    login_as(p2)
+
+    client.put(f"/api/room/{game_id}/guess", json={"guess": "plum"})
+    assert client.put(f"/api/room/{game_id}/guess", json={"guess": "Pear"}).get_json()["correct"] is True
+
+    db_session.expire_all()
+    wins = db_session.query(Guess).filter_by(GameID=game_id).all()
+    assert [(w.RoundID, w.GuessText, w.IsCorrect, w.PointsAwarded) for w in wins] == [(rnd.RoundID, "Pear", True, 100)]
+
+    history = client.get(f"/api/room/{game_id}/chat").get_json()["messages"]
+    assert [(m["text"], m["type"]) for m in history] == [("plum", "guess"), ("Pear", "guess")]
+
+
+def test_backfill_copies_legacy_guesses_once(room, db_session):
+    game_id, _, p1, p2 = room
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+    t0 = dt.datetime(2024, 1, 1, 12, 0, 0)
+    db_session.add_all([
+        Guess(GameID=game_id, RoundID=rnd.RoundID, GuesserID=p2.UserID, GuessText="cherry",
+              GuessTime=t0, ResponseTimeSeconds=3.0),
+        Guess(GameID=game_id, RoundID=rnd.RoundID, GuesserID=p1.UserID, GuessText="apple",
+              GuessTime=t0 + dt.timedelta(seconds=5), ResponseTimeSeconds=8.0, IsCorrect=True),
+    ])
+    db_session.commit()
+
+    assert "0001_backfill_guess_chat" in run_migrations()
+    assert run_migrations() == []
+
+    db_session.expire_all()
+    msgs = db_session.query(ChatMessage).filter_by(GameID=game_id).order_by(ChatMessage.MessageID).all()
+    assert [(m.MessageText, m.SenderID, m.MessageType, m.Timestamp) for m in msgs] == [
+        ("cherry", p2.UserID, "guess", t0),
+        ("apple", p1.UserID, "guess", t0 + dt.timedelta(seconds=5)),
+    ]
+    assert db_session.get(SchemaMigration, "0001_backfill_guess_chat") is not None
+
+
+def test_backfill_skips_games_already_on_chat(room, db_session):
+    game_id, _, _, p2 = room
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+    db_session.add_all([
+        Guess(GameID=game_id, RoundID=rnd.RoundID, GuesserID=p2.UserID, GuessText="cherry",
+              ResponseTimeSeconds=3.0),
+        ChatMessage(GameID=game_id, RoundID=rnd.RoundID, SenderID=p2.UserID, MessageText="cherry",
+                    MessageType="guess"),
+    ])
+    db_session.commit()
+
+    run_migrations()
+    db_session.expire_all()
+    assert db_session.query(ChatMessage).filter_by(GameID=game_id).count() == 1
@@ -0,0 +1,80 @@
+import uuid
+from backend.app.identity_cache import IdentityCache, identity_cache
+from backend.database.models import User
+
+
+def _pg_lookups(qc):
+    return [s for s in qc.statements if 'FROM "PlayerGame"' in s and '"ChatMessage"' not in s]
+
+
+def test_member_and_username_are_looked_up_once(room, db_session, query_counter):
+    game_id, _, p1, _ = room
+    cache = IdentityCache(ttl=60)
+    uid = p1.UserID
+
+    with query_counter() as qc:
+        assert cache.is_member(db_session, uid, game_id)
+        assert cache.username(db_session, uid) == p1.Username
+        assert cache.is_member(db_session, uid, game_id)
+        assert cache.username(db_session, uid) == p1.Username
+    assert qc.count == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_non_members_are_not_cached_across_requests(room, db_session, query_counter):
+    game_id, _, _, _ = room
+    cache = IdentityCache(ttl=60)
+    outsider = User(Username=f"o_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    db_session.add(outsider); db_session.commit()
+    uid = outsider.UserID
+
+    with query_counter() as qc:
+        assert not cache.is_member(db_session, uid, game_id)
+        assert not cache.is_member(db_session, uid, game_id)
+    assert qc.count == 2          # outside a request nothing holds negative answers
+
+
+def test_expiry_and_game_invalidation(room, db_session, query_counter):
+    game_id, _, p1, _ = room
+    uid = p1.UserID
+    cache = IdentityCache(ttl=0)                 # every entry is stale right away
+    cache.is_member(db_session, uid, game_id)
+    with query_counter() as qc:
+        cache.is_member(db_session, uid, game_id)
+    assert qc.count == 1
+
+    cache = IdentityCache(ttl=60)
+    cache.member_joined(uid, game_id)
+    cache.invalidate_game(game_id)
+    with query_counter() as qc:
+        assert cache.is_member(db_session, uid, game_id)
+    assert qc.count == 1
+
+
+def test_room_requests_skip_membership_and_name_queries(client, room, login_as, query_counter, db_session):
+    game_id, _, p1, _ = room
+    login_as(p1)
+    assert client.get(f"/api/room/{game_id}/chat").status_code == 200
+    client.put(f"/api/room/{game_id}/guess", json={"guess": "nope"})
+
+    with query_counter() as qc:
+        assert client.get(f"/api/room/{game_id}/chat").status_code == 200
+    assert not _pg_lookups(qc)
+
+    with query_counter() as qc:
+        client.put(f"/api/room/{game_id}/guess", json={"guess": "still nope"})
+    assert not any('"User"."Username"' in s and '"ChatMessage"' not in s for s in qc.statements)
+
+
+def test_join_writes_membership_through(client, db_session, login_as, query_counter):
+    creator = User(Username=f"c_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    joiner = User(Username=f"j_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    db_session.add_all([creator, joiner]); db_session.commit()
+    login_as(creator)
+    code = client.post("/api/games", json={"max_players": 4}).get_json()["game_code"]
+    login_as(joiner)
+    game_id = client.post("/api/games/join_by_code", json={"game_code": code}).get_json()["game_id"]
+
+    with query_counter() as qc:
+        assert identity_cache.is_member(db_session, joiner.UserID, game_id)
+    assert qc.count == 0
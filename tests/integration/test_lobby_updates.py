@@ -0,0 +1,100 @@
+"""
+Menu lobby: `lobby:update` pushes on join / start, and ETag'd GET /lobby answering 304
+without a DB round-trip while nothing changed.
+"""
+import uuid
+import pytest
+from backend.extensions import socketio
+from backend.app.routes import games
+from backend.database.models import User, Game, PlayerGame, Round
+
+
+def _user(db):
+    name = f"u_{uuid.uuid4().hex[:8]}"
+    u = User(Username=name, Email=f"{name}@t.com", PasswordHash="x")
+    db.add(u); db.commit()
+    return u
+
+
+@pytest.fixture
+def lobby_game(db_session):
+    """A waiting public game with only its creator. Returns (game, creator)."""
+    creator = _user(db_session)
+    g = Game(CreatorID=creator.UserID, GameCode=uuid.uuid4().hex[:6].upper(), MaxPlayers=4,
+             TotalRounds=3, Status="waiting", CurrentPlayersCount=1)
+    db_session.add(g); db_session.commit()
+    db_session.add(PlayerGame(UserID=creator.UserID, GameID=g.GameID)); db_session.commit()
+    return g, creator
+
+
+def _updates(sc):
+    return [e["args"][0] for e in sc.get_received() if e["name"] == "lobby:update"]
+
+
+def test_lobby_is_304_without_queries_until_it_changes(client, lobby_game, login_as, query_counter, db_session):
+    g, creator = lobby_game
+    login_as(creator)
+    first = client.get(f"/api/games/{g.GameID}/lobby")
+    assert first.status_code == 200
+    assert first.get_json()["players"] == [creator.Username]
+    etag = first.headers["ETag"]
+
+    with query_counter() as qc:
+        again = client.get(f"/api/games/{g.GameID}/lobby", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert qc.count == 0
+
+    joiner = _user(db_session)
+    login_as(joiner)
+    assert client.post("/api/games/join_by_code", json={"game_code": g.GameCode}).status_code == 200
+
+    changed = client.get(f"/api/games/{g.GameID}/lobby", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["players"] == [creator.Username, joiner.Username]
+
+
+def test_join_and_start_push_lobby_updates(app, client, lobby_game, login_as, db_session):
+    g, creator = lobby_game
+    login_as(creator)
+    sc = socketio.test_client(app, flask_test_client=client)
+    ack = sc.emit("lobby:join", {"game_id": g.GameID}, callback=True)
+    assert ack["status"] == "waiting" and ack["players"] == [creator.Username]
+    sc.get_received()
+
+    joiner = _user(db_session)
+    login_as(joiner)
+    client.post("/api/games/join_by_code", json={"game_code": g.GameCode})
+    (msg,) = _updates(sc)
+    assert msg["gameId"] == g.GameID
+    assert msg["players"] == [creator.Username, joiner.Username]
+    assert msg["version"] > ack["version"]
+
+    login_as(creator)
+    assert client.post(f"/api/games/{g.GameID}/start").status_code == 200
+    (msg,) = _updates(sc)
+    assert msg["status"] == "active"
+
+
+def test_lobby_join_requires_membership(app, client, lobby_game, login_as, db_session):
+    g, _ = lobby_game
+    login_as(_user(db_session))
+    sc = socketio.test_client(app, flask_test_client=client)
+    assert sc.emit("lobby:join", {"game_id": g.GameID}, callback=True) == {"error": "not_in_game"}
+
+
+def test_start_rechecks_status_after_generating_words(client, lobby_game, login_as, db_session, monkeypatch):
+    g, creator = lobby_game
+
+    def words_while_another_start_wins():
+        # the other request commits its start during our AI call
+        db_session.query(Game).filter_by(GameID=g.GameID).update({Game.Status: "active"})
+        db_session.commit()
+        return "tree", ["leaf"]
+
+    monkeypatch.setattr(games, "_gen_words", words_while_another_start_wins)
+    login_as(creator)
+    r = client.post(f"/api/games/{g.GameID}/start")
+    assert r.status_code == 400 and r.get_json()["error"] == "bad_status"
+    assert db_session.query(Round).filter_by(GameID=g.GameID).count() == 0
@@ -0,0 +1,143 @@
+"""
+join_random / join_by_code seat claims: fullest lobby first, never past MaxPlayers,
+also with many joiners at once (own SQLite file, one connection per joiner).
+"""
+import threading
+import uuid
+import pytest
+from sqlalchemy.orm import sessionmaker
+from backend.database.db import Base, make_engine, engine
+from backend.database.models import User, Game, PlayerGame
+from backend.app.matchmaking import find_and_claim
+
+JOINERS = 60
+
+
+def _user(db, name=None):
+    name = name or f"u_{uuid.uuid4().hex[:8]}"
+    u = User(Username=name, Email=f"{name}@t.com", PasswordHash="x")
+    db.add(u); db.flush()
+    return u
+
+
+def _lobby(db, creator, players, max_players, private=False, status="waiting"):
+    g = Game(CreatorID=creator.UserID, GameCode=uuid.uuid4().hex[:8].upper(), MaxPlayers=max_players,
+             TotalRounds=3, Status=status, IsPrivate=private, CurrentPlayersCount=players)
+    db.add(g); db.flush()
+    return g
+
+
+def test_join_random_prefers_the_fullest_lobby(client, db_session, login_as):
+    creator = _user(db_session)
+    roomy = _lobby(db_session, creator, players=1, max_players=6)
+    nearly = _lobby(db_session, creator, players=4, max_players=5)
+    _lobby(db_session, creator, players=5, max_players=5)                 # full
+    _lobby(db_session, creator, players=4, max_players=5, private=True)
+    _lobby(db_session, creator, players=4, max_players=5, status="active")
+    joiner = _user(db_session)
+    db_session.commit()
+
+    login_as(joiner)
+    body = client.post("/api/games/join_random").get_json()
+    assert body["game_id"] == nearly.GameID
+
+    db_session.expire_all()
+    assert db_session.get(Game, nearly.GameID).CurrentPlayersCount == 5
+    assert db_session.query(PlayerGame).filter_by(UserID=joiner.UserID).count() == 1
+
+    # the nearly-full room is full now: the next joiner gets the roomy one
+    other = _user(db_session); db_session.commit()
+    login_as(other)
+    assert client.post("/api/games/join_random").get_json()["game_id"] == roomy.GameID
+
+
+def test_join_random_skips_lobbies_the_player_is_in(client, db_session, login_as):
+    creator = _user(db_session)
+    mine = _lobby(db_session, creator, players=3, max_players=4)
+    db_session.add(PlayerGame(UserID=creator.UserID, GameID=mine.GameID))
+    db_session.commit()
+
+    login_as(creator)
+    assert client.post("/api/games/join_random").status_code == 404
+
+    other = _lobby(db_session, _user(db_session), players=1, max_players=4)
+    db_session.commit()
+    assert client.post("/api/games/join_random").get_json()["game_id"] == other.GameID
+    db_session.expire_all()
+    assert db_session.get(Game, mine.GameID).CurrentPlayersCount == 3
+
+
+def test_join_by_code_refuses_a_full_room(client, db_session, login_as):
+    creator = _user(db_session)
+    g = _lobby(db_session, creator, players=2, max_players=2)
+    joiner = _user(db_session); db_session.commit()
+    login_as(joiner)
+    r = client.post("/api/games/join_by_code", json={"game_code": g.GameCode})
+    assert r.status_code == 409 and r.get_json()["error"] == "room_full"
+
+
+def test_lobby_pick_is_an_index_seek(db_session, query_counter):
+    creator = _user(db_session)
+    for n in range(1, 5):
+        _lobby(db_session, creator, players=n, max_players=5)
+    joiner = _user(db_session)
+    db_session.commit()
+
+    with query_counter() as qc:
+        gid = find_and_claim(db_session, joiner.UserID)
+    db_session.rollback()
+    assert gid and db_session.get(Game, gid).CurrentPlayersCount == 4   # the fullest one
+
+    claim = next((s, p) for s, p in qc.executions if s.lstrip().upper().startswith("UPDATE"))
+    with engine.connect() as conn:
+        plan = [r[-1] for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + claim[0], claim[1])]
+    assert any("ix_Game_Lobby_FreeSlots" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan    # no sort step
+
+
+@pytest.fixture
+def crowd(tmp_path):
+    eng = make_engine(f"sqlite:///{tmp_path}/lobby.db", pool_size=JOINERS, max_overflow=5)
+    Base.metadata.create_all(eng)
+    Session = sessionmaker(bind=eng, autoflush=False, future=True)
+    with Session() as db:
+        creator = _user(db, "creator")
+        lobbies = [_lobby(db, creator, players=1, max_players=m) for m in (3, 4, 5, 10)]   # 18 seats
+        uids = [_user(db, f"j{i}").UserID for i in range(JOINERS)]
+        db.commit()
+        ids = [g.GameID for g in lobbies]
+    yield Session, ids, uids
+    eng.dispose()
+
+
+def test_concurrent_joiners_never_overfill(crowd):
+    Session, game_ids, uids = crowd
+    start = threading.Barrier(len(uids))
+    seated, errors = [], []
+
+    def join(uid):
+        with Session() as db:
+            try:
+                start.wait()
+                gid = find_and_claim(db, uid)
+                if gid is not None:
+                    db.add(PlayerGame(UserID=uid, GameID=gid))
+                db.commit()
+                if gid is not None:
+                    seated.append(gid)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=join, args=(uid,)) for uid in uids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(seated) == 18
+    with Session() as db:
+        for gid in game_ids:
+            g = db.get(Game, gid)
+            assert g.CurrentPlayersCount == g.MaxPlayers
+            assert db.query(PlayerGame).filter_by(GameID=gid).count() == g.MaxPlayers - 1
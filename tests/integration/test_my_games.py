@@ -0,0 +1,94 @@
+import datetime as dt
+import uuid
+import pytest
+from backend.database.models import User, Game, PlayerGame, Round
+
+
+def _user(db, name):
+    u = User(Username=f"{name}_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:8]}@t.com", PasswordHash="x")
+    db.add(u); db.commit()
+    return u
+
+
+def _seed(db, me, other, n_active, n_past):
+    """`n_active` running games and `n_past` completed ones, each with `me` and `other`."""
+    base = dt.datetime(2024, 1, 1)
+    for i in range(n_active + n_past):
+        past = i >= n_active
+        g = Game(CreatorID=other.UserID, GameCode=uuid.uuid4().hex[:8], MaxPlayers=4, TotalRounds=3,
+                 Status="completed" if past else "active", CurrentPlayersCount=2,
+                 CreatedAt=base + dt.timedelta(minutes=i), StartedAt=base + dt.timedelta(minutes=i),
+                 EndedAt=base + dt.timedelta(minutes=i, seconds=90) if past else None,
+                 WinnerID=me.UserID if past and i % 2 else None)
+        db.add(g); db.flush()
+        db.add_all([PlayerGame(UserID=other.UserID, GameID=g.GameID),
+                    PlayerGame(UserID=me.UserID, GameID=g.GameID)])
+        db.add(Round(GameID=g.GameID, RoundNumber=1, TargetWord="tree", ForbiddenWords=[],
+                     Status="completed"))
+    db.commit()
+
+
+@pytest.fixture
+def players(db_session):
+    return _user(db_session, "me"), _user(db_session, "other")
+
+
+@pytest.mark.parametrize("history", [3, 40])
+def test_query_count_does_not_grow_with_history(client, db_session, login_as, query_counter, players, history):
+    me, other = players
+    _seed(db_session, me, other, history, history)
+    login_as(me)
+
+    with query_counter() as qc_active:
+        r = client.get("/api/games/my_active")
+    assert r.status_code == 200 and len(r.get_json()) == history
+
+    with query_counter() as qc_past:
+        r = client.get("/api/games/my_past")
+    assert r.status_code == 200 and len(r.get_json()["games"]) == history
+
+    # page of games + one grouped/IN query (+ session user lookups, never per game)
+    assert qc_active.count <= 3, qc_active.statements
+    assert qc_past.count <= 3, qc_past.statements
+
+
+def test_my_active_pages_by_cursor_header(client, db_session, login_as, players):
+    me, other = players
+    _seed(db_session, me, other, 7, 0)
+    login_as(me)
+
+    seen, cursor = [], None
+    while True:
+        r = client.get("/api/games/my_active", query_string={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        seen += [g["id"] for g in r.get_json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 7
+    assert seen == sorted(seen, reverse=True)
+
+    g = r.get_json()[-1]
+    assert g["currentRound"] == 2 and g["totalRounds"] == 3 and g["players"] == 2
+
+
+def test_my_past_pages_newest_first_with_players_and_winner(client, db_session, login_as, players):
+    me, other = players
+    _seed(db_session, me, other, 0, 5)
+    login_as(me)
+
+    games, cursor = [], None
+    while True:
+        body = client.get("/api/games/my_past", query_string={"limit": 2, **({"cursor": cursor} if cursor else {})}).get_json()
+        games += body["games"]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert len(games) == 5
+    ended = [g["ended_at"] for g in games]
+    assert ended == sorted(ended, reverse=True)
+
+    for g in games:
+        assert g["players"] == [other.Username, me.Username]
+        assert g["players_count"] == 2 and g["duration_sec"] == 90
+        assert g["winner"] in (me.Username, "None")
+    assert {g["winner"] for g in games} == {me.Username, "None"}
@@ -0,0 +1,71 @@
+"""
+Query-plan regression tests: every SELECT issued by the hot endpoints must reach
+its rows through an index. A plain `SCAN <table>` step (full table scan) fails.
+"""
+import re
+import pytest
+from backend.database.db import engine
+from backend.database.models import Round, Guess
+
+# `SCAN <table>` without `USING ... INDEX` (SQLite >= 3.36 wording; older says `SCAN TABLE`)
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?"?(\w+)"?(?: AS \w+)?$')
+
+
+def _full_scans(statement, params):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all()
+    return [m.group(1) for m in (FULL_SCAN.match(r[-1]) for r in rows) if m]
+
+
+def _assert_indexed(qc):
+    selects = [(s, p) for s, p in qc.executions if s.lstrip().upper().startswith("SELECT")]
+    assert selects, "endpoint issued no SELECT"
+    bad = {s: scans for s, p in selects if (scans := _full_scans(s, p))}
+    assert not bad, "full table scans:\n" + "\n\n".join(f"{t} <- {s}" for s, t in bad.items())
+
+
+@pytest.fixture
+def played_room(room, db_session):
+    game_id, _, p1, _ = room
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+    db_session.add(Guess(GameID=game_id, RoundID=rnd.RoundID, GuesserID=p1.UserID,
+                         GuessText="apple", ResponseTimeSeconds=4.0, IsCorrect=True))
+    db_session.commit()
+    return room
+
+
+@pytest.mark.parametrize("path", [
+    "/api/room/{gid}",
+    "/api/room/{gid}/round/1",
+    "/api/room/{gid}/chat",
+    "/api/room/{gid}/chat?round=current",
+    "/api/room/{gid}/chat?after_id=1",
+    "/api/room/{gid}/chat?before_id=100",
+    "/api/room/{gid}/chat?since=2024-01-01T00:00:00Z",
+    "/api/profile/summary",
+    "/api/games/my_past",
+    "/api/games/my_past?cursor=2024-01-01T00:00:00_5",
+    "/api/games/my_active",
+    "/api/games/my_active?cursor=5",
+])
+def test_read_endpoints_use_indexes(client, played_room, login_as, query_counter, path):
+    game_id, _, p1, _ = played_room
+    login_as(p1)
+    with query_counter() as qc:
+        r = client.get(path.format(gid=game_id))
+    assert r.status_code == 200
+    _assert_indexed(qc)
+
+
+def test_join_random_uses_lobby_index(client, played_room, login_as, query_counter, db_session):
+    from backend.database.models import Game, User
+    u = User(Username="joiner", Email="joiner@t.com", PasswordHash="x")
+    db_session.add(u)
+    db_session.add(Game(CreatorID=played_room[1].UserID, GameCode="LOBBY001", MaxPlayers=4,
+                        TotalRounds=3, Status="waiting", IsPrivate=False))
+    db_session.commit()
+    login_as(u)
+    with query_counter() as qc:
+        r = client.post("/api/games/join_random")
+    assert r.status_code == 200
+    _assert_indexed(qc)
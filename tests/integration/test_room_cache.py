@@ -0,0 +1,61 @@
+import uuid
+from backend.app.room_cache import RoomStateCache, room_cache
+from backend.database.models import User, Game, PlayerGame
+
+
+def test_unchanged_room_polls_skip_the_db(client, room, login_as, query_counter):
+    game_id, _, p1, _ = room
+    login_as(p1)
+    first = client.get(f"/api/room/{game_id}").get_json()
+
+    with query_counter() as qc:
+        again = client.get(f"/api/room/{game_id}").get_json()
+    assert qc.count == 0
+    assert again == first
+    assert room_cache.stats()["hits"] >= 1
+
+
+def test_join_by_code_invalidates_and_bumps_version(client, db_session, login_as):
+    creator = User(Username=f"c_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    joiner = User(Username=f"j_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    db_session.add_all([creator, joiner]); db_session.commit()
+    g = Game(CreatorID=creator.UserID, GameCode="JOIN01", MaxPlayers=5, TotalRounds=2)
+    db_session.add(g); db_session.commit()
+    db_session.add(PlayerGame(UserID=creator.UserID, GameID=g.GameID)); db_session.commit()
+
+    assert room_cache.snapshot(g.GameID).players == (creator.Username,)
+    v1 = room_cache.version(g.GameID)
+
+    login_as(joiner)
+    r = client.post("/api/games/join_by_code", json={"game_code": "JOIN01"})
+    assert r.status_code == 200
+
+    assert room_cache.version(g.GameID) > v1
+    assert room_cache.snapshot(g.GameID).players == (creator.Username, joiner.Username)
+
+
+def test_lru_evicts_idle_games_and_versions_stay_monotonic(room):
+    game_id = room[0]
+    cache = RoomStateCache(max_games=2)
+    assert cache.snapshot(game_id) is not None
+    v1 = cache.version(game_id)
+
+    cache.version(10_001)
+    cache.version(10_002)           # pushes `game_id` out
+    stats = cache.stats()
+    assert stats["games"] == 2
+    assert stats["evictions"] == 1
+
+    assert cache.snapshot(game_id) is not None   # reloaded after eviction
+    assert cache.version(game_id) > v1
+    assert cache.stats()["misses"] == 2
+
+
+def test_unknown_games_do_not_take_cache_slots(client, room, login_as):
+    game_id, _, p1, _ = room
+    login_as(p1)
+    assert client.get(f"/api/room/{game_id}").status_code == 200
+    for probe in range(50_000, 50_040):
+        assert client.get(f"/api/games/{probe}/lobby").status_code == 404
+    assert room_cache.stats()["games"] == 1
+    assert room_cache.stats()["evictions"] == 0
@@ -0,0 +1,61 @@
+import uuid
+import pytest
+from backend.extensions import socketio
+from backend.database.models import User
+
+
+@pytest.fixture
+def sock(app, client):
+    """Socket.IO test client sharing the Flask test client's session cookie."""
+    def _connect():
+        return socketio.test_client(app, flask_test_client=client)
+    return _connect
+
+
+def _events(sc, name):
+    return [e["args"][0] for e in sc.get_received() if e["name"] == name]
+
+
+def test_room_state_delta_is_pushed_on_join(client, sock, room, login_as, db_session):
+    game_id, creator, p1, _ = room
+    login_as(p1)
+    sc = sock()
+    sc.emit("room:join", {"game_id": game_id})
+    synced = sc.emit("room:sync", {"game_id": game_id, "version": None}, callback=True)
+    assert synced["id"] == game_id
+    sc.get_received()
+
+    # a state change committed elsewhere is pushed as a delta against the synced version
+    from backend.app.room_events import publish_room_state
+    db_session.query(User).filter_by(UserID=p1.UserID).update({"Username": "renamed_p1"})
+    db_session.commit()
+    publish_room_state(game_id)
+
+    (msg,) = _events(sc, "room:state")
+    assert msg["baseVersion"] == synced["version"]
+    assert msg["version"] > synced["version"]
+    assert set(msg["delta"]) == {"scores", "players"}
+    assert "renamed_p1" in msg["delta"]["players"]
+
+
+def test_room_sync_only_sends_full_state_when_stale(client, sock, room, login_as):
+    game_id, _, p1, _ = room
+    login_as(p1)
+    sc = sock()
+
+    full = sc.emit("room:sync", {"game_id": game_id, "version": None}, callback=True)
+    assert full["players"] and full["version"]
+
+    same = sc.emit("room:sync", {"game_id": game_id, "version": full["version"]}, callback=True)
+    assert same == {"upToDate": True, "version": full["version"]}
+
+    # the HTTP snapshot carries the same version
+    assert client.get(f"/api/room/{game_id}").get_json()["version"] == full["version"]
+
+
+def test_room_sync_rejects_non_members(client, sock, room, login_as, db_session):
+    outsider = User(Username=f"o_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    db_session.add(outsider); db_session.commit()
+    login_as(outsider)
+    sc = sock()
+    assert sc.emit("room:sync", {"game_id": room[0], "version": None}, callback=True) == {"error": "not_in_game"}
@@ -0,0 +1,61 @@
+import uuid
+from backend.database.models import User
+
+
+def test_get_room_uses_fixed_number_of_queries(client, room, login_as, query_counter):
+    game_id, creator, p1, _ = room
+    login_as(p1)
+    with query_counter() as qc:
+        r = client.get(f"/api/room/{game_id}")
+    assert r.status_code == 200
+    assert qc.count <= 2
+
+    body = r.get_json()
+    assert body["roundNumber"] == 2
+    assert body["status"] == "waiting_description"
+    assert body["turn"] == creator.Username
+    assert body["scores"][p1.Username] == 100
+    assert len(body["players"]) == 3
+    assert "targetWord" not in body
+
+
+def test_get_room_round_uses_fixed_number_of_queries(client, room, login_as, query_counter):
+    game_id, _, p1, p2 = room
+    login_as(p2)
+    with query_counter() as qc:
+        r = client.get(f"/api/room/{game_id}/round/1")
+    assert r.status_code == 200
+    assert qc.count <= 2
+
+    body = r.get_json()
+    assert body["status"] == "completed"
+    assert body["winner"] == p1.Username
+    assert body["description"] == "red fruit"
+    assert body["startedAt"].endswith("Z")
+
+
+def test_creator_sees_secret_words_until_described(client, room, login_as):
+    game_id, creator, _, _ = room
+    login_as(creator)
+    body = client.get(f"/api/room/{game_id}").get_json()
+    assert body["targetWord"] == "pear"
+    assert body["forbiddenWords"] == ["green", "fruit"]
+
+    done = client.get(f"/api/room/{game_id}/round/1").get_json()
+    assert "targetWord" not in done
+
+
+def test_room_snapshot_denies_non_members(client, room, login_as, db_session):
+    game_id = room[0]
+    outsider = User(Username=f"out_{uuid.uuid4().hex[:6]}", Email=f"{uuid.uuid4().hex[:6]}@t.com", PasswordHash="x")
+    db_session.add(outsider); db_session.commit()
+    login_as(outsider)
+    assert client.get(f"/api/room/{game_id}").status_code == 403
+    assert client.get(f"/api/room/{game_id}/round/1").status_code == 403
+    assert client.get("/api/room/999999").status_code == 403
+
+
+def test_missing_round_is_404_for_members(client, room, login_as):
+    game_id, _, p1, _ = room
+    login_as(p1)
+    assert client.get(f"/api/room/{game_id}/round/9").status_code == 404
@@ -0,0 +1,73 @@
+"""
+Hundreds of simultaneous correct guesses on one round: exactly one must win.
+
+Runs the shared finalization service on its own SQLite file (WAL engine from
+make_engine) so every guesser has a real connection and transaction.
+"""
+import threading
+import datetime as dt
+import pytest
+from sqlalchemy.orm import sessionmaker
+from backend.database.db import Base, make_engine
+from backend.database.models import User, Game, PlayerGame, Round, Guess
+from backend.app.rounds import finish_round
+from backend.app import word_queue as wq
+
+GUESSERS = 200
+
+
+@pytest.fixture
+def race(tmp_path, monkeypatch):
+    monkeypatch.setattr(wq, "request_word_set", lambda: ("plum", ["purple"]))
+    eng = make_engine(f"sqlite:///{tmp_path}/race.db", pool_size=GUESSERS, max_overflow=5)
+    Base.metadata.create_all(eng)
+    Session = sessionmaker(bind=eng, autoflush=False, future=True)
+    with Session() as db:
+        users = [User(Username=f"u{i}", Email=f"u{i}@race", PasswordHash="x") for i in range(GUESSERS + 1)]
+        db.add_all(users); db.flush()
+        game = Game(CreatorID=users[0].UserID, GameCode="RACE0001", MaxPlayers=10,
+                    TotalRounds=3, Status="active")
+        db.add(game); db.flush()
+        db.add_all([PlayerGame(UserID=u.UserID, GameID=game.GameID) for u in users])
+        db.add(Round(GameID=game.GameID, RoundNumber=1, TargetWord="pear", Description="fruit",
+                     ForbiddenWords=[], StartTime=dt.datetime.utcnow(), Status="active"))
+        db.commit()
+        game_id, uids = game.GameID, [u.UserID for u in users[1:]]
+    yield Session, game_id, uids
+    eng.dispose()
+
+
+def test_simultaneous_correct_guesses_have_one_winner(race):
+    Session, game_id, uids = race
+    start = threading.Barrier(len(uids))
+    wins, errors = [], []
+
+    def guess(uid):
+        with Session() as db:
+            try:
+                game = db.get(Game, game_id)
+                rnd = db.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+                start.wait()
+                win = finish_round(db, game, rnd, uid, "pear", dt.datetime.utcnow())
+                db.commit()
+                if win:
+                    wins.append(uid)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=guess, args=(uid,)) for uid in uids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(wins) == 1
+    with Session() as db:
+        rnd1 = db.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+        assert rnd1.RoundWinnerID == wins[0]
+        assert db.query(Guess).filter_by(GameID=game_id).count() == 1
+        assert db.query(Round).filter_by(GameID=game_id).count() == 2
+        scores = {pg.UserID: pg.PlayerFinalScore for pg in db.query(PlayerGame).filter_by(GameID=game_id)}
+        assert sorted(v for v in scores.values() if v) == [100]
+        assert db.get(Game, game_id).CurrentLeaderID == wins[0]
@@ -0,0 +1,102 @@
+from backend.database.models import Game, PlayerGame, Round
+
+
+def _describe_latest(db_session, game_id, text="a hint"):
+    rnd = (db_session.query(Round).filter_by(GameID=game_id)
+           .order_by(Round.RoundNumber.desc()).first())
+    rnd.Description = text
+    db_session.commit()
+    return rnd.TargetWord
+
+
+def _guess(client, game_id, word):
+    r = client.put(f"/api/room/{game_id}/guess", json={"guess": word})
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def test_leader_and_final_winner_follow_the_scores(client, room, login_as, db_session, query_counter):
+    game_id, _, p1, p2 = room
+    login_as(p2)
+
+    # round 2: p2 ties p1 at 100, p1 keeps the lead (lower UserID)
+    with query_counter() as qc:
+        body = _guess(client, game_id, _describe_latest(db_session, game_id))
+    assert body["correct"] is True and body["gameCompleted"] is False
+    db_session.expire_all()
+    assert db_session.get(Game, game_id).CurrentLeaderID == p1.UserID
+    leader_scans = [s for s in qc.statements if "ORDER BY \"PlayerGame\".\"PlayerFinalScore\"" in s]
+    assert len(leader_scans) == 1
+
+    # round 3 (last): p2 takes the lead and the game
+    body = _guess(client, game_id, _describe_latest(db_session, game_id))
+    assert body["gameCompleted"] is True
+
+    db_session.expire_all()
+    game = db_session.get(Game, game_id)
+    assert game.CurrentLeaderID == p2.UserID
+    assert game.WinnerID == p2.UserID
+    rows = {pg.UserID: pg for pg in db_session.query(PlayerGame).filter_by(GameID=game_id)}
+    assert rows[p2.UserID].PlayerFinalScore == 200
+    assert rows[p2.UserID].TimesAsLeader == 1
+    assert [uid for uid, pg in rows.items() if pg.HasWon] == [p2.UserID]
+
+
+def test_winner_counts_scores_awarded_elsewhere(client, room, login_as, db_session):
+    """Scores written by another worker (or rolled back here) are never shadowed by local state."""
+    game_id, _, p1, p2 = room
+    login_as(p1)
+    _guess(client, game_id, _describe_latest(db_session, game_id))       # round 2: p1 -> 200
+
+    # p2 scores 300 through another process
+    db_session.query(PlayerGame).filter_by(GameID=game_id, UserID=p2.UserID).update(
+        {PlayerGame.PlayerFinalScore: 300})
+    db_session.commit()
+
+    body = _guess(client, game_id, _describe_latest(db_session, game_id))  # last round: p1 -> 300
+    assert body["gameCompleted"] is True
+    db_session.expire_all()
+    game = db_session.get(Game, game_id)
+    assert game.WinnerID == p1.UserID            # 300 vs 300: tie goes to the lower UserID
+    assert game.CurrentLeaderID == p1.UserID
+
+
+def test_rolled_back_award_does_not_stick(client, room, login_as, db_session, monkeypatch):
+    from backend.app import rounds
+    game_id, _, p1, p2 = room
+    word = _describe_latest(db_session, game_id)
+    login_as(p2)
+
+    def boom(*a, **kw):
+        raise RuntimeError("commit-time failure")
+    monkeypatch.setattr(rounds, "record_win", boom)
+    r = client.put(f"/api/room/{game_id}/guess", json={"guess": word})
+    assert r.get_json()["error"] == "guess_failed"          # p2's win was rolled back
+    monkeypatch.undo()
+
+    login_as(p1)
+    _guess(client, game_id, word)                # p1 wins round 2 for real: 200 vs 0
+    db_session.expire_all()
+    assert db_session.get(Game, game_id).CurrentLeaderID == p1.UserID
+    rows = {pg.UserID: pg.PlayerFinalScore for pg in db_session.query(PlayerGame).filter_by(GameID=game_id)}
+    assert rows[p2.UserID] == 0 and rows[p1.UserID] == 200
+
+
+def test_socket_guess_uses_the_same_finalization(app, client, room, login_as, db_session):
+    from backend.extensions import socketio
+    game_id, creator, p1, p2 = room
+    word = _describe_latest(db_session, game_id)
+    login_as(p2)
+    sc = socketio.test_client(app, flask_test_client=client)
+    sc.emit("room:join", {"game_id": game_id})
+    sc.get_received()
+
+    sc.emit("chat:send", {"game_id": game_id, "text": word})
+    sc.emit("chat:send", {"game_id": game_id, "text": word})   # late duplicate: not a second win
+
+    won = [e["args"][0] for e in sc.get_received() if e["name"] == "round:won"]
+    assert len(won) == 1 and won[0]["roundNumber"] == 2
+    db_session.expire_all()
+    rows = {pg.UserID: pg for pg in db_session.query(PlayerGame).filter_by(GameID=game_id)}
+    assert rows[p2.UserID].PlayerFinalScore == 100
+    assert db_session.query(Round).filter_by(GameID=game_id).count() == 3
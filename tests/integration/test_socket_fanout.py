@@ -0,0 +1,79 @@
+"""
+Two Socket.IO servers ("workers") joined by the in-process queue stand-in.
+
+Flask-SocketIO's test client refuses pub/sub managers, so clients are registered with
+the manager directly and outgoing packets are captured at the server.
+"""
+import json
+import time
+import pytest
+from flask import Flask
+from flask_socketio import SocketIO
+from backend.app.socket_queue import LocalBus, LocalQueueManager, broadcast_invalidation, start_listener
+from backend.concurrency import socketio_async_mode
+from backend.app.room_cache import room_cache
+
+
+def _worker(bus):
+    app = Flask(__name__)
+    sio = SocketIO(app, client_manager=LocalQueueManager(channel="test", bus=bus),
+                   async_mode=socketio_async_mode())
+
+    start_listener(sio)
+    return app, sio
+
+
+def _client(sio, room=None):
+    """Connect a fake client to `sio` (optionally in `room`); returns its received (event, data) list."""
+    received = []
+    sid = sio.server.manager.connect(f"eio-{id(received)}", "/")
+    if room:
+        sio.server.manager.enter_room(sid, "/", room)
+
+    def capture(eio_sid, pkt):
+        if eio_sid == f"eio-{id(received)}":
+            name, data = json.loads(pkt.data[1:])[:2]   # "2[event, data]"
+            received.append((name, data))
+    prev = sio.server._send_eio_packet
+    sio.server._send_eio_packet = lambda eio_sid, pkt: (capture(eio_sid, pkt), prev(eio_sid, pkt))
+    return received
+
+
+def _wait_for(fn, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        got = fn()
+        if got:
+            return got
+        time.sleep(0.01)
+    return fn()
+
+
+@pytest.fixture
+def workers():
+    bus = LocalBus()
+    return _worker(bus), _worker(bus)
+
+
+def test_emit_on_one_worker_reaches_clients_of_another(workers):
+    (app_a, sio_a), (app_b, sio_b) = workers
+    in_room = _client(sio_b, "game-7")
+    outsider = _client(sio_b)
+
+    sio_a.emit("room:state", {"gameId": 7, "version": 3}, to="game-7")
+
+    assert _wait_for(lambda: in_room) == [("room:state", {"gameId": 7, "version": 3})]
+    assert outsider == []
+
+
+def test_invalidation_drops_cache_on_other_workers_only(workers, room):
+    (app_a, sio_a), (app_b, sio_b) = workers
+    game_id = room[0]
+    in_room = _client(sio_b, f"game-{game_id}")
+
+    v0, _ = room_cache.versioned(game_id)
+    broadcast_invalidation(sio_a, game_id)
+
+    # worker B (the only other host on the bus) drops the game from the shared in-process cache
+    assert _wait_for(lambda: room_cache.version(game_id) != v0)
+    assert in_room == []
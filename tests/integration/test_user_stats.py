@@ -0,0 +1,90 @@
+import datetime as dt
+from backend.database.models import User, UserStats, Round, Guess
+from backend.app.user_stats import rebuild_user_stats
+
+
+def _win(client, db_session, game_id, started_secs_ago):
+    rnd = (db_session.query(Round).filter_by(GameID=game_id)
+           .order_by(Round.RoundNumber.desc()).first())
+    rnd.Description = "a hint"
+    rnd.Status = "active"
+    rnd.StartTime = dt.datetime.utcnow() - dt.timedelta(seconds=started_secs_ago)
+    db_session.commit()
+    r = client.put(f"/api/room/{game_id}/guess", json={"guess": rnd.TargetWord})
+    assert r.get_json()["correct"] is True
+    return rnd.TargetWord
+
+
+def _summary(client):
+    r = client.get("/api/profile/summary")
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def test_wins_update_totals_and_top_lists(client, room, login_as, db_session):
+    game_id, _, p1, p2 = room
+    rebuild_user_stats(db_session); db_session.commit()   # fixture rows predate the stats
+    login_as(p2)
+
+    slow = _win(client, db_session, game_id, started_secs_ago=40)
+    fast = _win(client, db_session, game_id, started_secs_ago=5)
+
+    body = _summary(client)
+    assert body["totals"] == {"total_games": 1, "total_score": 200}
+    assert [e["word"] for e in body["fastest"]] == [fast, slow]
+    assert [e["word"] for e in body["hardest"]] == [slow, fast]
+    assert body["fastest"][0]["game_id"] == game_id and body["fastest"][0]["round_no"] == 3
+
+    db_session.expire_all()
+    assert db_session.get(User, p2.UserID).AvgScorePerGame == 200.0
+
+
+def test_summary_is_a_single_lookup(client, room, login_as, query_counter):
+    login_as(room[2])
+    with query_counter() as qc:
+        _summary(client)
+    assert qc.count == 1, qc.statements
+
+
+def test_top_lists_keep_three_entries(client, room, login_as, db_session):
+    game_id, _, p1, _ = room
+    rnd = db_session.query(Round).filter_by(GameID=game_id, RoundNumber=1).one()
+    db_session.add_all([Guess(GameID=game_id, RoundID=rnd.RoundID, GuesserID=p1.UserID, GuessText="apple",
+                              ResponseTimeSeconds=float(s), IsCorrect=True) for s in (9, 2, 7, 4, 5)])
+    db_session.commit()
+    rebuild_user_stats(db_session, [p1.UserID]); db_session.commit()
+
+    login_as(p1)
+    body = _summary(client)
+    assert [e["response_sec"] for e in body["fastest"]] == [2.0, 4.0, 5.0]
+    assert [e["response_sec"] for e in body["hardest"]] == [9.0, 7.0, 5.0]
+    assert body["totals"] == {"total_games": 1, "total_score": 100}
+
+
+def test_rebuild_matches_incremental_updates(client, room, login_as, db_session):
+    game_id, creator, p1, p2 = room
+    rebuild_user_stats(db_session); db_session.commit()
+    login_as(p1)
+    _win(client, db_session, game_id, started_secs_ago=12)
+    login_as(p2)
+    _win(client, db_session, game_id, started_secs_ago=3)
+
+    def snapshot():
+        db_session.expire_all()
+        out = {}
+        for u in (creator, p1, p2):
+            user, stats = db_session.get(User, u.UserID), db_session.get(UserStats, u.UserID)
+            out[u.UserID] = (user.TotalGamesPlayed, user.TotalScore, user.AvgScorePerGame,
+                             stats.Fastest if stats else [], stats.Hardest if stats else [])
+        return out
+
+    incremental = snapshot()
+    rebuild_user_stats(db_session); db_session.commit()
+    assert snapshot() == incremental
+
+
+def test_joining_counts_a_game(client, login_session, db_session):
+    with login_session as uid:
+        r = client.post("/api/games", json={"max_players": 4, "total_rounds": 3})
+        assert r.status_code == 201, r.data
+        assert _summary(client)["totals"]["total_games"] == 1
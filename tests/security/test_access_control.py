@@ -1,5 +1,6 @@
 import pytest
 import uuid
+from backend import main
 from backend.database.models import Game, PlayerGame
 
 
@@ -133,4 +134,15 @@ def test_room_allows_member_when_logged_in(client, login_session, db_session):
         _add_membership(db_session, user_id, game_id)
 
         r = client.get(f"/room/{game_id}")
-        assert r.status_code == 200
\ No newline at end of file
+        assert r.status_code == 200
+
+@pytest.mark.security
+def test_metrics_are_internal_only(client, monkeypatch):
+    assert client.get('/api/metrics').status_code == 200     # local request
+    remote = {"REMOTE_ADDR": "203.0.113.7"}
+    assert client.get('/api/metrics', environ_base=remote).status_code == 403
+
+    monkeypatch.setattr(main, "METRICS_TOKEN", "s3cret")
+    assert client.get('/api/metrics').status_code == 403
+    assert client.get('/api/metrics', environ_base=remote, headers={"X-Metrics-Token": "nope"}).status_code == 403
+    assert client.get('/api/metrics', environ_base=remote, headers={"X-Metrics-Token": "s3cret"}).status_code == 200
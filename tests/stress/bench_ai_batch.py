@@ -0,0 +1,86 @@
+"""
+Per-item cost of word sets and description checks: N single calls (/gen_words,
+/check_description, --parallel at a time) vs one /gen_words:batch?n=N or
+/check_description:batch call, which packs the items into WORDS_PER_PROMPT /
+CHECKS_PER_PROMPT-sized prompts run AI_BATCH_CONCURRENCY at a time.
+
+The fake Ollama charges a fixed per-call latency (prompt processing, queueing) plus a
+per-output-token cost, so packing saves the fixed part and keeps the generation part. The AI
+service and the fake run in-process (httpx.ASGITransport); the reservoir and the verdict
+cache are turned off so every item reaches the model.
+
+Run from the repo root (needs fastapi, httpx):
+  $ python tests/stress/bench_ai_batch.py [--n 64] [--latency fixed:0.4] [--token-latency 0.005]
+"""
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import httpx  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.verdict_cache import VerdictCache  # noqa: E402
+from backend.lm_core.word_reservoir import WordReservoir  # noqa: E402
+
+
+def _checks(n):
+    return [{"targetWord": "tree", "forbiddenWords": ["leaf", "wood", "forest"],
+             "description": f"tall green plant number {i}", "lexicalChecked": True} for i in range(n)]
+
+
+async def _run(kind, mode, args):
+    fake = create_app(FakeConfig(latency=args.latency, token_latency=args.token_latency, seed=4))
+    api.ollama = OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake))
+    api.verdicts = VerdictCache(max_items=0)                  # keeps nothing: every check asks
+    api.reservoir = WordReservoir(api.generate_word_set, api.validate_word_set, path=None, capacity=0)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://ai",
+                                 timeout=600) as client:
+        t0 = time.perf_counter()
+        if mode == "single":
+            sem = asyncio.Semaphore(args.parallel)
+
+            async def one(call):
+                async with sem:
+                    return (await call()).status_code == 200
+            if kind == "words":
+                oks = await asyncio.gather(*(one(lambda: client.post("/gen_words")) for _ in range(args.n)))
+            else:
+                oks = await asyncio.gather(*(one(lambda b=b: client.post("/check_description", json=b))
+                                             for b in _checks(args.n)))
+            items = sum(oks)
+        elif kind == "words":
+            items = len((await client.post(f"/gen_words:batch?n={args.n}")).json()["items"])
+        else:
+            items = len((await client.post("/check_description:batch",
+                                           json={"items": _checks(args.n)})).json()["items"])
+        total = time.perf_counter() - t0
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake") as f:
+        calls = (await f.get("/_stats")).json()["calls"]
+    await api.ollama.aclose()
+    return total, items, calls
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=64)
+    ap.add_argument("--latency", default="fixed:0.4", help="fake per-call latency spec")
+    ap.add_argument("--token-latency", type=float, default=0.005, help="fake seconds per output token")
+    ap.add_argument("--parallel", type=int, default=api.BATCH_CONCURRENCY,
+                    help="single calls in flight (default: the batch concurrency limit)")
+    args = ap.parse_args()
+    print(f"{args.n} items, model {args.latency} + {args.token_latency * 1000:.0f} ms/token, "
+          f"{args.parallel} single calls / {api.BATCH_CONCURRENCY} packed prompts in flight, "
+          f"{api.WORDS_PER_PROMPT} sets / {api.CHECKS_PER_PROMPT} checks per prompt")
+    print(f"{'kind':<7} {'mode':<7} {'items':>6} {'model calls':>11} {'wall s':>8} {'ms/item':>8}")
+    for kind in ("words", "checks"):
+        for mode in ("single", "batch"):
+            total, items, calls = asyncio.run(_run(kind, mode, args))
+            print(f"{kind:<7} {mode:<7} {items:>6} {calls:>11} {total:>8.2f} {total / max(1, items) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
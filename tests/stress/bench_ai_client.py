@@ -0,0 +1,119 @@
+"""
+AI service throughput with a slow model: sync handlers + requests (previous api.py) vs async
+handlers on the pooled OllamaClient, both under one uvicorn worker.
+
+The fake Ollama (backend/lm_core/fake_ollama.py) answers /api/generate after --latency seconds. N concurrent /gen_words calls
+are fired at each service; the sync version is capped by the threadpool (40 threads) and
+opens a new connection per call, the async one by OLLAMA_MAX_CONNECTIONS. Fake Ollama and services
+run as separate processes (the script re-runs itself with --serve).
+
+Run from the repo root (needs fastapi, uvicorn, httpx):
+  $ python tests/stress/bench_ai_client.py [--latency 0.5] [--concurrency 10 100 400]
+"""
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+
+FAKE_PORT, OLD_PORT, NEW_PORT = 19434, 19501, 19502
+os.environ["OLLAMA_URL"] = f"http://127.0.0.1:{FAKE_PORT}"
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import requests  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from backend.lm_core.api import app as async_app, WordsOut  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app as fake_ollama  # noqa: E402
+
+WORDS_PROMPT = 'Generate JSON with keys exactly: {"targetWord","forbiddenWords"}.'
+
+
+def _old_service() -> FastAPI:
+    """The previous gen_words: sync handler, one fresh requests.post per call."""
+    old = FastAPI()
+
+    @old.post("/gen_words", response_model=WordsOut)
+    def gen_words():
+        r = requests.post(f"{os.environ['OLLAMA_URL']}/api/generate",
+                          json={"model": "fake", "prompt": WORDS_PROMPT, "stream": False}, timeout=45)
+        r.raise_for_status()
+        data = json.loads(r.json()["response"])
+        return WordsOut(**data)
+    return old
+
+
+def _spawn(kind, port, latency):
+    proc = subprocess.Popen([sys.executable, __file__, "--serve", kind, "--port", str(port),
+                             "--latency", str(latency)])
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{kind} server on {port} did not start")
+
+
+def _serve(kind, port, latency):
+    app = {"fake": lambda: fake_ollama(FakeConfig(latency=f"fixed:{latency}")),
+           "sync": _old_service, "async": lambda: async_app}[kind]()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error", backlog=4096)
+
+
+async def _fire(port, n):
+    limits = httpx.Limits(max_connections=n, max_keepalive_connections=n)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        async def one():
+            t0 = time.perf_counter()
+            r = await client.post("/gen_words", json={})
+            return time.perf_counter() - t0, r.status_code == 200
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(n)))
+        return time.perf_counter() - t0, results
+
+
+def _row(label, n, total, results, upstream_conns):
+    lat = sorted(r[0] for r in results)
+    ok = sum(1 for r in results if r[1])
+    pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))] * 1000
+    print(f"{label:<6} {n:>6} {ok:>5} {total:>8.2f} {n / total:>9.1f} {pct(0.5):>9.0f} {pct(0.95):>9.0f} "
+          f"{upstream_conns:>11}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.5, help="fake model latency (s)")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 400])
+    ap.add_argument("--serve", choices=["fake", "sync", "async"], help=argparse.SUPPRESS)
+    ap.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.serve:
+        return _serve(args.serve, args.port, args.latency)
+
+    procs = [_spawn("fake", FAKE_PORT, args.latency), _spawn("sync", OLD_PORT, args.latency),
+             _spawn("async", NEW_PORT, args.latency)]
+    try:
+        print(f"fake Ollama latency {args.latency * 1000:.0f} ms, one uvicorn worker per service")
+        print(f"{'mode':<6} {'calls':>6} {'ok':>5} {'wall s':>8} {'calls/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'ollama conns':>11}")
+        for n in args.concurrency:
+            for label, port in (("sync", OLD_PORT), ("async", NEW_PORT)):
+                httpx.post(f"http://127.0.0.1:{FAKE_PORT}/_stats/reset")
+                total, results = asyncio.run(_fire(port, n))
+                conns = httpx.post(f"http://127.0.0.1:{FAKE_PORT}/_stats/reset").json()["connections"]
+                _row(label, n, total, results, conns)
+    finally:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Room broadcast latency through the Socket.IO message queue vs number of rooms.
+
+Two Socket.IO servers stand in for two web workers. Clients (3 per room) are connected
+to worker B; worker A emits one room:state per room, as publish_room_state() does after a
+write. Latency = emit on A -> packet handed to the client's transport on B.
+
+  queue = LocalQueueManager (in-process bus), or Redis when BENCH_REDIS_URL is set:
+          $ docker compose up -d redis
+          $ BENCH_REDIS_URL=redis://localhost:6379/0 python tests/stress/bench_broadcast.py
+
+Run from the repo root:
+  $ python tests/stress/bench_broadcast.py [--rooms 1 10 100 1000] [--clients 3]
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from flask import Flask  # noqa: E402
+from flask_socketio import SocketIO  # noqa: E402
+from backend.app.socket_queue import LocalBus, LocalQueueManager, RedisQueueManager, start_listener  # noqa: E402
+from backend.concurrency import socketio_async_mode  # noqa: E402
+
+
+def _worker(make_manager):
+    app = Flask(__name__)
+    sio = SocketIO(app, client_manager=make_manager(), async_mode=socketio_async_mode())
+    start_listener(sio)
+    return sio
+
+
+def _run(rooms, clients_per_room, make_manager):
+    sio_a, sio_b = _worker(make_manager), _worker(make_manager)
+    mgr = sio_b.server.manager
+    expected = rooms * clients_per_room
+    latencies, done, lock = [], threading.Event(), threading.Lock()
+
+    def capture(eio_sid, pkt):
+        now = time.perf_counter()
+        _, data = json.loads(pkt.data[1:])[:2]
+        with lock:
+            latencies.append(now - data["t0"])
+            if len(latencies) >= expected:
+                done.set()
+    sio_b.server._send_eio_packet = capture
+
+    for r in range(rooms):
+        for c in range(clients_per_room):
+            sid = mgr.connect(f"eio-{r}-{c}", "/")
+            mgr.enter_room(sid, "/", f"game-{r}")
+    time.sleep(0.2)   # let subscriptions settle (Redis)
+
+    t0 = time.perf_counter()
+    for r in range(rooms):
+        sio_a.emit("room:state", {"gameId": r, "t0": time.perf_counter()}, to=f"game-{r}")
+    done.wait(60)
+    total = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))] * 1000 if lat else float("nan")
+    print(f"{rooms:>6} {len(lat):>9}/{expected:<6} {pct(0.5):>8.2f} {pct(0.95):>8.2f} {pct(1.0):>8.2f} "
+          f"{total * 1000:>9.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rooms", type=int, nargs="+", default=[1, 10, 100, 1000])
+    ap.add_argument("--clients", type=int, default=3)
+    args = ap.parse_args()
+
+    url = os.getenv("BENCH_REDIS_URL")
+    print(f"queue: {url or 'in-process bus'}, {args.clients} clients per room")
+    print(f"{'rooms':>6} {'delivered':>16} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'total ms':>9}")
+    for i, rooms in enumerate(args.rooms):
+        channel = f"bench-{os.getpid()}-{i}"   # fresh channel per run
+        if url:
+            make = lambda: RedisQueueManager(url, channel=channel)
+        else:
+            bus = LocalBus()
+            make = lambda: LocalQueueManager(channel=channel, bus=bus)
+        _run(rooms, args.clients, make)
+
+
+if __name__ == "__main__":
+    main()
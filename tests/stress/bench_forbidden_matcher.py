@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: description validation against 5..500 forbidden terms.
+
+  old     = normalize + a freshly built re.search per term (previous put_description)
+  matcher = ForbiddenMatcher compiled once per round, one pass over the text
+
+Run from the repo root:
+  $ python tests/stress/bench_forbidden_matcher.py
+"""
+import re
+import sys
+import random
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from backend.app.word_matcher import ForbiddenMatcher, normalize  # noqa: E402
+
+
+def _old_check(text, target, forbidden):
+    norm_desc = normalize(text)
+    norm_target = normalize(target)
+    if norm_target and re.search(rf"(?:^| ){re.escape(norm_target)}(?: |$)", norm_desc):
+        return target
+    for w in forbidden:
+        nw = normalize(w)
+        if nw and re.search(rf"(?:^| ){re.escape(nw)}(?: |$)", norm_desc):
+            return w
+    return None
+
+
+def _word(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+
+
+def main():
+    rng = random.Random(7)
+    text = " ".join(_word(rng) for _ in range(40)) + ". It is big, round and tasty!"
+    print(f"{'terms':>6} {'old us/call':>12} {'compile us':>11} {'matcher us/call':>16} {'speedup':>8}")
+    for n in (5, 20, 50, 100, 200, 500):
+        forbidden = [_word(rng) for _ in range(n)]
+        target = _word(rng)
+        calls = max(200, 20000 // n)
+
+        old = timeit.timeit(lambda: _old_check(text, target, forbidden), number=calls) / calls
+        build = timeit.timeit(lambda: ForbiddenMatcher(target, forbidden), number=20) / 20
+        m = ForbiddenMatcher(target, forbidden)
+        new = timeit.timeit(lambda: m.violations(text), number=calls) / calls
+        print(f"{n:>6} {old * 1e6:>12.1f} {build * 1e6:>11.1f} {new * 1e6:>16.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+join_random under load: 500 simultaneous joiners over 50k open public lobbies.
+
+  random = the previous handler: ORDER BY random() over every waiting public game,
+           CurrentPlayersCount += 1 in Python
+  slots  = app.matchmaking.find_and_claim: fullest lobby off ix_Game_Lobby_FreeSlots,
+           conditional UPDATE seat claim
+
+Reports the uncontended cost of one join, joins/s and p95 latency with everyone joining
+at once, and how many lobbies ended up over MaxPlayers. With SQLite every join is a
+write transaction on the one database lock, so the concurrent numbers are dominated by
+lock waits (errors = joins that hit busy_timeout).
+
+Run from the repo root:
+  $ python tests/stress/bench_matchmaking.py [--lobbies 50000] [--joiners 500]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from sqlalchemy import func, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from backend.database.db import Base, make_engine  # noqa: E402
+from backend.database.models import User, Game, PlayerGame  # noqa: E402
+from backend.app.matchmaking import find_and_claim  # noqa: E402
+
+
+def _seed(Session, lobbies, joiners):
+    with Session() as db:
+        db.execute(insert(User), [{"Username": f"u{i}", "Email": f"u{i}@bench", "PasswordHash": "x"}
+                                  for i in range(joiners + 1)])
+        rnd = random.Random(7)
+        rows = []
+        for i in range(lobbies):
+            max_players = rnd.randint(2, 10)
+            rows.append({"CreatorID": 1, "GameCode": f"L{i:07d}", "MaxPlayers": max_players,
+                         "TotalRounds": 3, "Status": "waiting", "IsPrivate": i % 5 == 0,
+                         "CurrentPlayersCount": rnd.randint(1, max_players)})
+        db.execute(insert(Game), rows)
+        db.commit()
+        return [uid for (uid,) in db.query(User.UserID).filter(User.UserID > 1)]
+
+
+def _join_random_legacy(db, uid):
+    game = (db.query(Game)
+              .filter_by(Status="waiting", IsPrivate=False)
+              .filter(Game.CurrentPlayersCount < Game.MaxPlayers)
+              .order_by(func.random())
+              .first())
+    if game is None:
+        return None
+    db.add(PlayerGame(UserID=uid, GameID=game.GameID))
+    game.CurrentPlayersCount += 1
+    return game.GameID
+
+
+def _join_random_slots(db, uid):
+    gid = find_and_claim(db, uid)
+    if gid is not None:
+        db.add(PlayerGame(UserID=uid, GameID=gid))
+    return gid
+
+
+def _run(name, join, path, lobbies, joiners):
+    eng = make_engine(f"sqlite:///{path}", pool_size=joiners, max_overflow=10)
+    Base.metadata.create_all(eng)
+    Session = sessionmaker(bind=eng, autoflush=False, future=True)
+    uids = _seed(Session, lobbies, joiners)
+
+    start = threading.Barrier(len(uids))
+    latencies, errors, lock = [], [], threading.Lock()
+
+    def worker(uid):
+        start.wait()
+        t0 = time.perf_counter()
+        try:
+            with Session() as db:
+                join(db, uid)
+                db.commit()
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+        except Exception as e:
+            with lock:
+                errors.append(type(e).__name__ + ": " + str(e).splitlines()[0][:80])
+
+    threads = [threading.Thread(target=worker, args=(uid,)) for uid in uids]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    # uncontended cost of one join
+    solo = []
+    with Session() as db:
+        for uid in uids[:50]:
+            t1 = time.perf_counter()
+            join(db, uid)
+            db.rollback()
+            solo.append(time.perf_counter() - t1)
+
+    with Session() as db:
+        seated = dict(db.query(PlayerGame.GameID, func.count()).group_by(PlayerGame.GameID).all())
+        overfilled = sum(1 for g in db.query(Game).filter(Game.GameID.in_(seated))
+                         if g.CurrentPlayersCount > g.MaxPlayers)
+    eng.dispose()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+    print(f"{name:>7} {sum(solo) / len(solo) * 1000:>8.2f} {len(latencies) / elapsed:>8.0f} "
+          f"{p95 * 1000:>9.1f} {overfilled:>11} {len(errors):>7}")
+    for msg in sorted(set(errors))[:3]:
+        print(f"{'':>7}   {msg}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lobbies", type=int, default=50_000)
+    ap.add_argument("--joiners", type=int, default=500)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_matchmaking_")
+    print(f"{args.joiners} simultaneous joiners, {args.lobbies} lobbies")
+    print(f"{'mode':>7} {'solo ms':>8} {'joins/s':>8} {'p95 ms':>9} {'overfilled':>11} {'errors':>7}")
+    _run("random", _join_random_legacy, f"{tmp}/random.db", args.lobbies, args.joiners)
+    _run("slots", _join_random_slots, f"{tmp}/slots.db", args.lobbies, args.joiners)
+
+
+if __name__ == "__main__":
+    main()
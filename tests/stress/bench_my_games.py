@@ -0,0 +1,134 @@
+"""
+/api/games/my_active and /api/games/my_past for a player with a long history.
+
+  n+1    = the previous handlers: every game, plus one query per game (round count /
+           player list / winner name)
+  page   = current endpoint, first page (?limit=50)
+  walk   = current endpoint, every page followed through its cursor
+
+Seeds --games games (half running, half completed, 3 rounds and 4 players each) in a
+temporary SQLite file and reports latency and SQL statements per request.
+
+Run from the repo root:
+  $ python tests/stress/bench_my_games.py [--games 10000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import datetime as dt
+from pathlib import Path
+
+TMP = tempfile.mkdtemp(prefix="bench_my_games_")
+os.environ["DB_URL"] = f"sqlite:///{TMP}/bench.db"
+os.environ.setdefault("TESTING", "1")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from sqlalchemy import event, func, insert  # noqa: E402
+from backend.main import create_app  # noqa: E402
+from backend.database.db import SessionLocal, engine  # noqa: E402
+from backend.database.models import User, Game, PlayerGame, Round  # noqa: E402
+
+
+def _seed(n_games):
+    with SessionLocal() as db:
+        users = [User(Username=f"u{i}", Email=f"u{i}@bench", PasswordHash="x") for i in range(4)]
+        db.add_all(users); db.flush()
+        uids = [u.UserID for u in users]
+        base = dt.datetime(2024, 1, 1)
+        db.execute(insert(Game), [{
+            "CreatorID": uids[1], "GameCode": f"B{i:07d}", "MaxPlayers": 4, "TotalRounds": 3,
+            "Status": "completed" if i % 2 else "active", "CurrentPlayersCount": 4,
+            "CreatedAt": base + dt.timedelta(minutes=i), "StartedAt": base + dt.timedelta(minutes=i),
+            "EndedAt": base + dt.timedelta(minutes=i + 5) if i % 2 else None,
+            "WinnerID": uids[i % 4] if i % 2 else None,
+        } for i in range(n_games)])
+        gids = [gid for (gid,) in db.query(Game.GameID).order_by(Game.GameID)]
+        db.execute(insert(PlayerGame), [{"UserID": uid, "GameID": gid} for gid in gids for uid in uids])
+        db.execute(insert(Round), [{
+            "GameID": gid, "RoundNumber": rn, "TargetWord": "tree", "ForbiddenWords": [],
+            "Status": "completed" if rn < 3 else "active",
+        } for gid in gids for rn in (1, 2, 3)])
+        db.commit()
+        return uids[0]
+
+
+def _n_plus_one_active(uid):
+    with SessionLocal() as db:
+        games = (db.query(Game).join(PlayerGame, PlayerGame.GameID == Game.GameID)
+                   .filter(PlayerGame.UserID == uid, Game.Status.in_(["waiting", "active"]))
+                   .order_by(Game.CreatedAt.desc()).all())
+        return [db.query(func.count(Round.RoundID))
+                  .filter(Round.GameID == g.GameID, Round.Status == "completed").scalar() for g in games]
+
+
+def _n_plus_one_past(uid):
+    with SessionLocal() as db:
+        games = (db.query(Game).join(PlayerGame, PlayerGame.GameID == Game.GameID)
+                   .filter(PlayerGame.UserID == uid, Game.Status == "completed")
+                   .order_by(Game.EndedAt.desc().nullslast()).all())
+        out = []
+        for g in games:
+            players = (db.query(User.Username).join(PlayerGame, PlayerGame.UserID == User.UserID)
+                         .filter(PlayerGame.GameID == g.GameID).all())
+            winner = db.query(User.Username).filter(User.UserID == g.WinnerID).scalar() if g.WinnerID else None
+            out.append((players, winner))
+        return out
+
+
+def _walk(client, path, next_cursor):
+    cursor, n = None, 0
+    while True:
+        r = client.get(path, query_string={"limit": 50, **({"cursor": cursor} if cursor else {})})
+        n += 1
+        cursor = next_cursor(r)
+        if not cursor:
+            return n
+
+
+def _measure(fn, repeat):
+    stmts = [0]
+    def count(*_a, **_k):
+        stmts[0] += 1
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        elapsed = (time.perf_counter() - t0) / repeat
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return elapsed, stmts[0] // repeat
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--games", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    app = create_app()
+    uid = _seed(args.games)
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = uid
+
+    active_cursor = lambda r: r.headers.get("X-Next-Cursor")
+    past_cursor = lambda r: r.get_json()["next_cursor"]
+    cases = [
+        ("my_active", "n+1", lambda: _n_plus_one_active(uid)),
+        ("my_active", "page", lambda: client.get("/api/games/my_active?limit=50")),
+        ("my_active", "walk", lambda: _walk(client, "/api/games/my_active", active_cursor)),
+        ("my_past", "n+1", lambda: _n_plus_one_past(uid)),
+        ("my_past", "page", lambda: client.get("/api/games/my_past?limit=50")),
+        ("my_past", "walk", lambda: _walk(client, "/api/games/my_past", past_cursor)),
+    ]
+    print(f"{args.games} games in the player's history, mean of {args.repeat} runs")
+    print(f"{'endpoint':>10} {'mode':>6} {'ms':>10} {'queries':>8}")
+    for endpoint, mode, fn in cases:
+        elapsed, stmts = _measure(fn, args.repeat)
+        print(f"{endpoint:>10} {mode:>6} {elapsed * 1000:>10.1f} {stmts:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+/check_description with creators resubmitting descriptions: no verdict cache (previous
+behaviour, every check prompts the model) vs the content-addressed VerdictCache.
+
+The AI service app and the fake Ollama run in-process (httpx.ASGITransport), so only the
+model latency and the service overhead are measured. The workload is --rounds creators, each
+submitting a description and then --resubmits near-identical copies of it (case /
+whitespace / forbidden-order changes), plus --burst identical checks fired at the same time
+(double-clicks, reconnect retries).
+
+Run from the repo root (needs fastapi, httpx):
+  $ python tests/stress/bench_verdict_cache.py [--latency 0.2] [--rounds 50] [--resubmits 2] [--burst 4]
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import httpx  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app, WORD_SETS  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.verdict_cache import VerdictCache  # noqa: E402
+
+
+class NoCache:
+    """The previous behaviour: every check goes to the model."""
+    async def get_or_compute(self, key, compute):
+        return await compute()
+
+    def stats(self):
+        return {}
+
+
+def _workload(rounds, resubmits, burst, seed=1):
+    rng = random.Random(seed)
+    waves = []
+    for i in range(rounds):
+        target, forbidden = rng.choice(WORD_SETS)
+        desc = f"creator {i} describes it as something you see every day"
+        body = {"targetWord": target, "forbiddenWords": list(forbidden), "description": desc,
+                "lexicalChecked": True}
+        waves.append([body] * burst)
+        for _ in range(resubmits):
+            waves.append([{**body, "description": "  " + desc.capitalize() + " ",
+                           "forbiddenWords": rng.sample(forbidden, len(forbidden))}])
+    return waves
+
+
+async def _run(cache, waves, latency, concurrency=16):
+    fake = create_app(FakeConfig(latency=f"fixed:{latency}"))
+    api.ollama = OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake))
+    api.verdicts = cache
+    sem = asyncio.Semaphore(concurrency)    # creators checking at the same time
+    lat = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://ai") as client:
+        async def wave(bodies):
+            async with sem:
+                async def one(body):
+                    t0 = time.perf_counter()
+                    r = await client.post("/check_description", json=body)
+                    r.raise_for_status()
+                    lat.append(time.perf_counter() - t0)
+                await asyncio.gather(*(one(b) for b in bodies))
+        t0 = time.perf_counter()
+        # a creator's resubmissions follow its first check; creators run concurrently
+        per_creator = {}
+        for bodies in waves:
+            per_creator.setdefault(bodies[0]["description"].strip().lower(), []).append(bodies)
+
+        async def creator(ws):
+            for w in ws:
+                await wave(w)
+        await asyncio.gather(*(creator(ws) for ws in per_creator.values()))
+        total = time.perf_counter() - t0
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake") as client:
+        model_calls = (await client.get("/_stats")).json()["calls"]
+    await api.ollama.aclose()
+    return total, sorted(lat), model_calls, cache.stats()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.2, help="fake model latency (s)")
+    ap.add_argument("--rounds", type=int, default=50)
+    ap.add_argument("--resubmits", type=int, default=2)
+    ap.add_argument("--burst", type=int, default=4)
+    args = ap.parse_args()
+    waves = _workload(args.rounds, args.resubmits, args.burst)
+    checks = sum(len(w) for w in waves)
+    print(f"{checks} checks, {args.rounds} distinct descriptions, model latency {args.latency * 1000:.0f} ms")
+    print(f"{'mode':<8} {'wall s':>7} {'model calls':>11} {'p50 ms':>8} {'p95 ms':>8} {'hit ratio':>9} "
+          f"{'saved s':>8}")
+    for label, cache in (("no cache", NoCache()), ("cache", VerdictCache())):
+        total, lat, calls, stats = asyncio.run(_run(cache, waves, args.latency))
+        pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))] * 1000
+        ratio = stats.get("hit_ratio")
+        print(f"{label:<8} {total:>7.2f} {calls:>11} {pct(0.5):>8.0f} {pct(0.95):>8.0f} "
+              f"{'-' if ratio is None else f'{ratio:.2f}':>9} {stats.get('saved_seconds', 0):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
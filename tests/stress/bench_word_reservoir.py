@@ -0,0 +1,79 @@
+"""
+/gen_words latency and failure rate: one model call per request (previous behaviour) vs the
+background-refilled WordReservoir, against the fake Ollama with a slow, sometimes malformed
+model. Games start in bursts (--burst requests, then --pause seconds) so the refill workers
+have to keep up between them.
+
+In-process (httpx.ASGITransport), so the numbers are model wait + service overhead.
+
+Run from the repo root (needs fastapi, httpx):
+  $ python tests/stress/bench_word_reservoir.py [--latency lognormal:0.8,0.3] [--malformed 0.1]
+"""
+import sys
+import time
+import logging
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import httpx  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.word_reservoir import WordReservoir  # noqa: E402
+
+
+async def _run(mode, args, path):
+    fake = create_app(FakeConfig(latency=args.latency, malformed_rate=args.malformed, seed=3))
+    api.ollama = OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake))
+    api.reservoir = WordReservoir(api.generate_word_set, api.validate_word_set, path=path,
+                                  capacity=args.size if mode != "direct" else 0,
+                                  low_water=args.size // 4, workers=args.workers)
+    lat, errors = [], 0
+    async with api.lifespan(api.app):
+        if mode == "reservoir":
+            await asyncio.sleep(args.warmup)     # a running service had time to fill up
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://ai") as client:
+            async def one():
+                nonlocal errors
+                t0 = time.perf_counter()
+                r = await client.post("/gen_words")
+                lat.append(time.perf_counter() - t0)
+                errors += r.status_code != 200
+            t0 = time.perf_counter()
+            for _ in range(args.bursts):
+                await asyncio.gather(*(one() for _ in range(args.burst)))
+                await asyncio.sleep(args.pause)
+            total = time.perf_counter() - t0
+        stats = api.reservoir.stats()
+    return total, sorted(lat), errors, stats
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", default="lognormal:0.8,0.3", help="fake model latency spec")
+    ap.add_argument("--malformed", type=float, default=0.1, help="fraction of unparsable answers")
+    ap.add_argument("--bursts", type=int, default=10)
+    ap.add_argument("--burst", type=int, default=8)
+    ap.add_argument("--pause", type=float, default=2.0)
+    ap.add_argument("--size", type=int, default=24)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--warmup", type=float, default=8.0)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)    # refill failures are expected here (malformed answers)
+    print(f"{args.bursts} bursts of {args.burst} /gen_words, model {args.latency}, "
+          f"{args.malformed:.0%} malformed answers")
+    print(f"{'mode':<16} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'502s':>5} {'from reservoir':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "reservoir.json")
+        for mode, label in (("direct", "direct"), ("reservoir", "reservoir"), ("restart", "after restart")):
+            total, lat, errors, stats = asyncio.run(_run(mode, args, path if mode != "direct" else None))
+            pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))] * 1000
+            print(f"{label:<16} {pct(0.5):>9.2f} {pct(0.95):>9.2f} {lat[-1] * 1000:>9.2f} {errors:>5} "
+                  f"{stats['served']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Serving-mode comparison: the same logged-in traffic against the Werkzeug dev server and
+against gunicorn + gevent (services/web/start.sh). Each user signs up once (password hash),
+then mixes session reads, lobby polls, game creation (AI word request) and re-logins.
+
+Point AI_BASE_URL of the web process at a slow AI service (a few seconds per /gen_words) so
+/start really waits on it, then run the same load against each mode:
+
+  $ WEB_SERVER=dev ./services/web/start.sh                         # Werkzeug dev server
+  $ WEB_WORKER_CLASS=gthread ./services/web/start.sh               # previous gunicorn mode
+  $ ./services/web/start.sh                                        # gunicorn + gevent
+  $ locust -f tests/stress/locustfile_serving.py --headless -u 100 -r 10 -t 40s --host http://localhost:8000
+"""
+from locust import HttpUser, task, between
+import time, uuid
+
+
+class LoggedInUser(HttpUser):
+    wait_time = between(0.2, 1.0)
+
+    def on_start(self):
+        self.uname = f"serve_{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}"
+        self.pw = "hunter2!"
+        self.client.post("/signup", name="/signup", allow_redirects=False,
+                         data={"username": self.uname, "email": f"{self.uname}@load.com", "password": self.pw})
+        self.game_id, self.etag = None, None
+
+    @task(6)
+    def my_active(self):
+        self.client.get("/api/games/my_active", name="/api/games/my_active")
+
+    @task(3)
+    def profile(self):
+        self.client.get("/api/profile/summary", name="/api/profile/summary")
+
+    @task(4)
+    def lobby_poll(self):
+        if not self.game_id:
+            return
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        with self.client.get(f"/api/games/{self.game_id}/lobby", name="/api/games/[id]/lobby",
+                             headers=headers, catch_response=True) as r:
+            if r.status_code in (200, 304):
+                self.etag = r.headers.get("ETag", self.etag)
+                r.success()
+
+    @task(1)
+    def create_and_start(self):
+        r = self.client.post("/api/games", name="/api/games [create]",
+                             json={"max_players": 3, "total_rounds": 2, "is_private": True})
+        if r.status_code == 201:
+            self.game_id, self.etag = r.json()["game_id"], None
+            # waits on the AI service for the word set (falls back when it is down)
+            self.client.post(f"/api/games/{self.game_id}/start", name="/api/games/[id]/start", timeout=60)
+
+    @task(1)
+    def relogin(self):
+        self.client.post("/login", name="/login", allow_redirects=False,
+                         data={"username": self.uname, "password": self.pw})
@@ -0,0 +1,70 @@
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.verdict_cache import VerdictCache  # noqa: E402
+from backend.lm_core.word_reservoir import WordReservoir  # noqa: E402
+
+
+@pytest.fixture
+def service(monkeypatch):
+    def install(**config):
+        fake = create_app(FakeConfig(**config))
+        monkeypatch.setattr(api, "ollama", OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake)))
+        monkeypatch.setattr(api, "verdicts", VerdictCache())
+        monkeypatch.setattr(api, "reservoir", WordReservoir(api.generate_word_set, api.validate_word_set,
+                                                            path=None, capacity=0))
+        return TestClient(api.app), TestClient(fake)
+    return install
+
+
+def test_gen_words_batch_packs_sets_into_few_calls(service, monkeypatch):
+    monkeypatch.setattr(api, "WORDS_PER_PROMPT", 8)
+    client, fake = service(seed=2)
+    r = client.post("/gen_words:batch?n=20")
+    assert r.status_code == 200
+    items = r.json()["items"]
+    assert r.json()["requested"] == 20 and len(items) == 20
+    assert len({w["targetWord"] for w in items}) == 20
+    assert all(w["targetWord"] not in w["forbiddenWords"] for w in items)
+    assert fake.get("/_stats").json()["calls"] <= 4          # 8 + 8 + 4, plus one top-up for repeats
+
+
+def test_gen_words_batch_validates_n_and_reports_total_failure(service):
+    client, _ = service(error_rate=1.0)
+    assert client.post("/gen_words:batch?n=0").status_code == 422
+    assert client.post(f"/gen_words:batch?n={api.BATCH_MAX_ITEMS + 1}").status_code == 422
+    assert client.post("/gen_words:batch?n=3").status_code == 502
+
+
+def test_check_batch_keeps_order_and_shares_work(service, monkeypatch):
+    monkeypatch.setattr(api, "CHECKS_PER_PROMPT", 4)
+    client, fake = service()
+    base = {"targetWord": "tree", "forbiddenWords": ["leaf", "wood"], "lexicalChecked": True}
+    descs = [f"tall plant number {i}" for i in range(8)] + ["a green leaf", "tall plant number 0",
+                                                             "TREE house"]
+    items = [{**base, "description": d} for d in descs]
+    items.append({**base, "description": "made of wood", "lexicalChecked": False})
+    out = client.post("/check_description:batch", json={"items": items}).json()["items"]
+
+    assert len(out) == len(items)
+    assert [o["ok"] for o in out] == [True] * 8 + [False, True, False, False]
+    assert out[8]["violated"] == ["leaf"] and out[11]["reason"] == "lexical match"
+    assert fake.get("/_stats").json()["calls"] == 3          # 10 distinct LLM checks in prompts of 4
+
+    again = client.post("/check_description", json={**base, "description": "tall plant number 3"}).json()
+    assert again == out[3] and fake.get("/_stats").json()["calls"] == 3   # batch filled the cache
+
+
+def test_check_batch_falls_back_per_item_on_a_broken_answer(service, monkeypatch):
+    monkeypatch.setattr(api, "CHECKS_PER_PROMPT", 8)
+    client, fake = service(malformed_rate=1.0)
+    items = [{"targetWord": "tree", "forbiddenWords": ["leaf"], "description": f"plant {i}",
+              "lexicalChecked": True} for i in range(3)]
+    out = client.post("/check_description:batch", json={"items": items}).json()["items"]
+    assert len(out) == 3 and all(o["reason"].startswith("llm degraded") for o in out)
+    assert fake.get("/_stats").json()["calls"] == 4          # the packed prompt + one per item
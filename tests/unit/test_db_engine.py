@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool, QueuePool
+from backend.database.db import make_engine
+
+
+def _pragma(eng, name):
+    with eng.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_file_is_tuned(tmp_path):
+    eng = make_engine(f"sqlite:///{tmp_path}/sub/app.db")
+    try:
+        assert _pragma(eng, "journal_mode") == "wal"
+        assert _pragma(eng, "synchronous") == 1          # NORMAL
+        assert _pragma(eng, "busy_timeout") > 0
+        assert _pragma(eng, "foreign_keys") == 1
+        assert (tmp_path / "sub").is_dir()
+    finally:
+        eng.dispose()
+
+
+def test_sqlite_memory_shares_one_connection():
+    eng = make_engine("sqlite+pysqlite:///:memory:")
+    assert isinstance(eng.pool, StaticPool)
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+
+
+def test_server_database_gets_bounded_pool():
+    pytest.importorskip("psycopg")
+    eng = make_engine("postgresql+psycopg://u:p@localhost:5432/db", pool_size=3, max_overflow=2)
+    assert isinstance(eng.pool, QueuePool)
+    assert eng.pool.size() == 3
+    assert eng.pool._max_overflow == 2
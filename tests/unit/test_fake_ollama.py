@@ -0,0 +1,83 @@
+import json
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app, parse_latency  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+
+WORDS_PROMPT = 'Generate JSON with keys exactly: {"targetWord","forbiddenWords"}.'
+
+
+def _generate(client, prompt=WORDS_PROMPT, **extra):
+    return client.post("/api/generate", json={"model": "phi3:mini", "prompt": prompt, "stream": False, **extra})
+
+
+def test_same_seed_same_answers_and_failures():
+    config = FakeConfig(error_rate=0.3, malformed_rate=0.3, seed=7)
+    runs = []
+    for _ in range(2):
+        client = TestClient(create_app(config))
+        runs.append([(r.status_code, r.text and r.json().get("response"))
+                     for r in (_generate(client) for _ in range(30))])
+    assert runs[0] == runs[1]
+    codes = [code for code, _ in runs[0]]
+    assert 500 in codes and 200 in codes
+
+
+def test_word_set_and_verdict_prompts_get_well_formed_answers():
+    client = TestClient(create_app(FakeConfig()))
+    words = json.loads(_generate(client).json()["response"])
+    assert words["targetWord"] not in words["forbiddenWords"]
+
+    check = 'You are a strict validator. Input: ' + json.dumps(
+        {"targetWord": "tree", "forbiddenWords": ["leaf"], "description": "A green Leaf falls"})
+    assert json.loads(_generate(client, check).json()["response"]) == \
+        {"ok": False, "violated": ["leaf"], "reason": "whole-word match"}
+
+
+def test_streaming_is_the_default_and_reassembles():
+    client = TestClient(create_app(FakeConfig(seed=3)))
+    r = client.post("/api/generate", json={"model": "phi3:mini", "prompt": WORDS_PROMPT})
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert len(lines) > 2 and lines[-1]["done"] and not any(x["done"] for x in lines[:-1])
+    streamed = "".join(x["response"] for x in lines)
+    assert streamed == TestClient(create_app(FakeConfig(seed=3))).post(
+        "/api/generate", json={"prompt": WORDS_PROMPT, "stream": False}).json()["response"]
+
+
+def test_malformed_output_is_not_parsable():
+    client = TestClient(create_app(FakeConfig(malformed_rate=1.0)))
+    for _ in range(10):
+        with pytest.raises(ValueError):
+            json.loads(_generate(client).json()["response"])
+    assert client.get("/_stats").json()["malformed"] == 10
+
+
+def test_latency_specs():
+    import random
+    rng = random.Random(1)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert all(0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2 for _ in range(50))
+    assert all(parse_latency("normal:0,1")(rng) >= 0 for _ in range(50))
+    for bad in ("fixed", "uniform:1", "gamma:1,2", "exp:x"):
+        with pytest.raises(ValueError):
+            parse_latency(bad)
+
+
+def test_ai_service_against_the_fake(monkeypatch):
+    fake = create_app(FakeConfig(seed=1, models=["phi3:mini", "llama3:mini"]))
+    monkeypatch.setattr(api, "ollama", OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake)))
+    client = TestClient(api.app)
+    assert client.get("/healthz").json()["status"] == "ok"
+    assert client.post("/gen_words").status_code == 200
+    r = client.post("/check_description", json={"targetWord": "tree", "forbiddenWords": ["leaf"],
+                                                "description": "grows w00d", "lexicalChecked": True})
+    assert r.json()["ok"] is True
+
+    async def tags():
+        return await api.ollama.tags()
+    assert asyncio.run(tags()) == ["phi3:mini", "llama3:mini"]
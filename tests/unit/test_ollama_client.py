@@ -0,0 +1,80 @@
+import json
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+
+
+def _ollama(handler):
+    return OllamaClient("http://ollama.test", transport=httpx.MockTransport(handler))
+
+
+def test_generate_sends_model_prompt_and_per_call_timeout():
+    seen = []
+
+    def handler(request):
+        seen.append((json.loads(request.content), request.extensions["timeout"]))
+        return httpx.Response(200, json={"response": "  hello \n", "done": True})
+
+    client = _ollama(handler)
+
+    async def run():
+        try:
+            return await client.generate("phi3:mini", "ping", timeout=3)
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == "hello"
+    body, timeout = seen[0]
+    assert body == {"model": "phi3:mini", "prompt": "ping", "stream": False}
+    assert timeout["read"] == 3
+
+
+def test_client_is_shared_across_calls():
+    client = _ollama(lambda request: httpx.Response(200, json={"models": [{"name": "phi3:mini"}]}))
+
+    async def run():
+        first = client.client
+        assert await client.tags() == ["phi3:mini"]
+        assert await client.tags() == ["phi3:mini"]
+        same = client.client is first
+        await client.aclose()
+        return same
+
+    assert asyncio.run(run())
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    def install(handler):
+        monkeypatch.setattr(api, "ollama", _ollama(handler))
+        return TestClient(api.app)
+    return install
+
+
+def test_gen_words_handler_awaits_the_model(ai_service):
+    words = {"targetWord": "Tree", "forbiddenWords": ["leaf", "Wood"]}
+    client = ai_service(lambda request: httpx.Response(200, json={"response": "sure: " + json.dumps(words)}))
+    r = client.post("/gen_words")
+    assert r.status_code == 200
+    assert r.json() == {"targetWord": "tree", "forbiddenWords": ["leaf", "wood"]}
+
+
+def test_unparsable_model_output_is_a_502(ai_service):
+    client = ai_service(lambda request: httpx.Response(200, json={"response": "no json here"}))
+    assert client.post("/gen_words").status_code == 502
+
+
+def test_check_description_degrades_when_ollama_is_down(ai_service):
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    client = ai_service(handler)
+    r = client.post("/check_description", json={"targetWord": "tree", "forbiddenWords": ["leaf"],
+                                                "description": "tall plant", "lexicalChecked": True})
+    assert r.status_code == 200
+    assert r.json()["ok"] is True and r.json()["reason"].startswith("llm degraded")
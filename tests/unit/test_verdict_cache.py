@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.verdict_cache import VerdictCache, verdict_key  # noqa: E402
+
+
+def test_key_ignores_case_whitespace_and_forbidden_order():
+    a = verdict_key("m", "Tree ", ["leaf", "Wood", "leaf"], "A  tall\nplant ")
+    assert a == verdict_key("m", "tree", ["wood", "leaf"], "a tall plant")
+    assert a != verdict_key("other-model", "tree", ["wood", "leaf"], "a tall plant")
+    assert a != verdict_key("m", "tree", ["wood", "leaf"], "a tall plants")
+
+
+def test_lru_ttl_and_saved_latency():
+    now = [0.0]
+    cache = VerdictCache(max_items=2, ttl=10, clock=lambda: now[0])
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return {"ok": True, "violated": [], "reason": key}
+
+    async def run():
+        for key in ("a", "a", "b", "c", "a"):      # "a" evicted by "c"
+            await cache.get_or_compute(key, lambda: compute(key))
+        now[0] = 11                                  # everything expired
+        await cache.get_or_compute("c", lambda: compute("c"))
+    asyncio.run(run())
+
+    assert calls == ["a", "b", "c", "a", "c"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expired"]) == (1, 5, 2, 1)
+    assert stats["saved_seconds"] > 0
+
+
+def test_concurrent_duplicates_share_one_call_and_failures_are_not_cached():
+    cache = VerdictCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("model down")
+        return {"ok": False, "violated": ["leaf"], "reason": None}
+
+    async def run():
+        first = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)),
+                                     return_exceptions=True)
+        second = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in first)
+    assert second == [{"ok": False, "violated": ["leaf"], "reason": None}] * 5
+    assert len(calls) == 2
+    assert cache.stats()["coalesced"] == 8 and cache.stats()["inflight"] == 0
+
+
+def test_resubmitted_description_skips_the_model(monkeypatch):
+    fake = create_app(FakeConfig())
+    monkeypatch.setattr(api, "ollama", OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake)))
+    monkeypatch.setattr(api, "verdicts", VerdictCache())
+    client = TestClient(api.app)
+    body = {"targetWord": "tree", "forbiddenWords": ["leaf", "wood"], "description": "tall plant",
+            "lexicalChecked": True}
+    first = client.post("/check_description", json=body).json()
+    again = client.post("/check_description", json={**body, "description": "  Tall plant",
+                                                    "forbiddenWords": ["wood", "leaf"]}).json()
+    assert first == again
+    assert TestClient(fake).get("/_stats").json()["calls"] == 1
+    stats = client.get("/metrics").json()["verdict_cache"]
+    assert stats["hits"] == 1 and stats["hit_ratio"] == 0.5
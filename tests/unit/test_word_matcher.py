@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+from backend.app.word_matcher import ForbiddenMatcher, matcher_for_round, normalize
+
+
+def test_normalize_strips_punctuation_and_case():
+    assert normalize("  Hello,   WORLD!! ") == "hello world"
+
+
+def test_reports_all_violations_target_first():
+    m = ForbiddenMatcher("Apple", ["fruit", "red", "tree"])
+    assert m.violations("A RED fruit... that falls from a tree; apple?") == ["Apple", "fruit", "red", "tree"]
+
+
+def test_whole_words_only():
+    m = ForbiddenMatcher("cat", ["dog"])
+    assert m.violations("catalog of dogs, concatenate") == []
+    assert m.violations("hot-dog") == ["dog"]
+
+
+def test_digits_and_underscores_split_words():
+    m = ForbiddenMatcher("tree", ["leaf"])
+    assert m.violations("a tree2 thing") == ["tree"]
+    assert m.violations("tree_house") == ["tree"]
+    assert m.violations("2leaf_") == ["leaf"]
+    assert m.violations("treetop leafy") == []
+
+
+def test_multi_word_and_overlapping_terms():
+    m = ForbiddenMatcher("sundae", ["ice cream", "cream"])
+    assert m.violations("made with ice cream") == ["ice cream", "cream"]
+
+
+def test_empty_terms_never_match():
+    m = ForbiddenMatcher("", ["", "  "])
+    assert len(m) == 0
+    assert m.violations("anything at all") == []
+
+
+def test_matcher_is_cached_per_round_and_words():
+    rnd = SimpleNamespace(RoundID=41, TargetWord="pear", ForbiddenWords=["green"])
+    assert matcher_for_round(rnd) is matcher_for_round(rnd)
+
+    reused_id = SimpleNamespace(RoundID=41, TargetWord="plum", ForbiddenWords=["purple"])
+    assert matcher_for_round(reused_id).violations("a purple plum") == ["plum", "purple"]
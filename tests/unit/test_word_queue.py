@@ -0,0 +1,149 @@
+import time
+import threading
+import pytest
+from sqlalchemy.orm import sessionmaker
+from backend.app import word_queue as wq
+from backend.app.background import tasks
+from backend.database.db import Base, make_engine
+from backend.database.models import User, Game, QueuedWordSet
+
+
+def _wait_idle(q, timeout=5.0):
+    deadline = time.time() + timeout
+    while (q.stats()["in_flight"] or tasks.stats()["in_flight"]) and time.time() < deadline:
+        time.sleep(0.01)
+    assert q.stats()["in_flight"] == 0
+
+
+@pytest.fixture
+def words(monkeypatch):
+    counter = iter(range(1000))
+
+    def fake():
+        n = next(counter)
+        return f"word{n}", [f"forb{n}"]
+
+    monkeypatch.setattr(wq, "request_word_set", fake)
+
+
+@pytest.fixture
+def Session(tmp_path):
+    """A file database: the background fetches need connections of their own."""
+    eng = make_engine(f"sqlite:///{tmp_path}/words.db")
+    Base.metadata.create_all(eng)
+    yield sessionmaker(bind=eng, autoflush=False, future=True)
+    eng.dispose()
+
+
+@pytest.fixture
+def db_session(Session):
+    with Session() as db:
+        yield db
+
+
+@pytest.fixture
+def game_id(db_session):
+    u = User(Username="creator", Email="creator@t.com", PasswordHash="x")
+    db_session.add(u); db_session.commit()
+    g = Game(CreatorID=u.UserID, GameCode="WORDS001", MaxPlayers=5, TotalRounds=5, Status="active")
+    db_session.add(g); db_session.commit()
+    return g.GameID
+
+
+def test_prefill_fills_up_to_depth(words, game_id, db_session, Session):
+    q = wq.WordQueue(depth=2, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=4)
+    _wait_idle(q)
+    assert q.stats()["depth"] == 2
+
+
+def test_prefill_never_fetches_more_than_the_game_needs(words, game_id, db_session, Session):
+    q = wq.WordQueue(depth=3, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=1)
+    _wait_idle(q)
+    assert q.stats()["depth"] == 1
+
+
+def test_take_serves_from_queue_and_refills(words, game_id, db_session, Session):
+    q = wq.WordQueue(depth=2, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=3)
+    _wait_idle(q)
+    db_session.rollback()   # new snapshot: see the background inserts
+
+    target, forbidden = q.take(db_session, game_id, rounds_left=2)
+    db_session.commit()
+    assert target.startswith("word") and forbidden[0].startswith("forb")
+    _wait_idle(q)
+    s = q.stats()
+    assert s["depth"] == 2
+    assert s["fallbacks"] == 0
+    assert s["refill_lag_avg_sec"] is not None
+
+
+def test_sets_fetched_by_one_process_are_taken_by_another(words, game_id, db_session, Session):
+    fetcher = wq.WordQueue(depth=2, session_factory=Session)
+    taker = wq.WordQueue(depth=2, session_factory=Session)
+    fetcher.prefill(db_session, game_id, rounds_left=2)
+    _wait_idle(fetcher)
+    db_session.rollback()
+
+    taken = {taker.take(db_session, game_id)[0] for _ in range(2)}
+    db_session.commit()
+    assert taken == {"word0", "word1"}
+    assert taker.stats()["fallbacks"] == 0
+    assert db_session.query(QueuedWordSet).count() == 0
+
+
+def test_take_is_undone_with_the_transaction(words, game_id, db_session, Session):
+    q = wq.WordQueue(depth=1, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=1)
+    _wait_idle(q)
+    db_session.rollback()
+
+    assert q.take(db_session, game_id)[0] == "word0"
+    db_session.rollback()
+    assert q.take(db_session, game_id)[0] == "word0"
+
+
+def test_empty_queue_falls_back_without_waiting(monkeypatch, game_id, db_session, Session):
+    release = threading.Event()
+    monkeypatch.setattr(wq, "request_word_set", lambda: (release.wait(5), ("slow", ["x"]))[1])
+    q = wq.WordQueue(depth=1, session_factory=Session)
+    try:
+        t0 = time.monotonic()
+        target, forbidden = q.take(db_session, game_id, rounds_left=1)
+        db_session.commit()
+        assert time.monotonic() - t0 < 1
+        assert (target, forbidden) in [(t, list(f)) for t, f in wq.FALLBACK_WORD_SETS]
+        assert q.stats()["fallback_rate"] == 1.0
+    finally:
+        release.set()
+        _wait_idle(q)
+
+
+def test_fetch_failure_is_counted(monkeypatch, game_id, db_session, Session):
+    def boom():
+        raise ValueError("AI returned incomplete words")
+
+    monkeypatch.setattr(wq, "request_word_set", boom)
+    q = wq.WordQueue(depth=2, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=2)
+    _wait_idle(q)
+    s = q.stats()
+    assert s["depth"] == 0
+    assert s["fetch_failures"] == 2
+
+
+def test_discard_drops_queue_and_late_results(words, game_id, db_session, Session):
+    q = wq.WordQueue(depth=2, session_factory=Session)
+    q.prefill(db_session, game_id, rounds_left=2)
+    _wait_idle(q)
+    db_session.rollback()
+    db_session.get(Game, game_id).Status = "completed"
+    q.discard(db_session, game_id)
+    db_session.commit()
+
+    q.prefill(db_session, game_id, rounds_left=2)   # a late refill for the finished game
+    _wait_idle(q)
+    assert q.stats()["games"] == 0
+    assert q.stats()["depth"] == 0
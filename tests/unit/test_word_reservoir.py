@@ -0,0 +1,101 @@
+import json
+import asyncio
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.lm_core import api  # noqa: E402
+from backend.lm_core.fake_ollama import FakeConfig, create_app  # noqa: E402
+from backend.lm_core.ollama_client import OllamaClient  # noqa: E402
+from backend.lm_core.word_reservoir import WordReservoir  # noqa: E402
+
+
+class Model:
+    """Distinct word sets, optionally failing every `fail_every`-th call."""
+    def __init__(self, fail_every=0):
+        self.calls = 0
+        self.fail_every = fail_every
+
+    async def __call__(self):
+        self.calls += 1
+        n = self.calls
+        await asyncio.sleep(0)
+        if self.fail_every and n % self.fail_every == 0:
+            raise ValueError("malformed")
+        return {"targetWord": f"word{n}", "forbiddenWords": ["a", "b", "c"]}
+
+
+async def _settle(reservoir, size):
+    for _ in range(200):
+        if reservoir.stats()["size"] == size and not reservoir.stats()["inflight"]:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError(reservoir.stats())
+
+
+def test_fills_to_capacity_and_refills_below_low_water():
+    model = Model(fail_every=3)
+    reservoir = WordReservoir(model, api.validate_word_set, path=None, capacity=6, low_water=3,
+                              workers=2, max_backoff=0)
+
+    async def run():
+        reservoir.start()
+        await _settle(reservoir, 6)
+        calls = model.calls
+        for _ in range(3):              # 6 -> 3: still at the mark, nothing to do
+            await reservoir.take()
+        await asyncio.sleep(0.02)
+        assert model.calls == calls
+        await reservoir.take()          # below the mark: top back up to capacity
+        await _settle(reservoir, 6)
+        await reservoir.stop()
+
+    asyncio.run(run())
+    stats = reservoir.stats()
+    assert stats["served"] == 4 and stats["blocked"] == 0 and stats["failures"] >= 2
+
+
+def test_persisted_sets_are_served_after_a_restart(tmp_path):
+    path = tmp_path / "reservoir.json"
+
+    async def first_run():
+        reservoir = WordReservoir(Model(), api.validate_word_set, path=str(path), capacity=4, low_water=1)
+        reservoir.start()
+        await _settle(reservoir, 4)
+        await reservoir.stop()
+    asyncio.run(first_run())
+
+    saved = json.loads(path.read_text())
+    saved.append({"targetWord": "tree", "forbiddenWords": ["tree"]})      # invalid: dropped on load
+    path.write_text(json.dumps(saved))
+
+    model = Model(fail_every=1)         # model down after the restart
+    reservoir = WordReservoir(model, api.validate_word_set, path=str(path), capacity=4, low_water=0)
+
+    async def second_run():
+        reservoir.start()
+        got = [await reservoir.take() for _ in range(4)]
+        await reservoir.stop()
+        return got
+
+    assert [w["targetWord"] for w in asyncio.run(second_run())] == ["word1", "word2", "word3", "word4"]
+    assert reservoir.stats()["loaded_from_disk"] == 4 and reservoir.stats()["blocked"] == 0
+
+
+def test_gen_words_is_served_from_the_reservoir(monkeypatch, tmp_path):
+    fake = create_app(FakeConfig(malformed_rate=0.3, seed=5))
+    monkeypatch.setattr(api, "ollama", OllamaClient("http://fake", transport=httpx.ASGITransport(app=fake)))
+    monkeypatch.setattr(api, "reservoir", WordReservoir(api.generate_word_set, api.validate_word_set,
+                                                        path=str(tmp_path / "r.json"), capacity=5,
+                                                        low_water=2, max_backoff=0))
+    with TestClient(api.app) as client:
+        for _ in range(100):
+            if client.get("/metrics").json()["word_reservoir"]["size"] == 5:
+                break
+            asyncio.run(asyncio.sleep(0.01))
+        words = [client.post("/gen_words").json() for _ in range(3)]
+    assert len({w["targetWord"] for w in words}) == 3
+    stats = api.reservoir.stats()
+    assert stats["served"] == 3 and stats["blocked"] == 0
+    assert len(json.loads((tmp_path / "r.json").read_text())) == stats["size"]